@@ -4,8 +4,9 @@ from flask_sqlalchemy import SQLAlchemy
 from flask_migrate import Migrate
 from config import config_by_name
 from flask_cors import CORS
+from app.replicas import RoutingSession, init_replicas
 
-db = SQLAlchemy()
+db = SQLAlchemy(session_options={'class_': RoutingSession})
 migrate = Migrate()
 
 def create_app(config_name=None):
@@ -14,11 +15,25 @@ def create_app(config_name=None):
 
     app = Flask(__name__)
     app.config.from_object(config_by_name[config_name])
-    CORS(app, resources={r"/api/*": {"origins": "http://localhost:3000"}})
+    # Okuma kopyası yapışkanlığı (db_primary_until çerezi) için frontend çerezleri gönderir;
+    # liste kesilmesi ve 503 sonrası bekleme süresi başlıkları frontend'e açılır
+    CORS(
+        app,
+        resources={r"/api/*": {"origins": "http://localhost:3000"}},
+        supports_credentials=True,
+        expose_headers=['X-Result-Truncated', 'Retry-After'],
+    )
 
     db.init_app(app)
+    init_replicas(app)
     migrate.init_app(app, db)
 
+    from app.governance import init_governance
+    init_governance(app)
+
+    from app.result_cache import init_result_cache
+    init_result_cache(app)
+
     from flask_admin import Admin
     from flask_admin.contrib.sqla import ModelView
     from app.models import Region, PaymentType, AccountName, BudgetItem, ExpenseGroup, Expense, Company, Income, IncomeReceipt
@@ -44,6 +59,9 @@ def create_app(config_name=None):
     from app.errors import register_error_handlers
     register_error_handlers(app)
 
+    from app.commands import register_commands
+    register_commands(app)
+
     from flask_jwt_extended import JWTManager
     jwt = JWTManager(app)
 
@@ -5,4 +5,5 @@ class AccountNameSchema(SQLAlchemyAutoSchema):
     class Meta:
         model = AccountName
         include_fk = True
+        dump_only = ("updated_at",)
         include_fk = True
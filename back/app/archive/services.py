@@ -0,0 +1,176 @@
+from datetime import date, datetime
+from sqlalchemy import select, insert, delete, union_all, func, literal
+from sqlalchemy.orm import aliased
+from sqlalchemy.orm.attributes import set_committed_value
+from .. import db
+from ..changes.services import record_bulk_changes
+from ..models import (
+    Expense, Payment, Income, IncomeReceipt, OPEN_EXPENSE_STATUSES, OPEN_INCOME_STATUSES, status_in,
+    expense_archive, payment_archive, income_archive, income_receipt_archive
+)
+
+ARCHIVE_TABLES = {
+    'expense': expense_archive,
+    'payment': payment_archive,
+    'income': income_archive,
+    'income_receipt': income_receipt_archive,
+}
+# Arşivle örtüşme kontrolünde kullanılan tarih kolonları
+DATE_COLUMNS = {
+    'expense': 'date',
+    'payment': 'payment_date',
+    'income': 'date',
+    'income_receipt': 'receipt_date',
+}
+
+
+def overlaps_archive(model, start: date = None, end: date = None, session=None) -> bool:
+    """
+    İstenen tarih aralığının arşivdeki kayıtlarla örtüşüp örtüşmediğini döner.
+    Hiç tarih verilmeyen istekler yalnızca sıcak tabloları okur.
+    """
+    if start is None and end is None:
+        return False
+    table = model.__tablename__
+    column = ARCHIVE_TABLES[table].c[DATE_COLUMNS[table]]
+    low, high = (session or db.session).execute(select(func.min(column), func.max(column))).one()
+    if low is None:
+        return False
+    return (start is None or start <= high) and (end is None or end >= low)
+
+
+def combined(model):
+    """Sıcak tablo ile arşivi UNION ALL ile birleştiren, modelle aynı şekilde sorgulanabilen takma ad."""
+    archive = ARCHIVE_TABLES[model.__tablename__]
+    columns = model.__table__.columns
+    union = union_all(
+        select(*columns),
+        select(*[archive.c[column.name] for column in columns]),
+    ).subquery(f"{model.__tablename__}_all")
+    return aliased(model, union)
+
+
+def readable(model, start: date = None, end: date = None, session=None):
+    """Aralık arşivle örtüşüyorsa birleşik takma adı, aksi halde modelin kendisini döner."""
+    return combined(model) if overlaps_archive(model, start, end, session) else model
+
+
+def attach_archived_parents(items, relationship: str, parent_model, foreign_key: str):
+    """
+    Arşivden okunan ödeme/tahsilatların üst kaydı (gider/gelir) da arşivde olduğundan
+    sıcak tablodan yüklenemez; bunları arşivden tek sorguyla okuyup ilişkiye yerleştirir.
+    """
+    missing = [item for item in items if getattr(item, relationship) is None]
+    if not missing:
+        return
+    parent = combined(parent_model)
+    ids = {getattr(item, foreign_key) for item in missing}
+    parents = {row.id: row for row in db.session.query(parent).filter(parent.id.in_(ids))}
+    for item in missing:
+        set_committed_value(item, relationship, parents.get(getattr(item, foreign_key)))
+
+
+class ArchiveService:
+    """
+    Tamamen kapanmış (tüm giderleri ödenmiş ve tüm gelirleri tahsil edilmiş) yılları
+    alt kayıtlarıyla birlikte arşiv tablolarına taşır; sıcak tablolar ve indeksleri küçük kalır.
+    """
+
+    @staticmethod
+    def _year_range(year: int):
+        return date(year, 1, 1), date(year + 1, 1, 1)
+
+    def closed_years(self, before_year: int) -> list:
+        """`before_year`'dan önceki, açık gider/geliri kalmamış yılları döner."""
+        years = set()
+        for model in (Expense, Income):
+            low, high = db.session.query(func.min(model.date), func.max(model.date)).one()
+            if low is not None:
+                years.update(range(low.year, min(high.year, before_year - 1) + 1))
+
+        closed = []
+        for year in sorted(years):
+            start, end = self._year_range(year)
+            open_expense = db.session.query(Expense.id).filter(
+                Expense.date >= start, Expense.date < end,
+                status_in(Expense.status, OPEN_EXPENSE_STATUSES)
+            ).first()
+            open_income = db.session.query(Income.id).filter(
+                Income.date >= start, Income.date < end,
+                status_in(Income.status, OPEN_INCOME_STATUSES)
+            ).first()
+            if open_expense is None and open_income is None:
+                closed.append(year)
+        return closed
+
+    @staticmethod
+    def _lock_ids(model, condition) -> list:
+        """
+        Taşınacak satırları transaction sonuna kadar kilitler ve id'lerini döner. Böylece
+        kapalı seçilen bir kayda taşıma sürerken ödeme/tahsilat eklenemez ya da durumu değişemez.
+        """
+        return db.session.scalars(select(model.__table__.c.id).where(condition).with_for_update()).all()
+
+    @staticmethod
+    def _move(model, condition, archived_at) -> int:
+        archive = ARCHIVE_TABLES[model.__tablename__]
+        columns = [column.name for column in model.__table__.columns]
+        db.session.execute(
+            insert(archive).from_select(
+                columns + ['archived_at'],
+                select(*model.__table__.columns, literal(archived_at, archive.c.archived_at.type))
+                .where(condition)
+            )
+        )
+        return db.session.execute(delete(model.__table__).where(condition)).rowcount
+
+    def archive_year(self, year: int) -> dict:
+        """
+        Bir yılın kapanmış gider/gelirlerini ve bunlara bağlı ödeme/tahsilatları tek transaction'da
+        taşır. closed_years() sonrasında geriye tarihli açık bir kayıt eklenmiş olabileceği için
+        durum koşulu taşıma sorgularında da uygulanır; açık kayıtlar sıcak tabloda kalır.
+        Taşınan her satır için değişiklik kaydına 'delete' yazılır, artımlı senkronize olan
+        istemciler kayıtların listelerden çıktığını görür.
+        """
+        start, end = self._year_range(year)
+        archived_at = datetime.utcnow()
+        expense = Expense.__table__.c
+        income = Income.__table__.c
+        expense_closed = (
+            (expense.date >= start) & (expense.date < end) & ~status_in(expense.status, OPEN_EXPENSE_STATUSES)
+        )
+        income_closed = (
+            (income.date >= start) & (income.date < end) & ~status_in(income.status, OPEN_INCOME_STATUSES)
+        )
+        conditions = {
+            'payment': (Payment, Payment.__table__.c.expense_id.in_(select(expense.id).where(expense_closed))),
+            'expense': (Expense, expense_closed),
+            'income_receipt': (
+                IncomeReceipt, IncomeReceipt.__table__.c.income_id.in_(select(income.id).where(income_closed))
+            ),
+            'income': (Income, income_closed),
+        }
+
+        try:
+            # Üst kayıtlar alt kayıtlardan önce kilitlenir (ödeme servisleri de bu sırayla kilitler)
+            locked = {
+                table: self._lock_ids(model, condition)
+                for table, (model, condition) in reversed(conditions.items())
+            }
+            # Alt kayıtlar üst kayıtlardan önce taşınır; id alt sorguları henüz silinmemiş satırları görür
+            moved = {
+                table: self._move(model, condition, archived_at)
+                for table, (model, condition) in conditions.items()
+            }
+            for table, ids in locked.items():
+                record_bulk_changes(
+                    db.session, table, 'delete', [{'id': id_, 'archived_at': archived_at} for id_ in ids]
+                )
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+        return moved
+
+    def archive_closed_years(self, before_year: int) -> dict:
+        return {year: self.archive_year(year) for year in self.closed_years(before_year)}
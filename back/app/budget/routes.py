@@ -0,0 +1,51 @@
+from flask import Blueprint, request, jsonify
+from marshmallow import ValidationError
+from .services import BudgetPlanService, VarianceService, parse_month
+from .schemas import BudgetPlanSchema, BudgetPlanUploadSchema
+from ..models import BudgetPlan, Expense, Payment, Income, Region, PaymentType, AccountName, BudgetItem, FxRate
+from ..errors import AppError
+from ..http_cache import enable_conditional_get
+from ..governance import governed
+
+budget_bp = Blueprint('budget_api', __name__, url_prefix='/api/budget-plans')
+enable_conditional_get(budget_bp, [
+    BudgetPlan, Expense, Payment, Income, Region, PaymentType, AccountName, BudgetItem, FxRate
+])
+
+budget_plan_service = BudgetPlanService()
+variance_service = VarianceService()
+budget_plans_schema = BudgetPlanSchema(many=True)
+budget_plan_upload_schema = BudgetPlanUploadSchema()
+
+
+@budget_bp.route('/', methods=['GET'], strict_slashes=False)
+def list_budget_plans():
+    """Verilen ayın (month=YYYY-MM) bütçe planlarını listeler."""
+    try:
+        year, month = parse_month(request.args.get('month'))
+        return jsonify(budget_plans_schema.dump(budget_plan_service.get_all(year, month))), 200
+    except AppError as e:
+        return jsonify({"error": e.message}), e.status_code
+
+
+@budget_bp.route('/', methods=['PUT'], strict_slashes=False)
+def upload_budget_plans():
+    """Planları toplu yükler; aynı ay ve bütçe kalemi için var olan plan güncellenir."""
+    try:
+        data = budget_plan_upload_schema.load(request.get_json(silent=True) or {})
+        return jsonify({"upserted": budget_plan_service.upsert(data['plans'])}), 200
+    except ValidationError as err:
+        return jsonify(err.messages), 400
+    except AppError as e:
+        return jsonify({"error": e.message}), e.status_code
+
+
+@budget_bp.route('/variance', methods=['GET'])
+@governed('report', heavy=True)
+def get_budget_variance():
+    """Ayın planlarını gerçekleşen gider, ödeme ve gelirlerle hiyerarşik ara toplamlarla karşılaştırır."""
+    try:
+        year, month = parse_month(request.args.get('month'))
+        return jsonify(variance_service.get_variance(year, month)), 200
+    except AppError as e:
+        return jsonify({"error": e.message}), e.status_code
@@ -0,0 +1,30 @@
+from datetime import date
+from marshmallow import Schema, fields, validate, post_load, ValidationError
+
+
+class BudgetPlanSchema(Schema):
+    """Bir bütçe kaleminin aylık planı; ay 'YYYY-MM' biçiminde okunur/yazılır."""
+    budget_item_id = fields.Int(required=True)
+    month = fields.Method('get_month', deserialize='load_month', required=True)
+    planned_expense = fields.Decimal(as_string=True, places=2, validate=validate.Range(min=0))
+    planned_income = fields.Decimal(as_string=True, places=2, validate=validate.Range(min=0))
+    updated_at = fields.DateTime(dump_only=True)
+
+    def get_month(self, plan):
+        return plan.period.strftime('%Y-%m')
+
+    def load_month(self, value):
+        try:
+            year, month = map(int, str(value).split('-'))
+            return date(year, month, 1)
+        except ValueError:
+            raise ValidationError("Invalid month format. Please use YYYY-MM.")
+
+    @post_load
+    def to_period(self, data, **kwargs):
+        data['period'] = data.pop('month')
+        return data
+
+
+class BudgetPlanUploadSchema(Schema):
+    plans = fields.List(fields.Nested(BudgetPlanSchema), required=True, validate=validate.Length(min=1))
@@ -0,0 +1,252 @@
+from datetime import date
+from sqlalchemy import select, func, case, or_, literal, union_all, BigInteger, Integer, String
+from .. import db
+from ..models import (
+    BudgetPlan, BudgetItem, AccountName, PaymentType, Region, Expense, Payment, Income, FxRate, BASE_CURRENCY
+)
+from ..errors import AppError
+from ..unit_of_work import transactional
+from ..result_cache import cached_result
+from ..archive.services import readable, combined
+from ..reporting import reporting_session
+from ..filters import GROUPING_SETS_DIALECTS
+from ..money import minor_units, to_api
+
+# Sapma raporunun ölçüleri (kuruş cinsinden toplanır)
+MEASURES = ('planned_expense', 'expenses', 'payments', 'planned_income', 'incomes')
+# Hiyerarşi seviyeleri, kökten yaprağa: (kimlik etiketi, alt düğüm listesinin adı)
+LEVELS = (
+    ('region', 'regions'),
+    ('payment_type', 'payment_types'),
+    ('account_name', 'account_names'),
+    ('budget_item', 'budget_items'),
+)
+
+
+def parse_month(value: str):
+    """'YYYY-MM' biçimindeki ayı (yıl, ay) olarak döner."""
+    try:
+        year, month = map(int, (value or '').split('-'))
+        date(year, month, 1)
+    except ValueError:
+        raise AppError("Invalid month format. Please use YYYY-MM.", 400)
+    return year, month
+
+
+def _month_range(year: int, month: int):
+    start = date(year, month, 1)
+    return start, date(year + 1, 1, 1) if month == 12 else date(year, month + 1, 1)
+
+
+class BudgetPlanService:
+    def get_all(self, year: int, month: int) -> list:
+        return (
+            BudgetPlan.query
+            .filter(BudgetPlan.period == date(year, month, 1))
+            .order_by(BudgetPlan.budget_item_id)
+            .all()
+        )
+
+    @transactional(error_message="Internal error on budget plan upload")
+    def upsert(self, plans: list) -> int:
+        """
+        Planları (ay, bütçe kalemi) anahtarına göre ekler ya da günceller. Var olan planlar
+        ve bütçe kalemleri satır başına değil, tek sorguyla okunur.
+        """
+        item_ids = {plan['budget_item_id'] for plan in plans}
+        known = set(db.session.scalars(select(BudgetItem.id).where(BudgetItem.id.in_(item_ids))))
+        unknown = sorted(item_ids - known)
+        if unknown:
+            raise AppError(f"Budget items not found: {', '.join(map(str, unknown))}.", 404)
+
+        periods = {plan['period'] for plan in plans}
+        existing = {
+            (plan.period, plan.budget_item_id): plan
+            for plan in BudgetPlan.query.filter(
+                BudgetPlan.period.in_(periods), BudgetPlan.budget_item_id.in_(item_ids)
+            )
+        }
+        for data in plans:
+            key = (data['period'], data['budget_item_id'])
+            plan = existing.get(key)
+            if plan is None:
+                plan = existing[key] = BudgetPlan(period=data['period'], budget_item_id=data['budget_item_id'])
+                db.session.add(plan)
+            for field in ('planned_expense', 'planned_income'):
+                if field in data:
+                    setattr(plan, field, data[field])
+        return len(plans)
+
+
+def _base_minor(amount, currency, day):
+    """
+    Tutarı SQL tarafında ana para birimine çevirip kuruşa yuvarlar. Yabancı para birimindeki
+    satırlar o güne kadar bilinen son kurla çarpılır; kur yoksa sonuç NULL olur.
+    """
+    rate = (
+        select(FxRate.rate)
+        .where(FxRate.currency == currency, FxRate.rate_date <= day)
+        .order_by(FxRate.rate_date.desc())
+        .limit(1)
+        .scalar_subquery()
+    )
+    return case((currency == BASE_CURRENCY, minor_units(amount)), else_=minor_units(amount * rate))
+
+
+def _fact(budget_item_id, **measures):
+    zero = literal(0, BigInteger)
+    return select(
+        budget_item_id.label('budget_item_id'),
+        *[measures.get(name, zero).label(name) for name in MEASURES],
+    )
+
+
+class VarianceService:
+    """
+    Bütçe planlarını aynı aydaki gerçekleşen gider, ödeme ve gelirlerle karşılaştırır.
+    Sonuç BudgetItem → AccountName → PaymentType → Region hiyerarşisinde, her seviyenin
+    ara toplamıyla döner; bütçe kalemi olmayan tutarlar ağaca değil 'unassigned' altına yazılır.
+    """
+
+    @staticmethod
+    def _facts(session, start: date, end: date):
+        """Planları ve gerçekleşenleri bütçe kalemi başına tek satır biçiminde birleştirir."""
+        last_day = date.fromordinal(end.toordinal() - 1)
+        expenses = readable(Expense, start, last_day, session)
+        payments = readable(Payment, start, last_day, session)
+        # Arşivlenen ödemelerin giderleri de arşivdedir
+        paid_expenses = Expense if payments is Payment else combined(Expense)
+        incomes = readable(Income, start, last_day, session)
+
+        return union_all(
+            _fact(
+                BudgetPlan.budget_item_id,
+                planned_expense=minor_units(BudgetPlan.planned_expense),
+                planned_income=minor_units(BudgetPlan.planned_income),
+            ).where(BudgetPlan.period == start),
+            _fact(
+                expenses.budget_item_id,
+                expenses=_base_minor(expenses.amount, expenses.currency, expenses.date),
+            ).where(expenses.date >= start, expenses.date < end),
+            _fact(
+                paid_expenses.budget_item_id,
+                payments=_base_minor(payments.payment_amount, payments.currency, payments.payment_date),
+            ).select_from(payments).join(paid_expenses, paid_expenses.id == payments.expense_id)
+            .where(payments.payment_date >= start, payments.payment_date < end),
+            _fact(
+                incomes.budget_item_id,
+                incomes=_base_minor(incomes.total_amount, incomes.currency, incomes.date),
+            ).where(incomes.date >= start, incomes.date < end),
+        ).subquery('facts')
+
+    @staticmethod
+    def _rollup(session, facts) -> list:
+        """
+        Olguları hiyerarşinin tüm seviyelerinde tek sorguda toplar ve (derinlik, satır) döner;
+        derinlik 0 genel toplam, 4 bütçe kalemidir. Bütçe kalemi atanmamış giderler dış
+        birleşimle korunur ve her seviyede NULL kimlikli grupta toplanır. MSSQL/PostgreSQL'de GROUP BY ROLLUP
+        kullanılır, seviye GROUPING() bayraklarından bulunur. Diğer veritabanlarında aynı satır
+        biçimi seviye başına gruplu sorguların UNION ALL'u ile üretilir.
+        """
+        ids = (Region.id, PaymentType.id, AccountName.id, BudgetItem.id)
+        names = (Region.name, PaymentType.name, AccountName.name, BudgetItem.name)
+        totals = [func.coalesce(func.sum(facts.c[name]), 0).label(name) for name in MEASURES]
+        missing = func.sum(case((or_(*[facts.c[name].is_(None) for name in MEASURES]), 1), else_=0))
+
+        def grouped(*columns):
+            return (
+                select(*columns, *totals, missing.label('missing_rates'))
+                .select_from(facts)
+                .outerjoin(BudgetItem, BudgetItem.id == facts.c.budget_item_id)
+                .outerjoin(AccountName, AccountName.id == BudgetItem.account_name_id)
+                .outerjoin(PaymentType, PaymentType.id == AccountName.payment_type_id)
+                .outerjoin(Region, Region.id == PaymentType.region_id)
+            )
+
+        labels = [f"{label}_id" for label, _ in LEVELS] + [f"{label}_name" for label, _ in LEVELS]
+        if session.get_bind().dialect.name in GROUPING_SETS_DIALECTS:
+            flags = [func.grouping(column).label(f"g_{label}") for column, (label, _) in zip(ids, LEVELS)]
+            statement = grouped(
+                *[column.label(label) for column, label in zip(ids, labels)],
+                *[func.max(column).label(label) for column, label in zip(names, labels[len(ids):])],
+                *flags,
+            ).group_by(func.rollup(*ids))
+            return [
+                (sum(1 for label, _ in LEVELS if getattr(row, f"g_{label}") == 0), row)
+                for row in session.execute(statement)
+            ]
+
+        branches = [
+            grouped(
+                literal(depth).label('depth'),
+                *[
+                    column.label(label) if index < depth else literal(None, type_=Integer()).label(label)
+                    for index, (column, label) in enumerate(zip(ids, labels))
+                ],
+                *[
+                    func.max(column).label(label) if index < depth else literal(None, type_=String()).label(label)
+                    for index, (column, label) in enumerate(zip(names, labels[len(ids):]))
+                ],
+            ).group_by(*ids[:depth])
+            for depth in range(len(LEVELS) + 1)
+        ]
+        return [(row.depth, row) for row in session.execute(union_all(*branches))]
+
+    @staticmethod
+    def _measures(row) -> dict:
+        values = {name: (getattr(row, name) if row is not None else 0) or 0 for name in MEASURES}
+        return {
+            **{name: to_api(value) for name, value in values.items()},
+            "expense_variance": to_api(values['expenses'] - values['planned_expense']),
+            "income_variance": to_api(values['incomes'] - values['planned_income']),
+        }
+
+    def _compute(self, year: int, month: int) -> dict:
+        start, end = _month_range(year, month)
+        with reporting_session() as session:
+            rows = self._rollup(session, self._facts(session, start, end))
+
+        if any(row.missing_rates for _, row in rows):
+            raise AppError(f"Exchange rates are missing for some amounts in {year:04d}-{month:02d}.", 422)
+
+        # Ara toplam satırları kökten yaprağa doğru ağaca yerleştirilir
+        root = {LEVELS[0][1]: []}
+        nodes = {(): root}
+        grand_total = unassigned = None
+        for depth, row in sorted(rows, key=lambda item: item[0]):
+            if depth == 0:
+                grand_total = row
+                continue
+            label, siblings = LEVELS[depth - 1]
+            key = tuple(getattr(row, f"{level}_id") for level, _ in LEVELS[:depth])
+            if key[0] is None:
+                # Kalemsiz tutarlar her seviyede aynı NULL grubunu oluşturur; bir kez alınır
+                if depth == 1:
+                    unassigned = row
+                continue
+            node = {"id": key[-1], "name": getattr(row, f"{label}_name"), **self._measures(row)}
+            if depth < len(LEVELS):
+                node[LEVELS[depth][1]] = []
+            nodes[key] = node
+            nodes[key[:-1]][siblings].append(node)
+
+        for node in nodes.values():
+            for _, children in LEVELS:
+                if children in node:
+                    node[children].sort(key=lambda child: (child["name"] or '', child["id"]))
+        return {
+            "month": f"{year:04d}-{month:02d}",
+            "currency": BASE_CURRENCY,
+            "total": self._measures(grand_total),
+            "unassigned": self._measures(unassigned),
+            **root,
+        }
+
+    def get_variance(self, year: int, month: int) -> dict:
+        """Aylık plan/gerçekleşen sapmasını, ay kovasına bağlı önbellek üzerinden döner."""
+        return cached_result(
+            'budget_variance',
+            {"year": year, "month": month},
+            [f"budget_variance:{year:04d}-{month:02d}"],
+            lambda: self._compute(year, month)
+        )
@@ -5,4 +5,5 @@ class BudgetItemSchema(SQLAlchemyAutoSchema):
     class Meta:
         model = BudgetItem
         include_fk = True
+        dump_only = ("updated_at",)
         include_fk = True
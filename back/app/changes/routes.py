@@ -0,0 +1,22 @@
+from flask import Blueprint, request, jsonify, current_app
+from .services import ChangeFeedService
+from ..errors import AppError
+
+changes_bp = Blueprint('changes_api', __name__, url_prefix='/api/changes')
+
+
+@changes_bp.route('/', methods=['GET'], strict_slashes=False)
+def list_changes():
+    """`since` imlecinden sonraki değişiklikleri sıralı partiler halinde döner."""
+    try:
+        since = int(request.args.get('since', 0))
+        limit = int(request.args.get('limit', 500))
+    except ValueError:
+        return jsonify({"error": "since and limit must be integers."}), 400
+    entities = [e.strip() for e in request.args.get('entity', '').split(',') if e.strip()]
+
+    service = ChangeFeedService(max_batch=current_app.config['CHANGE_FEED_MAX_BATCH'])
+    try:
+        return jsonify(service.get_changes(since=since, limit=limit, entities=entities)), 200
+    except AppError as e:
+        return jsonify({"error": e.message}), e.status_code
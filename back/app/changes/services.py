@@ -0,0 +1,206 @@
+from datetime import date, datetime, timedelta, timezone
+from decimal import Decimal
+from enum import Enum
+from flask import current_app
+from sqlalchemy import event, func, insert, text
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+from .. import db
+from ..models import ChangeLog
+from ..errors import AppError
+
+# change_log'a yazan transaction'ları commit'e kadar sıraya sokan, transaction'a bağlı kilitler
+FEED_LOCK_STATEMENTS = {
+    'postgresql': "SELECT pg_advisory_xact_lock(hashtext('change_log'))",
+    'mssql': "EXEC sp_getapplock @Resource = 'change_log', @LockMode = 'Exclusive', @LockOwner = 'Transaction'",
+}
+FEED_LOCKED_KEY = 'change_feed_locked'
+
+
+def _json_value(value):
+    if isinstance(value, Decimal):
+        return str(value)
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    if isinstance(value, Enum):
+        return value.name
+    return value
+
+
+def snapshot(obj) -> dict:
+    """Bir model nesnesinin kolon değerlerini JSON'a uygun bir sözlük olarak döner."""
+    return {column.key: _json_value(getattr(obj, column.key)) for column in obj.__table__.columns}
+
+
+def lock_feed(executor):
+    """
+    Transaction'ı commit ya da rollback'e kadar değişiklik akışı kilidine alır. seq'ler yalnızca
+    kilit tutulurken verildiği için commit sırasıyla artar: bir seq görünür olduğunda ondan küçük
+    tüm seq'ler ya commit edilmiş ya da geri alınmıştır, okuyucu hiçbirini atlamaz. SQLite'ta
+    yazımlar zaten veritabanı kilidiyle sıralandığı için ek kilit gerekmez.
+    """
+    dialect = executor.dialect if isinstance(executor, Connection) else executor.get_bind().dialect
+    statement = FEED_LOCK_STATEMENTS.get(dialect.name)
+    if statement:
+        executor.execute(text(statement))
+
+
+@event.listens_for(Session, 'before_flush')
+def _lock_feed_before_insert(session, flush_context, instances):
+    """ORM üzerinden eklenen değişiklik kayıtları flush edilmeden önce akış kilidini alır."""
+    if session.info.get(FEED_LOCKED_KEY) or not any(isinstance(obj, ChangeLog) for obj in session.new):
+        return
+    lock_feed(session)
+    session.info[FEED_LOCKED_KEY] = True
+
+
+@event.listens_for(Session, 'after_commit')
+@event.listens_for(Session, 'after_rollback')
+def _release_feed_lock(session):
+    session.info.pop(FEED_LOCKED_KEY, None)
+
+
+def record_change(obj, operation: str):
+    """
+    Değişikliği çağıranın transaction'ına ekler; commit/rollback çağırana aittir.
+    Kayıt flush edilirken akış kilidi alınır (bkz. lock_feed); bu yüzden servisler
+    record_change'i işin sonunda, commit'ten hemen önce çağırır.
+    'insert' için nesnenin id'sinin oluşması adına önce flush edilmiş olması gerekir.
+    """
+    db.session.add(ChangeLog(
+        entity=obj.__tablename__,
+        entity_id=obj.id,
+        operation=operation,
+        payload=snapshot(obj),
+    ))
+
+
+def record_bulk_changes(executor, entity: str, operation: str, rows):
+    """
+    Toplu (Core) yazımlar için değişiklikleri tek bir executemany ile ekler.
+    `executor` bir Session ya da Connection olabilir; `rows` elemanları en az
+    'id' anahtarını içeren sözlüklerdir. Akış kilidi çağıranın transaction'ı bitene kadar
+    tutulur; çağıran kayıttan sonra yalnızca commit etmelidir.
+    """
+    now = datetime.utcnow()
+    values = [
+        {
+            "entity": entity,
+            "entity_id": row["id"],
+            "operation": operation,
+            "payload": {key: _json_value(value) for key, value in row.items()},
+            "created_at": now,
+        }
+        for row in rows
+    ]
+    if values:
+        lock_feed(executor)
+        executor.execute(insert(ChangeLog), values)
+
+
+def parse_modified_since(value: str) -> datetime:
+    """'modified_since' parametresini UTC (tz'siz) datetime'a çevirir."""
+    try:
+        parsed = datetime.fromisoformat(value)
+    except (TypeError, ValueError):
+        raise AppError("Invalid modified_since. Use ISO format (YYYY-MM-DDTHH:MM:SS).", 400)
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed
+
+
+def sync_watermark() -> datetime:
+    """
+    Bir sonraki istekte 'modified_since' olarak kullanılacak zaman. updated_at ve
+    change_log.created_at flush anında yazıldığı için, şu anda açık olan bir transaction
+    şimdiden eski bir damgayla daha sonra commit edilebilir. Filigran bu yüzden
+    SYNC_WATERMARK_LAG_SECONDS (en uzun yazma transaction'ından uzun) kadar geride tutulur;
+    bu aralıktaki kayıtlar istemciye iki kez gelebilir ama kaçırılmaz.
+    """
+    return datetime.utcnow() - timedelta(seconds=current_app.config['SYNC_WATERMARK_LAG_SECONDS'])
+
+
+def purge_horizon():
+    """Son temizlikte silinen değişiklik kayıtlarının üst sınırı; hiç temizlik yapılmadıysa None."""
+    return db.session.query(func.max(ChangeLog.created_at)).filter(
+        ChangeLog.entity == 'change_log', ChangeLog.operation == 'purge'
+    ).scalar()
+
+
+def sync_info(entity: str, modified_since: datetime, server_time: datetime) -> dict:
+    """
+    Artımlı senkronizasyon için silinen kayıtları (tombstone) ve bir sonraki
+    istekte 'modified_since' olarak kullanılacak zaman damgasını döner.
+    'modified_since' temizlenmiş değişiklik kayıtlarından eskiyse silmeler kaybolmuş
+    olabilir; bu durumda resync_required ile istemciden tam senkronizasyon istenir.
+    """
+    deleted = (
+        db.session.query(ChangeLog.entity_id)
+        .filter(
+            ChangeLog.entity == entity,
+            ChangeLog.operation == 'delete',
+            ChangeLog.created_at >= modified_since,
+        )
+        .distinct()
+    )
+    horizon = purge_horizon()
+    return {
+        "deleted": sorted(row.entity_id for row in deleted),
+        "server_time": server_time.isoformat(),
+        "resync_required": horizon is not None and modified_since < horizon,
+    }
+
+
+class ChangeFeedService:
+    """Değişiklik kaydını imleç (seq) tabanlı partiler halinde okur."""
+
+    def __init__(self, max_batch: int = 1000):
+        self.max_batch = max_batch
+
+    def get_changes(self, since: int = 0, limit: int = 500, entities=None) -> dict:
+        """
+        `since` değerinden büyük seq'e sahip değişiklikleri sırayla döner. seq'ler commit
+        sırasıyla verildiği için (bkz. lock_feed) görünen son seq'ten sonra, ondan küçük
+        bir seq commit edilemez; imleç güvenle ilerletilebilir.
+        """
+        if since < 0:
+            raise AppError("since must be zero or a positive sequence number.", 400)
+        if limit < 1 or limit > self.max_batch:
+            raise AppError(f"limit must be between 1 and {self.max_batch}.", 400)
+
+        query = ChangeLog.query.filter(ChangeLog.seq > since)
+        if entities:
+            query = query.filter(ChangeLog.entity.in_(entities))
+        changes = query.order_by(ChangeLog.seq).limit(limit + 1).all()
+
+        has_more = len(changes) > limit
+        changes = changes[:limit]
+        return {
+            "data": [
+                {
+                    "seq": change.seq,
+                    "entity": change.entity,
+                    "entity_id": change.entity_id,
+                    "operation": change.operation,
+                    "payload": change.payload,
+                    "created_at": change.created_at.isoformat(),
+                }
+                for change in changes
+            ],
+            "next_since": changes[-1].seq if changes else since,
+            "has_more": has_more,
+        }
+
+    def purge(self, older_than: datetime) -> int:
+        """
+        Belirtilen tarihten eski değişiklik kayıtlarını siler. Silinen aralığın sınırı bir
+        'purge' kaydı olarak saklanır; daha eski bir zamandan senkronize olmak isteyen
+        istemcilere tam senkronizasyon gerektiği bildirilir (bkz. sync_info).
+        """
+        deleted = ChangeLog.query.filter(ChangeLog.created_at < older_than).delete(synchronize_session=False)
+        db.session.add(ChangeLog(
+            entity='change_log', entity_id=0, operation='purge',
+            payload={'older_than': older_than.isoformat()}, created_at=older_than,
+        ))
+        db.session.commit()
+        return deleted
@@ -0,0 +1,113 @@
+import time
+from datetime import datetime, timedelta
+import click
+from flask.cli import with_appcontext
+
+
+@click.command('recompute-statuses')
+@click.option('--table', type=click.Choice(['all', 'expense', 'income']), default='all',
+              help='Yeniden hesaplanacak tablo.')
+@click.option('--chunk-size', type=int, default=50000, show_default=True,
+              help='Her transaction içinde güncellenecek id aralığı büyüklüğü.')
+@click.option('--workers', type=int, default=1, show_default=True,
+              help='Paralel çalışacak bağlantı sayısı.')
+@with_appcontext
+def recompute_statuses_command(table, chunk_size, workers):
+    """Gider/gelir durumlarını ödeme ve tahsilatlardan toplu olarak yeniden hesaplar."""
+    from app.maintenance.services import StatusRecomputeService
+
+    service = StatusRecomputeService(chunk_size=chunk_size, workers=workers)
+    if table in ('all', 'expense'):
+        started = time.perf_counter()
+        changed = service.recompute_expenses()
+        click.echo(f"expense: {changed} rows updated in {time.perf_counter() - started:.2f}s")
+    if table in ('all', 'income'):
+        started = time.perf_counter()
+        changed = service.recompute_incomes()
+        click.echo(f"income: {changed} rows updated in {time.perf_counter() - started:.2f}s")
+
+
+@click.command('purge-changes')
+@click.option('--days', type=int, default=30, show_default=True,
+              help='Bu günden daha eski değişiklik kayıtları silinir.')
+@with_appcontext
+def purge_changes_command(days):
+    """Tüketiciler tarafından okunmuş eski değişiklik kayıtlarını temizler."""
+    from app.changes.services import ChangeFeedService
+
+    deleted = ChangeFeedService().purge(datetime.utcnow() - timedelta(days=days))
+    click.echo(f"change_log: {deleted} rows deleted")
+
+
+@click.command('purge-idempotency-keys')
+@with_appcontext
+def purge_idempotency_keys_command():
+    """Süresi dolmuş Idempotency-Key kayıtlarını siler; zamanlanmış görev olarak çalıştırılmalıdır."""
+    from app.idempotency import purge_expired_keys
+
+    deleted = purge_expired_keys()
+    click.echo(f"idempotency_key: {deleted} rows deleted")
+
+
+@click.command('create-partitions')
+@click.option('--granularity', type=click.Choice(['year', 'month']), default=None,
+              help='Bölüm aralığı; verilmezse PARTITION_GRANULARITY kullanılır.')
+@click.option('--ahead', type=int, default=None,
+              help='Bugünden itibaren önceden oluşturulacak dönem sayısı.')
+@click.option('--enable', is_flag=True, help='Henüz bölümlenmemiş tabloları önce bölümler.')
+@with_appcontext
+def create_partitions_command(granularity, ahead, enable):
+    """Tarih bölümlü tablolar için gelecek dönemlerin bölümlerini oluşturur; zamanlanmış görev olarak çalıştırılmalıdır."""
+    from dateutil.relativedelta import relativedelta
+    from flask import current_app
+    from app import db
+    from app.maintenance.partitioning import PartitionManager
+
+    granularity = granularity or current_app.config.get('PARTITION_GRANULARITY')
+    if not granularity:
+        raise click.UsageError("Set PARTITION_GRANULARITY or pass --granularity.")
+    ahead = current_app.config.get('PARTITION_PERIODS_AHEAD', 3) if ahead is None else ahead
+    step = relativedelta(years=ahead) if granularity == 'year' else relativedelta(months=ahead)
+    until = datetime.utcnow().date() + step
+
+    with db.engine.begin() as connection:
+        manager = PartitionManager(connection, granularity)
+        if not manager.supported:
+            click.echo(f"{connection.dialect.name}: partitioning is not supported, nothing to do")
+            return
+        if enable:
+            converted = manager.enable(until)
+            click.echo(f"partitioned tables: {', '.join(converted) or 'none'}")
+            for table, reason in manager.skipped.items():
+                click.echo(f"skipped {table}: {reason}")
+        created = manager.create_future_partitions(until)
+    click.echo(f"{created} partitions created up to {until.isoformat()}")
+
+
+@click.command('archive-closed-years')
+@click.option('--before-year', type=int, default=None,
+              help='Bu yıldan önceki kapanmış yıllar taşınır; varsayılan içinde bulunulan yıl.')
+@click.option('--dry-run', is_flag=True, help='Yalnızca taşınacak yılları listeler.')
+@with_appcontext
+def archive_closed_years_command(before_year, dry_run):
+    """Tüm giderleri ödenmiş ve gelirleri tahsil edilmiş yılları arşiv tablolarına taşır."""
+    from app.archive.services import ArchiveService
+
+    service = ArchiveService()
+    before_year = before_year or datetime.utcnow().year
+    years = service.closed_years(before_year)
+    if dry_run or not years:
+        click.echo(f"closed years: {', '.join(map(str, years)) or 'none'}")
+        return
+    for year in years:
+        moved = service.archive_year(year)
+        click.echo(f"{year}: " + ', '.join(f"{table} {count}" for table, count in moved.items()))
+
+
+def register_commands(app):
+    """Registers all CLI commands for the application."""
+    app.cli.add_command(recompute_statuses_command)
+    app.cli.add_command(purge_changes_command)
+    app.cli.add_command(purge_idempotency_keys_command)
+    app.cli.add_command(create_partitions_command)
+    app.cli.add_command(archive_closed_years_command)
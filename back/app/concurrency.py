@@ -0,0 +1,25 @@
+from flask import current_app
+from sqlalchemy.orm.attributes import flag_modified
+
+
+def optimistic_enabled() -> bool:
+    return current_app.config.get('CONCURRENCY_MODE') == 'optimistic'
+
+
+def load_parent(model, id_):
+    """
+    Ödeme/tahsilatın bağlı olduğu gider/gelir satırını okur.
+    Kötümser modda satır commit'e kadar kilitlenir; iyimser modda kilit alınmaz ve
+    araya giren bir yazım flush sırasında version_id kontrolüyle yakalanır.
+    """
+    query = model.query if optimistic_enabled() else model.query.with_for_update()
+    return query.get(id_)
+
+
+def guard_version(obj, attribute: str = 'status'):
+    """
+    İyimser modda, hesaplanan değerler aynı kalsa bile üst satırın UPDATE edilmesini,
+    dolayısıyla sürümünün kontrol edilip artırılmasını sağlar.
+    """
+    if optimistic_enabled():
+        flag_modified(obj, attribute)
@@ -0,0 +1,42 @@
+from flask import Blueprint, request, jsonify
+from .services import DashboardService
+from ..summary.services import parse_date_range
+from ..models import (
+    Expense, Payment, Income, IncomeReceipt, Company, Region, PaymentType, AccountName, BudgetItem, FxRate
+)
+from ..errors import AppError
+from ..http_cache import enable_conditional_get
+from ..governance import governed, page_args
+
+dashboard_bp = Blueprint('dashboard_api', __name__, url_prefix='/api/dashboard')
+enable_conditional_get(dashboard_bp, [
+    Expense, Payment, Income, IncomeReceipt, Company, Region, PaymentType, AccountName, BudgetItem, FxRate
+])
+
+dashboard_service = DashboardService()
+
+
+@dashboard_bp.route('/', methods=['GET'], strict_slashes=False)
+@governed('report', heavy=True)
+def get_dashboard():
+    """Özet, ödemeler, kalan giderler ve tahsilatları eş zamanlı sorgulayıp tek belgede döner."""
+    try:
+        start_date, end_date = parse_date_range(request.args)
+        _, per_page = page_args(request.args.to_dict())
+        return jsonify(dashboard_service.get_dashboard(start_date, end_date, per_page=per_page)), 200
+    except AppError as e:
+        return jsonify({"error": e.message}), e.status_code
+
+
+@dashboard_bp.route('/snapshot', methods=['GET'])
+@governed()
+def get_snapshot():
+    """Toplamlar, son ödemeler/tahsilatlar ve açık kalemler; yalnızca kartlarda gösterilen kolonlarla."""
+    try:
+        start_date, end_date = parse_date_range(request.args)
+        limit = int(request.args.get('limit', 10))
+        return jsonify(dashboard_service.get_snapshot(start_date, end_date, limit=limit)), 200
+    except ValueError:
+        return jsonify({"error": "limit must be an integer."}), 400
+    except AppError as e:
+        return jsonify({"error": e.message}), e.status_code
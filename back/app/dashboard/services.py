@@ -0,0 +1,218 @@
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+from flask import current_app
+from sqlalchemy import select
+from .. import db
+from ..models import (
+    Expense, Payment, Income, IncomeReceipt, Region, PaymentType, AccountName, BudgetItem, Company,
+    OPEN_EXPENSE_STATUSES, OPEN_INCOME_STATUSES, status_in
+)
+from ..expense.services import get_all as get_all_expenses
+from ..expense.schemas import ExpenseSchema
+from ..income.services import IncomeReceiptService
+from ..income.schemas import IncomeReceiptSchema
+from ..payments.services import PaymentService
+from ..payments.schemas import PaymentSchema
+from ..summary.services import get_summary
+from ..replicas import current_replica, route_reads_to
+from ..governance import current_timeout, apply_timeout, row_limit
+
+MAX_SNAPSHOT_LIMIT = 100
+
+
+def _rows(statement):
+    """Sorgu sonucunu JSON'a uygun sözlük listesine çevirir."""
+    rows = []
+    for row in db.session.execute(statement).mappings():
+        item = dict(row)
+        for key, value in item.items():
+            if isinstance(value, date):
+                item[key] = value.isoformat()
+            elif value is not None and key == 'amount':
+                item[key] = float(value)
+        rows.append(item)
+    return rows
+
+
+def _pagination(paginated):
+    return {
+        "total_pages": paginated.pages,
+        "total_items": paginated.total,
+        "current_page": paginated.page
+    }
+
+
+class DashboardService:
+    """
+    Dashboard'un ihtiyaç duyduğu okuma sorgularını tek istekte, eş zamanlı olarak çalıştırır.
+    pyodbc için async sürücü olmadığından sorgular bir thread havuzunda, her biri kendi
+    uygulama bağlamı ve session'ı ile yürütülür; toplam süre en yavaş sorgu kadar olur.
+    """
+
+    def __init__(self, max_workers: int = 4):
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='dashboard')
+
+    @staticmethod
+    def _summary(start_date: date, end_date: date):
+        return get_summary(start_date, end_date)
+
+    @staticmethod
+    def _payments(start_date: date, end_date: date, per_page: int):
+        filters = {
+            'date_start': start_date.isoformat(),
+            'date_end': end_date.isoformat(),
+            'sort_by': 'payment_date',
+            'sort_order': 'desc'
+        }
+        paginated = PaymentService().get_all(filters=filters, page=1, per_page=per_page)
+        return {"data": PaymentSchema(many=True).dump(paginated.items), "pagination": _pagination(paginated)}
+
+    @staticmethod
+    def _remaining_expenses(start_date: date, end_date: date, per_page: int):
+        filters = {
+            'date_start': start_date.isoformat(),
+            'date_end': end_date.isoformat(),
+            'status': 'UNPAID,PARTIALLY_PAID'
+        }
+        paginated = get_all_expenses(filters=filters, sort_by='date', sort_order='desc', page=1, per_page=per_page)
+        return {"data": ExpenseSchema(many=True).dump(paginated.items), "pagination": _pagination(paginated)}
+
+    @staticmethod
+    def _receipts(start_date: date, end_date: date):
+        filters = {'date_start': start_date.isoformat(), 'date_end': end_date.isoformat()}
+        receipts = IncomeReceiptService().get_all(filters=filters, sort_by='receipt_date', sort_order='desc',
+                                                  limit=row_limit())
+        return IncomeReceiptSchema(many=True).dump(receipts)
+
+    def _submit(self, app, fn, *args):
+        replica = current_replica()
+        timeout = current_timeout()
+
+        def run():
+            # Her thread kendi app context'inde, dolayısıyla kendi session'ında çalışır
+            with app.app_context():
+                route_reads_to(replica)
+                apply_timeout(timeout)
+                try:
+                    return fn(*args)
+                finally:
+                    db.session.remove()
+        return self.executor.submit(run)
+
+    def get_dashboard(self, start_date: date, end_date: date, per_page: int = 20) -> dict:
+        app = current_app._get_current_object()
+        futures = {
+            "summary": self._submit(app, self._summary, start_date, end_date),
+            "payments": self._submit(app, self._payments, start_date, end_date, per_page),
+            "remaining_expenses": self._submit(app, self._remaining_expenses, start_date, end_date, per_page),
+            "receipts": self._submit(app, self._receipts, start_date, end_date),
+        }
+        result = {"start_date": start_date.isoformat(), "end_date": end_date.isoformat()}
+        result.update({name: future.result() for name, future in futures.items()})
+        return result
+
+    @staticmethod
+    def _recent_payments(start_date: date, end_date: date, limit: int):
+        statement = (
+            select(
+                Payment.id, Payment.payment_amount.label('amount'), Payment.currency, Payment.payment_date.label('date'),
+                Expense.description, Region.name.label('region'), PaymentType.name.label('payment_type'),
+                AccountName.name.label('account_name'), BudgetItem.name.label('budget_item')
+            )
+            .join(Expense, Payment.expense_id == Expense.id)
+            .outerjoin(Region, Expense.region_id == Region.id)
+            .outerjoin(PaymentType, Expense.payment_type_id == PaymentType.id)
+            .outerjoin(AccountName, Expense.account_name_id == AccountName.id)
+            .outerjoin(BudgetItem, Expense.budget_item_id == BudgetItem.id)
+            .where(Payment.payment_date >= start_date, Payment.payment_date <= end_date)
+            .order_by(Payment.payment_date.desc(), Payment.id.desc())
+            .limit(limit)
+        )
+        return _rows(statement)
+
+    @staticmethod
+    def _recent_receipts(start_date: date, end_date: date, limit: int):
+        statement = (
+            select(
+                IncomeReceipt.id, IncomeReceipt.receipt_amount.label('amount'), IncomeReceipt.currency,
+                IncomeReceipt.receipt_date.label('date'), IncomeReceipt.notes,
+                Income.description.label('income_description'), Company.name.label('company_name'),
+                Region.name.label('region'), AccountName.name.label('account_name'),
+                BudgetItem.name.label('budget_item')
+            )
+            .join(Income, IncomeReceipt.income_id == Income.id)
+            .join(Company, Income.company_id == Company.id)
+            .join(Region, Income.region_id == Region.id)
+            .join(AccountName, Income.account_name_id == AccountName.id)
+            .join(BudgetItem, Income.budget_item_id == BudgetItem.id)
+            .where(IncomeReceipt.receipt_date >= start_date, IncomeReceipt.receipt_date <= end_date)
+            .order_by(IncomeReceipt.receipt_date.desc(), IncomeReceipt.id.desc())
+            .limit(limit)
+        )
+        return _rows(statement)
+
+    @staticmethod
+    def _open_expenses(start_date: date, end_date: date, limit: int):
+        statement = (
+            select(
+                Expense.id, Expense.remaining_amount.label('amount'), Expense.currency, Expense.date,
+                Expense.description, Expense.status, Region.name.label('region'),
+                PaymentType.name.label('payment_type'), AccountName.name.label('account_name'),
+                BudgetItem.name.label('budget_item')
+            )
+            .outerjoin(Region, Expense.region_id == Region.id)
+            .outerjoin(PaymentType, Expense.payment_type_id == PaymentType.id)
+            .outerjoin(AccountName, Expense.account_name_id == AccountName.id)
+            .outerjoin(BudgetItem, Expense.budget_item_id == BudgetItem.id)
+            .where(
+                Expense.date >= start_date, Expense.date <= end_date,
+                status_in(Expense.status, OPEN_EXPENSE_STATUSES)
+            )
+            .order_by(Expense.date.desc(), Expense.id.desc())
+            .limit(limit)
+        )
+        return _rows(statement)
+
+    @staticmethod
+    def _open_incomes(start_date: date, end_date: date, limit: int):
+        statement = (
+            select(
+                Income.id, (Income.total_amount - Income.received_amount).label('amount'), Income.currency, Income.date,
+                Income.description.label('income_description'), Income.status,
+                Company.name.label('company_name'), Region.name.label('region'),
+                AccountName.name.label('account_name'), BudgetItem.name.label('budget_item')
+            )
+            .join(Company, Income.company_id == Company.id)
+            .join(Region, Income.region_id == Region.id)
+            .join(AccountName, Income.account_name_id == AccountName.id)
+            .join(BudgetItem, Income.budget_item_id == BudgetItem.id)
+            .where(
+                Income.date >= start_date, Income.date <= end_date,
+                status_in(Income.status, OPEN_INCOME_STATUSES)
+            )
+            .order_by(Income.date.desc(), Income.id.desc())
+            .limit(limit)
+        )
+        rows = _rows(statement)
+        for row in rows:
+            row['status'] = row['status'].name
+        return rows
+
+    def get_snapshot(self, start_date: date, end_date: date, limit: int = 10) -> dict:
+        """
+        Dashboard kartlarının gösterdiği verileri, yalnızca ekranda kullanılan kolonlarla döner.
+        Her liste SQL tarafında sıralanıp `limit` ile kısıtlanır; iç içe şema dökümü yapılmaz.
+        Liste satırlarındaki tutarlar kaydın kendi para birimindedir (currency alanı).
+        """
+        limit = max(1, min(limit, MAX_SNAPSHOT_LIMIT))
+        app = current_app._get_current_object()
+        futures = {
+            "totals": self._submit(app, self._summary, start_date, end_date),
+            "recent_payments": self._submit(app, self._recent_payments, start_date, end_date, limit),
+            "recent_receipts": self._submit(app, self._recent_receipts, start_date, end_date, limit),
+            "open_expenses": self._submit(app, self._open_expenses, start_date, end_date, limit),
+            "open_incomes": self._submit(app, self._open_incomes, start_date, end_date, limit),
+        }
+        result = {"start_date": start_date.isoformat(), "end_date": end_date.isoformat(), "limit": limit}
+        result.update({name: future.result() for name, future in futures.items()})
+        return result
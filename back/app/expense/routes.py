@@ -1,42 +1,58 @@
 from flask import Blueprint, request, jsonify
-from app.expense.services import get_all, create, update, delete,     create_expense_group_with_expenses, get_by_id
+from app.expense.services import get_all, create, update, delete,     create_expense_group_with_expenses, get_by_id, get_pivot, get_facets
 from app.expense.schemas import ExpenseSchema, ExpenseGroupSchema
 from app import db
-from app.payments.services import PaymentService
-from app.payments.schemas import PaymentSchema
+from app.changes.services import parse_modified_since, sync_info, sync_watermark
+from app.errors import AppError
+from app.http_cache import enable_conditional_get
+from app.governance import governed, page_args
+from app.models import Expense, ExpenseGroup, Region, PaymentType, AccountName, BudgetItem, FxRate
+from app.fx.services import parse_currency
 
 
 expense_bp = Blueprint('expense_api', __name__, url_prefix='/api/expenses')
-payment_service = PaymentService()
+enable_conditional_get(expense_bp, [Expense, ExpenseGroup, Region, PaymentType, AccountName, BudgetItem, FxRate])
 
 @expense_bp.route("/", methods=["GET"], strict_slashes=False)
+@governed()
 def list_expenses():
     try:
         filters = {k: v for k, v in request.args.items() if v is not None}
-        page = int(filters.pop('page', 1))
-        per_page = int(filters.pop('per_page', 20))
+        page, per_page = page_args(filters)
         sort_by = filters.pop('sort_by', 'date')
         sort_order = filters.pop('sort_order', 'desc')
+        modified_since = filters.pop('modified_since', None)
+        modified_since = parse_modified_since(modified_since) if modified_since else None
+        facets = filters.pop('facets', None)
+        server_time = sync_watermark()
         
         paginated_expenses = get_all(
             filters=filters, 
             sort_by=sort_by, 
             sort_order=sort_order,
             page=page,
-            per_page=per_page
+            per_page=per_page,
+            modified_since=modified_since
         )
         
         schema = ExpenseSchema(many=True)
-        return jsonify({
+        response = {
             "data": schema.dump(paginated_expenses.items),
             "pagination": {
                 "total_pages": paginated_expenses.pages,
                 "total_items": paginated_expenses.total,
                 "current_page": paginated_expenses.page
             }
-        }), 200
+        }
+        if facets:
+            response["facets"] = get_facets(filters, facets)
+        if modified_since:
+            response["sync"] = sync_info('expense', modified_since, server_time)
+        return jsonify(response), 200
     except ValueError as e:
         return jsonify({"message": str(e)}), 400
+    except AppError as e:
+        return jsonify({"message": e.message}), e.status_code
 
 @expense_bp.route("/<int:expense_id>", methods=["GET"])
 def get_single_expense(expense_id):
@@ -105,70 +121,21 @@ def remove_expense(expense_id):
         return {"message": "Expense not found"}, 404
     return {"message": "Expense deleted"}, 200
 
-@expense_bp.route("/<int:expense_id>/payments", methods=["POST"])
-def add_payment_to_expense(expense_id):
-    data = request.get_json()
-    if not data or 'payment_amount' not in data or 'payment_date' not in data:
-        return jsonify({"error": "Missing required payment information"}), 400
-
-    try:
-        payment = payment_service.create(expense_id, data)
-        schema = PaymentSchema()
-        return jsonify(schema.dump(payment)), 201
-    except Exception as e:
-        return jsonify({"error": str(e)}), 400
-
-
 @expense_bp.route('/pivot', methods=['GET'])
+@governed('report', heavy=True)
 def get_expense_pivot():
     try:
-        from datetime import datetime
-        from app.models import Expense, Region, BudgetItem
-
         month_str = request.args.get("month")
         if not month_str:
             return jsonify({"error": "Month parameter is required"}), 400
 
         year, month = map(int, month_str.split("-"))
-        start_date = datetime(year, month, 1)
-        end_date = datetime(year + 1, 1, 1) if month == 12 else datetime(year, month + 1, 1)
-
-        query = (
-            db.session.query(
-                Expense.id,
-                Expense.date,
-                Expense.amount,
-                Expense.description,
-                Region.id.label("region_id"),
-                Region.name.label("region_name"),
-                BudgetItem.id.label("budget_item_id"),
-                BudgetItem.name.label("budget_item_name")
-            )
-            .join(Region, Region.id == Expense.region_id)
-            .join(BudgetItem, BudgetItem.id == Expense.budget_item_id)
-            .filter(Expense.date >= start_date, Expense.date < end_date)
-        )
-
-        results = query.all()
-
-        data = []
-        for row in results:
-            data.append({
-                "id": row.id,
-                "date": row.date.strftime("%Y-%m-%d"),
-                "day": row.date.day,
-                "description": row.description,
-                "amount": float(row.amount),
-                "budget_item_id": row.budget_item_id,
-                "budget_item_name": row.budget_item_name,
-                "region_id": row.region_id,
-                "region_name": row.region_name,
-            })
-
-        return jsonify(data), 200
+        currency = parse_currency(request.args.get('currency'))
+        return jsonify(get_pivot(year, month, currency)), 200
 
+    except AppError as e:
+        return jsonify({"error": e.message}), e.status_code
     except Exception as e:
         import traceback
         traceback.print_exc()
         return jsonify({"error": str(e)}), 500
- 
\ No newline at end of file
@@ -1,6 +1,6 @@
 from marshmallow_sqlalchemy import SQLAlchemyAutoSchema
-from marshmallow import fields, Schema
-from app.models import Expense, ExpenseGroup
+from marshmallow import fields, Schema, validate
+from app.models import Expense, ExpenseGroup, ExpenseStatus, CURRENCIES
 
 class ExpenseGroupSchema(SQLAlchemyAutoSchema):
     class Meta:
@@ -28,6 +28,14 @@ class ExpenseSchema(SQLAlchemyAutoSchema):
     account_name_id = fields.Int(load_only=True, required=True)
     budget_item_id = fields.Int(load_only=True, required=True)
 
+    # Veritabanında kod olarak saklanır; API'de durum adıyla okunur/yazılır
+    status = fields.Str(validate=validate.OneOf([status.name for status in ExpenseStatus]))
+    # Gider oluşturulurken belirlenir; ödemeleri aynı para birimindedir
+    currency = fields.Str(validate=validate.OneOf(CURRENCIES))
+
+    # İyimser eşzamanlılık sürümü yalnızca okunur; istemciden gelen değer yok sayılır
+    version_id = fields.Int(dump_only=True)
+
     class Meta:
         model = Expense
         load_instance = True
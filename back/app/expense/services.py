@@ -1,100 +1,78 @@
-from sqlalchemy import func,asc,desc
 from sqlalchemy.orm import joinedload
-from app.models import Expense, Region, PaymentType, AccountName, BudgetItem, db, ExpenseGroup
-from datetime import datetime
+from app.models import Expense, Region, PaymentType, AccountName, BudgetItem, db, ExpenseGroup, BASE_CURRENCY
+from datetime import datetime, date
 from dateutil.relativedelta import relativedelta
-
-
-def get_all(filters=None, sort_by=None, sort_order='asc', page=1, per_page=20):
-    query = Expense.query.options(
-        joinedload(Expense.region),
-        joinedload(Expense.payment_type),
-        joinedload(Expense.account_name),
-        joinedload(Expense.budget_item),
-        joinedload(Expense.group)
+from app.changes.services import record_change
+from app.result_cache import cached_result
+from app.archive.services import readable
+from app.filters import FilterSpec, IN, MIN, MAX, CONTAINS
+from app.reporting import reporting_session
+from app.unit_of_work import transactional
+from app.money import minor_units, to_api
+from app.fx.services import rate_vector
+
+
+EXPENSE_FILTERS = FilterSpec(
+    Expense,
+    params={
+        'region_id': ('region_id', IN),
+        'payment_type_id': ('payment_type_id', IN),
+        'account_name_id': ('account_name_id', IN),
+        'budget_item_id': ('budget_item_id', IN),
+        'status': ('status', IN),
+        'description': ('description', CONTAINS),
+        'amount_min': ('amount', MIN),
+        'amount_max': ('amount', MAX),
+        'date_start': ('date', MIN),
+        'date_end': ('date', MAX),
+    },
+    sorts=('date', 'amount', 'status'),
+    default_sort='date',
+    facets=('status', 'region_id', 'payment_type_id', 'account_name_id', 'budget_item_id'),
+)
+
+
+def get_all(filters=None, sort_by=None, sort_order='asc', page=1, per_page=20, modified_since=None):
+    values = EXPENSE_FILTERS.parse(filters)
+    # Tarih aralığı arşivlenmiş yıllarla örtüşüyorsa arşiv de okunur
+    model = readable(Expense, *EXPENSE_FILTERS.date_range(values))
+    query = db.session.query(model).options(
+        joinedload(model.region),
+        joinedload(model.payment_type),
+        joinedload(model.account_name),
+        joinedload(model.budget_item),
+        joinedload(model.group)
     )
+    query = EXPENSE_FILTERS.apply(query, model, values)
 
-    # 🔷 Filtering
-    if filters:
-        filter_map = {
-            'region_id': Expense.region_id,
-            'payment_type_id': Expense.payment_type_id,
-            'account_name_id': Expense.account_name_id,
-            'budget_item_id': Expense.budget_item_id,
-            'status': Expense.status,
-            'description': Expense.description,
-            'amount_min': Expense.amount,
-            'amount_max': Expense.amount,
-            'date_start': Expense.date,
-            'date_end': Expense.date
-        }
-
-        for key, value in filters.items():
-            if value is None or value == '':
-                continue
-
-            if key not in filter_map:
-                continue
-
-            column = filter_map[key]
-
-            if key == 'status':
-                if isinstance(value, str) and ',' in value:
-                    statuses = [s.strip().upper() for s in value.split(',')]
-                    query = query.filter(Expense.status.in_(statuses))
-                else:
-                    query = query.filter(column == value)
-            elif key.endswith('_min'):
-                query = query.filter(column >= value)
-            elif key.endswith('_max'):
-                query = query.filter(column <= value)
-            elif key.endswith('_start'):
-                try:
-                    start_date = datetime.fromisoformat(value)
-                    query = query.filter(column >= start_date)
-                except (ValueError, TypeError):
-                    raise ValueError(f"Invalid date format for {key}. Use ISO format (YYYY-MM-DD).")
-            elif key.endswith('_end'):
-                try:
-                    end_date = datetime.fromisoformat(value)
-                    query = query.filter(column <= end_date)
-                except (ValueError, TypeError):
-                    raise ValueError(f"Invalid date format for {key}. Use ISO format (YYYY-MM-DD).")
-            elif key == 'description':
-                query = query.filter(func.lower(column).like(f"%{value.lower()}%"))
-            else:
-                query = query.filter(column == value)
-
-    valid_sort_columns = {
-        'date': Expense.date,
-        'amount': Expense.amount,
-        'remaining_amount': Expense.remaining_amount,
-        'description': Expense.description,
-        'status': Expense.status
-    }
-
-    if sort_by:
-        column = valid_sort_columns.get(sort_by)
-        if column is not None:
-            if sort_order == 'desc':
-                query = query.order_by(desc(column))
-            else:
-                query = query.order_by(asc(column))
-        else:
-            raise ValueError(f"Unsupported sort_by field: {sort_by}")
+    # Artımlı senkronizasyon: verilen zamandan sonra değişen kayıtlar
+    if modified_since is not None:
+        query = query.filter(model.updated_at >= modified_since)
 
+    query = EXPENSE_FILTERS.order_by(query, model, sort_by, sort_order)
     return query.paginate(page=page, per_page=per_page, error_out=False)
 
+
+def get_facets(filters=None, facets: str = None) -> dict:
+    """İstenen faset kolonlarının, liste ile aynı filtre altındaki değer sayılarını döner."""
+    names = EXPENSE_FILTERS.parse_facets(facets)
+    values = EXPENSE_FILTERS.parse(filters)
+    model = readable(Expense, *EXPENSE_FILTERS.date_range(values))
+    return EXPENSE_FILTERS.facet_counts(db.session, model, values, names)
+
 def get_by_id(expense_id):
     return Expense.query.get(expense_id)
 
+@transactional()
 def create(expense: Expense):
     db.session.add(expense)
-    db.session.commit()
+    db.session.flush()
+    record_change(expense, 'insert')
     return expense
 
 from decimal import Decimal
 
+@transactional()
 def update(expense_id, data):
     expense = Expense.query.get(expense_id)
     if not expense:
@@ -126,17 +104,26 @@ def update(expense_id, data):
             
             setattr(expense, field, value)
 
-    # Değişiklikleri veritabanına kaydet
-    db.session.commit()
+    # Tutar değiştiyse kalan tutar ve durum da yeniden hesaplanmalı
+    if 'amount' in data:
+        from app.payments.services import PaymentService
+        PaymentService._recalculate_expense_status(expense)
+
+    record_change(expense, 'update')
     return expense
 
+@transactional()
 def delete(expense_id):
     expense = Expense.query.get(expense_id)
     if expense:
+        # Cascade ile silinecek ödemeler de değişiklik kaydına düşülür
+        for payment in expense.payments:
+            record_change(payment, 'delete')
+        record_change(expense, 'delete')
         db.session.delete(expense)
-        db.session.commit()
     return expense
 
+@transactional()
 def create_expense_group_with_expenses(group_name, expense_template_data, repeat_count):
     group = ExpenseGroup(name=group_name, created_at=datetime.utcnow())
     db.session.add(group)
@@ -162,9 +149,66 @@ def create_expense_group_with_expenses(group_name, expense_template_data, repeat
         db.session.add(expense)
         expenses.append(expense)
 
-    db.session.commit()
+    db.session.flush()
+    for expense in expenses:
+        record_change(expense, 'insert')
 
     return {
         "expense_group": group,
         "expenses": expenses
-    }
\ No newline at end of file
+    }
+
+
+def _compute_pivot(year: int, month: int, currency: str):
+    start_date = date(year, month, 1)
+    end_date = date(year + 1, 1, 1) if month == 12 else date(year, month + 1, 1)
+
+    with reporting_session() as session:
+        model = readable(Expense, start_date, end_date, session)
+        query = (
+            session.query(
+                model.id,
+                model.date,
+                minor_units(model.amount).label("amount"),
+                model.currency,
+                model.description,
+                Region.id.label("region_id"),
+                Region.name.label("region_name"),
+                BudgetItem.id.label("budget_item_id"),
+                BudgetItem.name.label("budget_item_name")
+            )
+            .join(Region, Region.id == model.region_id)
+            .join(BudgetItem, BudgetItem.id == model.budget_item_id)
+            .filter(model.date >= start_date, model.date < end_date)
+        )
+        rows = query.all()
+        # Kurlar, satırların (gün, para birimi) kovaları için tek sorguda yüklenir
+        rates = rate_vector(session, currency, {(row.date, row.currency) for row in rows})
+
+    data = []
+    for row in rows:
+        data.append({
+            "id": row.id,
+            "date": row.date.strftime("%Y-%m-%d"),
+            "day": row.date.day,
+            "description": row.description,
+            "amount": to_api(rates.convert(row.amount, row.currency, row.date)),
+            "currency": currency,
+            "original_amount": to_api(row.amount),
+            "original_currency": row.currency,
+            "budget_item_id": row.budget_item_id,
+            "budget_item_name": row.budget_item_name,
+            "region_id": row.region_id,
+            "region_name": row.region_name,
+        })
+    return data
+
+
+def get_pivot(year: int, month: int, currency: str = BASE_CURRENCY):
+    """Aylık gider pivot verisini, ay kovasına bağlı önbellek üzerinden döner."""
+    return cached_result(
+        'expense_pivot',
+        {"year": year, "month": month, "currency": currency},
+        [f"expense_pivot:{year:04d}-{month:02d}"],
+        lambda: _compute_pivot(year, month, currency)
+    )
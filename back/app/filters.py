@@ -0,0 +1,228 @@
+from datetime import date, datetime
+from decimal import Decimal, InvalidOperation
+from enum import Enum as PyEnum
+from functools import lru_cache
+from sqlalchemy import (
+    Integer, Numeric, Date, DateTime, String, Enum, asc, desc, bindparam, func, select, literal, union_all
+)
+from .errors import AppError
+from .models import CodedEnum
+
+# GROUP BY GROUPING SETS desteği olan veritabanları; diğerlerinde UNION ALL kullanılır
+GROUPING_SETS_DIALECTS = ('mssql', 'postgresql')
+# Filtre işlemleri: tek değer/virgüllü liste (IN), aralık alt/üst sınırı ve metin araması
+IN, MIN, MAX, CONTAINS = 'in', 'min', 'max', 'contains'
+SORT_ORDERS = {'asc': asc, 'desc': desc}
+
+
+def _parse_date(value: str) -> date:
+    try:
+        return date.fromisoformat(value)
+    except ValueError:
+        return datetime.fromisoformat(value).date()
+
+
+def coercer_for(column_type):
+    """Sorgu parametresini kolonun tam Python tipine çeviren fonksiyonu döner."""
+    if isinstance(column_type, CodedEnum):
+        return lambda value: column_type.member(value.strip().upper())
+    if isinstance(column_type, Enum) and column_type.enum_class is not None:
+        enum_class = column_type.enum_class
+        return lambda value: enum_class[value.strip().upper()]
+    if isinstance(column_type, Integer):
+        return int
+    if isinstance(column_type, Numeric):
+        return Decimal
+    if isinstance(column_type, DateTime):
+        return datetime.fromisoformat
+    if isinstance(column_type, Date):
+        # date kolonu date parametresiyle karşılaştırılır; datetime parametresi kolonu
+        # dönüştürmeye zorlar ve indeks/bölüm elemesini engeller
+        return _parse_date
+    if isinstance(column_type, String):
+        return str
+    raise TypeError(f"No coercion for column type {column_type!r}")
+
+
+def _indexed_leading_columns(table) -> set:
+    """Bir indeksin ilk kolonu olan (dolayısıyla sıralamada kullanılabilen) kolon adları."""
+    leading = {column.name for column in table.primary_key.columns}
+    leading.update(index.columns[0].name for index in table.indexes if len(index.columns))
+    return leading
+
+
+class FilterSpec:
+    """
+    Bir kaynağın liste endpoint'i için bildirimsel filtre ve sıralama tanımı.
+
+    `params` sorgu parametresi adını (kolon, işlem) ikilisine eşler. Değerler bir kez,
+    kolonun tipine göre dönüştürülür ve kolon tipiyle bağlanır. Aynı parametre kümesi
+    (filtre şekli) için üretilen koşullar önbellekte tutulur; değerler bind parametresi
+    olarak verildiği için SQLAlchemy'nin derlenmiş ifade önbelleği de her şekil için bir kez
+    derler. Sıralama yalnızca bir indeksin ilk kolonu olan kolonlara izin verir.
+    """
+
+    def __init__(self, model, params: dict, sorts, default_sort: str, transforms: dict = None, facets=()):
+        self.model = model
+        self.facets = tuple(facets)
+        self.params = params
+        self.transforms = transforms or {}
+        table = model.__table__
+        unindexed = [name for name in sorts if name not in _indexed_leading_columns(table)]
+        if unindexed:
+            raise ValueError(f"Sort columns must be indexed on {table.name}: {', '.join(unindexed)}")
+        self.sorts = tuple(sorts)
+        self.default_sort = default_sort
+        self._coercers = {
+            name: coercer_for(table.c[column].type) for name, (column, _) in params.items()
+        }
+        self._coded = {
+            name for name, (column, op) in params.items()
+            if op == IN and isinstance(table.c[column].type, CodedEnum)
+        }
+
+    def _coerce(self, name: str, raw: str):
+        column, op = self.params[name]
+        raw = self.transforms.get(column, lambda value: value)(raw.strip())
+        try:
+            if op == IN:
+                values = [self._coercers[name](item.strip()) for item in raw.split(',') if item.strip()]
+                return values or None
+            if op == CONTAINS:
+                return f"%{raw.lower()}%"
+            return self._coercers[name](raw)
+        except (ValueError, TypeError, KeyError, InvalidOperation):
+            if isinstance(self.model.__table__.c[column].type, Date):
+                raise AppError(f"Invalid date format for {name}. Use ISO format (YYYY-MM-DD).", 400)
+            raise AppError(f"Invalid value for {name}: {raw!r}", 400)
+
+    def parse(self, filters) -> dict:
+        """
+        Bilinen parametreleri tipine çevrilmiş değerleriyle döner; boş ve tanımsız parametreler
+        (sayfalama, önbellek kırıcılar vb.) yok sayılır.
+        """
+        values = {}
+        for name, raw in (filters or {}).items():
+            if name not in self.params or raw is None or not str(raw).strip():
+                continue
+            value = self._coerce(name, str(raw))
+            if value is not None:
+                values[name] = value
+        return values
+
+    def date_range(self, values: dict, start: str = 'date_start', end: str = 'date_end'):
+        """Arşiv örtüşme kontrolü için ayrıştırılmış tarih aralığını döner."""
+        return values.get(start), values.get(end)
+
+    def _criteria(self, model, shape):
+        criteria = []
+        for name, many in shape:
+            column_name, op = self.params[name]
+            column = getattr(model, column_name)
+            if op == CONTAINS:
+                criteria.append(func.lower(column).like(bindparam(f"flt_{name}", type_=String())))
+                continue
+            if name in self._coded:
+                # Durum kodları sabit yazılır; böylece açık kalemlerin filtreli indeksleri eşleşebilir
+                param = bindparam(f"flt_{name}", type_=column.type, expanding=True, literal_execute=True)
+                criteria.append(column.in_(param))
+                continue
+            param = bindparam(f"flt_{name}", type_=column.type, expanding=many)
+            if op == IN:
+                criteria.append(column.in_(param) if many else column == param)
+            elif op == MIN:
+                criteria.append(column >= param)
+            elif op == MAX:
+                criteria.append(column <= param)
+        return tuple(criteria)
+
+    @lru_cache(maxsize=128)
+    def _compiled(self, shape):
+        return self._criteria(self.model, shape)
+
+    def criteria(self, model, values: dict) -> list:
+        """
+        Değerleri bağlanmış koşulları döner. `model` arşivle birleşik takma ad da olabilir;
+        bu durumda koşullar o takma ad için yeniden kurulur.
+        """
+        if not values:
+            return []
+        shape = tuple(sorted((name, isinstance(value, list) and len(value) > 1) for name, value in values.items()))
+        criteria = self._compiled(shape) if model is self.model else self._criteria(model, shape)
+        params = {
+            f"flt_{name}": value[0] if isinstance(value, list) and len(value) == 1 and name not in self._coded else value
+            for name, value in values.items()
+        }
+        return [criterion.params(params) for criterion in criteria]
+
+    def apply(self, query, model, values: dict):
+        return query.filter(*self.criteria(model, values))
+
+    def order_by(self, query, model, sort_by: str = None, sort_order: str = 'desc'):
+        """İzin verilen (indeksli) kolona göre sıralar; sayfalama kararlı olsun diye id eklenir."""
+        sort_by = sort_by or self.default_sort
+        if sort_by not in self.sorts:
+            raise AppError(f"Unsupported sort_by field: {sort_by}. Use one of: {', '.join(self.sorts)}.", 400)
+        direction = SORT_ORDERS.get((sort_order or 'desc').lower())
+        if direction is None:
+            raise AppError("sort_order must be 'asc' or 'desc'.", 400)
+        return query.order_by(direction(getattr(model, sort_by)), direction(model.id))
+
+    def parse_facets(self, raw: str) -> list:
+        names = [name.strip() for name in (raw or '').split(',') if name.strip()]
+        unknown = [name for name in names if name not in self.facets]
+        if unknown:
+            raise AppError(f"Unsupported facets: {', '.join(unknown)}. Use any of: {', '.join(self.facets)}.", 400)
+        return list(dict.fromkeys(names))
+
+    def facet_counts(self, session, model, values: dict, names) -> dict:
+        """
+        Geçerli filtre altında her faset kolonunun değer dağılımını tek sorguda hesaplar.
+        MSSQL/PostgreSQL'de GROUP BY GROUPING SETS kullanılır; her satırın hangi kümeye ait
+        olduğu GROUPING() ile bulunur. Diğer veritabanlarında aynı satır biçimini üreten
+        kolon başına gruplu sorgular UNION ALL ile birleştirilir.
+        """
+        if not names:
+            return {}
+        columns = [getattr(model, name) for name in names]
+        criteria = self.criteria(model, values)
+        count = func.count().label('count')
+
+        if session.get_bind().dialect.name in GROUPING_SETS_DIALECTS:
+            flags = [func.grouping(column).label(f"g_{name}") for name, column in zip(names, columns)]
+            statement = (
+                select(*columns, *flags, count)
+                .select_from(model)
+                .where(*criteria)
+                .group_by(func.grouping_sets(*columns))
+            )
+            rows = []
+            for row in session.execute(statement):
+                index = next(i for i, flag in enumerate(row[len(names):-1]) if flag == 0)
+                rows.append((index, row[index], row.count))
+        else:
+            branches = [
+                select(
+                    literal(index).label('facet'),
+                    *[
+                        other if other is column else literal(None, type_=other.type).label(name)
+                        for name, other in zip(names, columns)
+                    ],
+                    count,
+                )
+                .select_from(model)
+                .where(*criteria)
+                .group_by(column)
+                for index, column in enumerate(columns)
+            ]
+            rows = [(row.facet, row[1 + row.facet], row.count) for row in session.execute(union_all(*branches))]
+
+        result = {name: [] for name in names}
+        for index, value, total in rows:
+            result[names[index]].append({
+                "value": value.name if isinstance(value, PyEnum) else value,
+                "count": total,
+            })
+        for buckets in result.values():
+            buckets.sort(key=lambda bucket: (-bucket["count"], str(bucket["value"])))
+        return result
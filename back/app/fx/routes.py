@@ -0,0 +1,41 @@
+from datetime import datetime
+from flask import Blueprint, request, jsonify
+from marshmallow import ValidationError
+from .services import FxRateService
+from .schemas import FxRateSchema, FxRateUploadSchema
+from ..errors import AppError
+
+fx_bp = Blueprint('fx_api', __name__, url_prefix='/api/fx-rates')
+
+fx_rate_service = FxRateService()
+fx_rates_schema = FxRateSchema(many=True)
+fx_rate_upload_schema = FxRateUploadSchema()
+
+
+@fx_bp.route('/', methods=['GET'], strict_slashes=False)
+def list_fx_rates():
+    """Kurları para birimi ve tarih aralığına göre listeler."""
+    try:
+        date_start, date_end = (
+            datetime.strptime(value, '%Y-%m-%d').date() if value else None
+            for value in (request.args.get('date_start'), request.args.get('date_end'))
+        )
+    except ValueError:
+        return jsonify({"error": "Invalid date format. Please use YYYY-MM-DD."}), 400
+    try:
+        rates = fx_rate_service.get_all(request.args.get('currency'), date_start, date_end)
+        return jsonify(fx_rates_schema.dump(rates)), 200
+    except AppError as e:
+        return jsonify({"error": e.message}), e.status_code
+
+
+@fx_bp.route('/', methods=['PUT'], strict_slashes=False)
+def upload_fx_rates():
+    """Kurları toplu yükler; aynı (para birimi, tarih) için var olan kur güncellenir."""
+    try:
+        data = fx_rate_upload_schema.load(request.get_json(silent=True) or {})
+        return jsonify({"upserted": fx_rate_service.upsert(data['rates'])}), 200
+    except ValidationError as err:
+        return jsonify(err.messages), 400
+    except AppError as e:
+        return jsonify({"error": e.message}), e.status_code
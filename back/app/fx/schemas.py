@@ -0,0 +1,14 @@
+from marshmallow import Schema, fields, validate
+from ..models import BASE_CURRENCY, CURRENCIES
+
+
+class FxRateSchema(Schema):
+    """Günlük kur: 1 birim yabancı paranın ana para birimi karşılığı."""
+    currency = fields.Str(required=True, validate=validate.OneOf([c for c in CURRENCIES if c != BASE_CURRENCY]))
+    rate_date = fields.Date(required=True)
+    rate = fields.Decimal(as_string=True, places=6, required=True, validate=validate.Range(min=0, min_inclusive=False))
+    updated_at = fields.DateTime(dump_only=True)
+
+
+class FxRateUploadSchema(Schema):
+    rates = fields.List(fields.Nested(FxRateSchema), required=True, validate=validate.Length(min=1))
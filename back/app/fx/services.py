@@ -0,0 +1,122 @@
+from bisect import bisect_right
+from decimal import Decimal
+from sqlalchemy import select, func
+from sqlalchemy.orm import aliased
+from .. import db
+from ..models import FxRate, BASE_CURRENCY, CURRENCIES
+from ..errors import AppError
+from ..unit_of_work import transactional
+from ..money import scaled
+
+_ONE = Decimal('1')
+
+
+def parse_currency(raw: str = None) -> str:
+    """Raporlama para birimi parametresini doğrular; verilmemişse BASE_CURRENCY döner."""
+    if raw is None or not str(raw).strip():
+        return BASE_CURRENCY
+    currency = str(raw).strip().upper()
+    if currency not in CURRENCIES:
+        raise AppError(f"Unsupported currency: {raw}. Use one of: {', '.join(CURRENCIES)}.", 400)
+    return currency
+
+
+class RateVector:
+    """
+    Para birimi başına tarihe göre sıralı kur dizileri. Bir (gün, para birimi) kovasının
+    çarpanı o güne kadar bilinen son kurdan ikili arama ile bulunur; böylece dönüşüm satır
+    başına değil, tarih × para birimi toplamları üzerinde yapılır.
+    """
+
+    def __init__(self, target: str, series: dict):
+        self.target = target
+        self._series = series    # para birimi -> ([tarihler], [kurlar])
+        self._factors = {}
+
+    def _rate(self, currency: str, day) -> Decimal:
+        if currency == BASE_CURRENCY:
+            return _ONE
+        days, rates = self._series.get(currency, ((), ()))
+        index = bisect_right(days, day) - 1
+        if index < 0:
+            raise AppError(f"No {currency} exchange rate on or before {day.isoformat()}.", 422)
+        return rates[index]
+
+    def factor(self, currency: str, day) -> Decimal:
+        """1 birim `currency`'nin `day` günündeki raporlama para birimi karşılığı."""
+        if currency == self.target:
+            return _ONE
+        key = (currency, day)
+        if key not in self._factors:
+            self._factors[key] = self._rate(currency, day) / self._rate(self.target, day)
+        return self._factors[key]
+
+    def convert(self, minor: int, currency: str, day) -> int:
+        """Kuruş cinsinden tutarı raporlama para birimine çevirir."""
+        if currency == self.target or not minor:
+            return minor
+        return scaled(minor, self.factor(currency, day))
+
+    def total(self, rows) -> int:
+        """(gün, para birimi, kuruş) kovalarını çevirip toplar."""
+        return sum(self.convert(minor, currency, day) for day, currency, minor in rows)
+
+
+def rate_vector(session, target: str, keys) -> RateVector:
+    """
+    (gün, para birimi) kovaları için gereken kurları tek sorguda yükler: her para biriminin
+    en erken kovadan önceki son kuru ile en geç kovaya kadarki tüm kurları. Tüm kovalar
+    raporlama para birimindeyse veritabanına gidilmez.
+    """
+    keys = list(keys)
+    currencies = {currency for _, currency in keys}
+    if currencies <= {target}:
+        return RateVector(target, {})
+    needed = (currencies | {target}) - {BASE_CURRENCY}
+    start = min(day for day, _ in keys)
+    end = max(day for day, _ in keys)
+
+    earlier = aliased(FxRate)
+    first_day = (
+        select(func.max(earlier.rate_date))
+        .where(earlier.currency == FxRate.currency, earlier.rate_date <= start)
+        .correlate(FxRate)
+        .scalar_subquery()
+    )
+    query = (
+        select(FxRate.currency, FxRate.rate_date, FxRate.rate)
+        .where(
+            FxRate.currency.in_(sorted(needed)),
+            FxRate.rate_date <= end,
+            FxRate.rate_date >= func.coalesce(first_day, start),
+        )
+        .order_by(FxRate.currency, FxRate.rate_date)
+    )
+    series = {}
+    for currency, rate_date, rate in session.execute(query):
+        days, rates = series.setdefault(currency, ([], []))
+        days.append(rate_date)
+        rates.append(Decimal(rate))
+    return RateVector(target, series)
+
+
+class FxRateService:
+    def get_all(self, currency: str = None, date_start=None, date_end=None) -> list:
+        query = FxRate.query
+        if currency:
+            query = query.filter(FxRate.currency == parse_currency(currency))
+        if date_start:
+            query = query.filter(FxRate.rate_date >= date_start)
+        if date_end:
+            query = query.filter(FxRate.rate_date <= date_end)
+        return query.order_by(FxRate.currency, FxRate.rate_date).all()
+
+    @transactional(error_message="Internal error on exchange rate upload")
+    def upsert(self, rates: list) -> int:
+        """
+        Kurları (para birimi, tarih) anahtarına göre ekler ya da günceller. Kur tablosu
+        değiştiğinde çevrilmiş rapor önbellekleri commit sonrası temizlenir.
+        """
+        for row in rates:
+            db.session.merge(FxRate(currency=row['currency'], rate_date=row['rate_date'], rate=row['rate']))
+        return len(rates)
@@ -0,0 +1,169 @@
+import threading
+import time
+from functools import wraps
+from flask import current_app, g, has_app_context
+from sqlalchemy import event
+from . import db
+from .errors import AppError
+
+# Sürücülerin zaman aşımında döndüğü hatalar: pyodbc'de HYT00 SQLSTATE'i, PostgreSQL'de
+# query_canceled (57014), SQLite'ta ilerleme işleyicisinin kestiği sorgu
+TIMEOUT_SQLSTATES = ('HYT00', 'HYT01', '57014')
+APPLIED_TIMEOUT_KEY = 'statement_timeout'
+
+
+def current_timeout():
+    """Bu app context'teki sorgular için geçerli zaman aşımı (sn); sınırsız için None."""
+    return g.get('statement_timeout') if has_app_context() else None
+
+
+def apply_timeout(seconds):
+    """Yeni açılan app context'lerde (örn. thread havuzu) isteğin zaman aşımını sürdürür."""
+    g.statement_timeout = seconds
+
+
+def page_args(filters: dict, default: int = None):
+    """
+    Sorgu parametrelerinden page/per_page değerlerini çıkarır. per_page, MAX_PER_PAGE
+    sınırına çekilir; sayı olmayan ya da 1'den küçük değerler 400 döner.
+    """
+    config = current_app.config
+    try:
+        page = int(filters.pop('page', 1))
+        per_page = int(filters.pop('per_page', default or config['DEFAULT_PER_PAGE']))
+    except (TypeError, ValueError):
+        raise AppError("page and per_page must be integers.", 400)
+    if page < 1 or per_page < 1:
+        raise AppError("page and per_page must be positive.", 400)
+    return page, min(per_page, config['MAX_PER_PAGE'])
+
+
+def row_limit(raw=None) -> int:
+    """Sayfalanmayan listelerde tek istekte dönecek en fazla satır sayısı (MAX_LIST_ROWS ile sınırlı)."""
+    maximum = current_app.config['MAX_LIST_ROWS']
+    if raw is None:
+        return maximum
+    try:
+        limit = int(raw)
+    except (TypeError, ValueError):
+        raise AppError("limit must be an integer.", 400)
+    if limit < 1:
+        raise AppError("limit must be positive.", 400)
+    return min(limit, maximum)
+
+
+def _is_timeout(error: Exception) -> bool:
+    sqlstate = getattr(error, 'pgcode', None) or getattr(error, 'sqlstate', None)
+    if sqlstate is None and error.args and isinstance(error.args[0], str):
+        sqlstate = error.args[0]    # pyodbc hataları (sqlstate, mesaj) şeklindedir
+    return sqlstate in TIMEOUT_SQLSTATES or str(error) == 'interrupted'
+
+
+def _apply_statement_timeout(conn, clauseelement, multiparams, params, execution_options):
+    """
+    Sorgu zaman aşımını sürücü seviyesinde uygular. İmleç bu olaydan sonra açıldığı için
+    pyodbc'nin bağlantı zaman aşımı o sorguya da yansır.
+    """
+    seconds = current_timeout()
+    dbapi_connection = conn.connection.dbapi_connection
+    dialect = conn.dialect.name
+    if dialect == 'mssql':
+        dbapi_connection.timeout = int(seconds) if seconds else 0
+    elif dialect == 'postgresql':
+        # SET oturum boyunca kalıcıdır; havuza dönen bağlantı bir sonraki kullanımda düzeltilir.
+        # Geri alınan transaction SET'i de geri alır, bu yüzden kayıtlı değer rollback'te silinir.
+        milliseconds = int(seconds * 1000) if seconds else 0
+        if conn.connection.info.get(APPLIED_TIMEOUT_KEY, 0) != milliseconds:
+            cursor = dbapi_connection.cursor()
+            try:
+                cursor.execute(f"SET statement_timeout = {milliseconds}")
+            finally:
+                cursor.close()
+            conn.connection.info[APPLIED_TIMEOUT_KEY] = milliseconds
+    elif dialect == 'sqlite':
+        if seconds:
+            deadline = time.monotonic() + seconds
+            dbapi_connection.set_progress_handler(lambda: time.monotonic() > deadline, 10000)
+        else:
+            dbapi_connection.set_progress_handler(None, 0)
+
+
+def _forget_applied_timeout(conn, *args):
+    """PostgreSQL'de rollback (savepoint dahil) içindeki SET'i de geri alır; değer yeniden uygulanmalı."""
+    conn.connection.info.pop(APPLIED_TIMEOUT_KEY, None)
+
+
+def _forget_timeout_on_reset(dbapi_connection, connection_record, *args):
+    connection_record.info.pop(APPLIED_TIMEOUT_KEY, None)
+
+
+def watch_engine(engine):
+    """Sorgu zaman aşımı olaylarını verilen engine'e bağlar."""
+    event.listen(engine, 'before_execute', _apply_statement_timeout)
+    event.listen(engine, 'handle_error', _translate_timeout)
+    event.listen(engine, 'rollback', _forget_applied_timeout)
+    event.listen(engine, 'rollback_savepoint', _forget_applied_timeout)
+    # Havuza dönüşteki rollback Connection olayı üretmez
+    event.listen(engine.pool, 'reset', _forget_timeout_on_reset)
+
+
+def _translate_timeout(context):
+    if current_timeout() and _is_timeout(context.original_exception):
+        return AppError("The query exceeded its time limit, please narrow the request and retry.", 503)
+    return None
+
+
+class ConcurrencyLimiter:
+    """Ağır rapor sorguları için süreç başına sınırlı sayıda eş zamanlı çalışma izni."""
+
+    def __init__(self, slots: int):
+        self._semaphore = threading.BoundedSemaphore(slots)
+
+    def acquire(self, wait: float) -> bool:
+        return self._semaphore.acquire(timeout=wait) if wait else self._semaphore.acquire(blocking=False)
+
+    def release(self):
+        self._semaphore.release()
+
+
+def _limiter() -> ConcurrencyLimiter:
+    return current_app.extensions['heavy_query_limiter']
+
+
+def governed(timeout: str = 'list', heavy: bool = False):
+    """
+    Endpoint'in sorgularına STATEMENT_TIMEOUTS[timeout] süresini uygular.
+    `heavy` verilirse istek, HEAVY_QUERY_SLOTS izinden birini HEAVY_QUERY_WAIT_SECONDS
+    içinde alamazsa sorgu çalıştırılmadan 503 döner.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            config = current_app.config
+            if heavy and not _limiter().acquire(config['HEAVY_QUERY_WAIT_SECONDS']):
+                raise AppError("Too many report requests are running, please retry later.", 503)
+            apply_timeout(config['STATEMENT_TIMEOUTS'].get(timeout))
+            try:
+                return view(*args, **kwargs)
+            finally:
+                g.pop('statement_timeout', None)
+                if heavy:
+                    _limiter().release()
+        return wrapper
+    return decorator
+
+
+def init_governance(app):
+    """Sorgu zaman aşımı olaylarını birincil ve okuma kopyası engine'lerine bağlar."""
+    app.extensions['heavy_query_limiter'] = ConcurrencyLimiter(app.config['HEAVY_QUERY_SLOTS'])
+    with app.app_context():
+        engines = [*db.engines.values(), *app.extensions.get('db_replicas', ())]
+    for engine in engines:
+        watch_engine(engine)
+
+    @app.after_request
+    def _retry_after(response):
+        # Dolu rapor slotları ve zaman aşımı 503 döner; istemci ne zaman yeniden deneyeceğini bilsin
+        if response.status_code == 503 and 'Retry-After' not in response.headers:
+            response.headers['Retry-After'] = str(app.config['RETRY_AFTER_SECONDS'])
+        return response
@@ -0,0 +1,87 @@
+import hashlib
+from datetime import date, timezone
+from flask import request, g, current_app, make_response
+from sqlalchemy import select, func
+from . import db
+from .models import ChangeLog
+
+
+def _version_columns(model):
+    """
+    Bir tablonun sürümünü belirleyen (adet, en son değişiklik) ifadelerini döner.
+    Yerinde yapılan güncellemelerin de ETag'i değiştirmesi için her tablonun
+    updated_at kolonu olmalıdır.
+    """
+    if not hasattr(model, 'updated_at'):
+        raise ValueError(f"{model.__tablename__} tablosunda updated_at kolonu yok; koşullu GET için gerekli")
+    count = select(func.count()).select_from(model).scalar_subquery()
+    latest = select(func.max(model.updated_at)).scalar_subquery()
+    return count, latest
+
+
+def compute_validator(models):
+    """
+    Verilen tabloların sürüm bilgisini tek bir sorguyla okur.
+    Dönen değer (imza, son_değişiklik_zamanı) ikilisidir; son değişiklik, updated_at
+    kolonlarının ve change_log'daki son silme kaydının en büyüğüdür.
+    """
+    columns = []
+    for model in models:
+        columns.extend(_version_columns(model))
+    columns.append(
+        select(func.max(ChangeLog.created_at))
+        .where(ChangeLog.entity.in_([model.__tablename__ for model in models]), ChangeLog.operation == 'delete')
+        .scalar_subquery()
+    )
+    values = tuple(db.session.execute(select(*columns)).one())
+
+    timestamps = [value for value in values[1::2] if value is not None]
+    if values[-1] is not None:
+        timestamps.append(values[-1])
+    last_modified = max(timestamps).replace(tzinfo=timezone.utc) if timestamps else None
+    return values, last_modified
+
+
+def enable_conditional_get(blueprint, models, cache_control='private, no-cache'):
+    """
+    Blueprint'teki GET isteklerine ETag/Last-Modified ekler ve istemcinin If-None-Match ile
+    gönderdiği sürüm hâlâ geçerliyse sorgu ve serileştirme çalıştırılmadan 304 döner.
+    Last-Modified bilgi amaçlıdır; If-Modified-Since tek başına 304 döndürmez.
+    ETag; istek yolu, sorgu parametreleri, bugünün tarihi (varsayılan tarih aralıkları
+    güne bağlı olduğu için) ve tabloların sürüm bilgisinden üretilir.
+    """
+    for model in models:
+        _version_columns(model)
+
+    @blueprint.before_request
+    def _check_not_modified():
+        if request.method not in ('GET', 'HEAD') or not current_app.config.get('HTTP_CACHE_ENABLED', True):
+            return None
+
+        values, last_modified = compute_validator(models)
+        seed = repr((request.path, sorted(request.args.items(multi=True)), date.today().isoformat(), values))
+        g.http_cache_etag = hashlib.sha1(seed.encode('utf-8')).hexdigest()
+        g.http_cache_last_modified = last_modified
+
+        # Yalnızca ETag ile doğrulanır: If-Modified-Since saniye hassasiyetinde olduğundan ve
+        # satır sayısını içermediğinden, aynı saniyedeki bir yazımdan sonra bayat 304 dönebilirdi
+        if request.if_none_match and request.if_none_match.contains(g.http_cache_etag):
+            response = make_response('', 304)
+            _set_validators(response, cache_control)
+            return response
+        return None
+
+    @blueprint.after_request
+    def _add_validators(response):
+        if response.status_code == 200 and getattr(g, 'http_cache_etag', None):
+            _set_validators(response, cache_control)
+        return response
+
+    return blueprint
+
+
+def _set_validators(response, cache_control):
+    response.set_etag(g.http_cache_etag)
+    if g.http_cache_last_modified:
+        response.last_modified = g.http_cache_last_modified
+    response.headers['Cache-Control'] = cache_control
@@ -0,0 +1,112 @@
+import hashlib
+from datetime import datetime, timedelta
+from functools import wraps
+from flask import request, jsonify, current_app, make_response
+from sqlalchemy.exc import IntegrityError
+from . import db
+from .models import IdempotencyKey
+from .unit_of_work import transactional
+
+HEADER = 'Idempotency-Key'
+MAX_KEY_LENGTH = 255
+
+
+def _request_hash() -> str:
+    return hashlib.sha256(request.get_data()).hexdigest()
+
+
+def _find(key: str, scope: str):
+    return IdempotencyKey.query.filter_by(key=key, scope=scope).first()
+
+
+def _replay(record: IdempotencyKey, request_hash: str):
+    """Kayıtlı anahtar için saklanan yanıtı ya da uygun hata yanıtını döner."""
+    if record.request_hash != request_hash:
+        return jsonify({"error": f"{HEADER} was already used with a different request body."}), 422
+    if record.status_code is None:
+        return jsonify({"error": f"A request with this {HEADER} is still being processed."}), 409
+    response = make_response(jsonify(record.response_body), record.status_code)
+    response.headers['Idempotent-Replayed'] = 'true'
+    return response
+
+
+class _KeyTaken(Exception):
+    """Aynı anahtarla eş zamanlı gelen başka bir istek kaydı önce ekledi."""
+
+
+class _Rejected(Exception):
+    """View başarısız bir yanıt döndü; anahtar ve servisin değişiklikleri geri alınmalı."""
+
+    def __init__(self, response):
+        super().__init__(response.status_code)
+        self.response = response
+
+
+def idempotent(view):
+    """
+    POST endpoint'lerine Idempotency-Key desteği ekler.
+    Anahtar kaydı, view'in çağırdığı servisin değişiklikleri ve saklanan yanıt tek bir iş
+    birimi olarak commit edilir: servisin @transactional'ı bu iş biriminin içinde savepoint
+    olarak çalışır, deadlock gibi hatalarda anahtar dahil tüm işlem baştan denenir. Böylece
+    yanıtı olmayan bir anahtar kaydı commit edilemez ve eş zamanlı bir tekrar, ilk istek
+    bitene kadar benzersiz indekste bekleyip onun yanıtını alır. Aynı anahtarla gelen
+    sonraki tekrarlar yalnızca bir indeks araması ile yanıtlanır.
+    """
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        key = request.headers.get(HEADER)
+        if not key:
+            return view(*args, **kwargs)
+        if len(key) > MAX_KEY_LENGTH:
+            return jsonify({"error": f"{HEADER} must be at most {MAX_KEY_LENGTH} characters."}), 400
+
+        scope = f"{request.method} {request.path}"
+        request_hash = _request_hash()
+        now = datetime.utcnow()
+
+        record = _find(key, scope)
+        if record is not None and record.expires_at <= now:
+            db.session.delete(record)
+            db.session.commit()
+            record = None
+        if record is not None:
+            return _replay(record, request_hash)
+
+        ttl = timedelta(hours=current_app.config.get('IDEMPOTENCY_KEY_TTL_HOURS', 24))
+
+        @transactional(name=f"idempotent:{view.__qualname__}")
+        def run():
+            record = IdempotencyKey(key=key, scope=scope, request_hash=request_hash, expires_at=now + ttl)
+            db.session.add(record)
+            try:
+                db.session.flush()
+            except IntegrityError as e:
+                raise _KeyTaken() from e
+
+            response = make_response(view(*args, **kwargs))
+            if not 200 <= response.status_code < 300:
+                # Hata yanıtları saklanmaz; istemci aynı anahtarla tekrar deneyebilir
+                raise _Rejected(response)
+            record.status_code = response.status_code
+            record.response_body = response.get_json()
+            return response
+
+        try:
+            return run()
+        except _Rejected as rejected:
+            return rejected.response
+        except _KeyTaken:
+            record = _find(key, scope)
+            if record is None:
+                return jsonify({"error": f"A request with this {HEADER} is still being processed."}), 409
+            return _replay(record, request_hash)
+    return wrapper
+
+
+def purge_expired_keys(now: datetime = None) -> int:
+    """Süresi dolmuş Idempotency-Key kayıtlarını siler."""
+    deleted = IdempotencyKey.query.filter(
+        IdempotencyKey.expires_at < (now or datetime.utcnow())
+    ).delete(synchronize_session=False)
+    db.session.commit()
+    return deleted
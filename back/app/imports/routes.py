@@ -0,0 +1,43 @@
+from flask import Blueprint, request, jsonify
+from .services import ImportService
+from ..errors import AppError
+
+import_bp = Blueprint('import_api', __name__, url_prefix='/api/imports')
+
+import_service = ImportService()
+
+
+def _read_upload_options():
+    """Multipart isteğinden dosyayı ve içe aktarma seçeneklerini okur."""
+    upload = request.files.get('file')
+    if upload is None or not upload.filename:
+        raise AppError("A CSV file is required in the 'file' field.", 400)
+    delimiter = request.form.get('delimiter', request.args.get('delimiter', ','))
+    if delimiter == '\\t':
+        delimiter = '\t'
+    if len(delimiter) != 1:
+        raise AppError("Delimiter must be a single character.", 400)
+    dry_run = request.args.get('dry_run', 'false').lower() in ('1', 'true', 'yes')
+    return upload, delimiter, dry_run
+
+
+@import_bp.route('/expenses', methods=['POST'])
+def import_expenses():
+    """CSV dosyasındaki giderleri toplu olarak içe aktarır ve satır bazlı hata raporu döner."""
+    try:
+        upload, delimiter, dry_run = _read_upload_options()
+        report = import_service.import_expenses(upload.stream, delimiter=delimiter, dry_run=dry_run)
+        return jsonify(report), 200
+    except AppError as e:
+        return jsonify({"error": e.message}), e.status_code
+
+
+@import_bp.route('/incomes', methods=['POST'])
+def import_incomes():
+    """CSV dosyasındaki gelirleri toplu olarak içe aktarır ve satır bazlı hata raporu döner."""
+    try:
+        upload, delimiter, dry_run = _read_upload_options()
+        report = import_service.import_incomes(upload.stream, delimiter=delimiter, dry_run=dry_run)
+        return jsonify(report), 200
+    except AppError as e:
+        return jsonify({"error": e.message}), e.status_code
@@ -0,0 +1,285 @@
+import csv
+import io
+import re
+from datetime import datetime
+from decimal import Decimal
+from functools import partial
+from itertools import islice
+from sqlalchemy import insert
+from .. import db
+from ..models import (
+    Region, PaymentType, AccountName, BudgetItem, Company,
+    Expense, Income, ExpenseStatus, IncomeStatus
+)
+from ..errors import AppError
+from ..changes.services import record_bulk_changes
+from ..result_cache import invalidate_dates
+
+CHUNK_SIZE = 1000
+MAX_REPORTED_ERRORS = 1000
+
+
+def iter_csv_rows(stream, delimiter=',', required=()):
+    """
+    Yüklenen CSV dosyasını satır satır okuyan bir generator.
+    Dosyanın tamamı belleğe alınmaz; her adımda (satır_no, satır_sözlüğü) döner.
+    `required` içindeki her alan için ya '<alan>' ya da '<alan>_id' kolonu bulunmalıdır.
+    """
+    text = io.TextIOWrapper(stream, encoding='utf-8-sig', newline='')
+    reader = csv.DictReader(text, delimiter=delimiter)
+    try:
+        if not reader.fieldnames:
+            raise AppError("CSV file is empty or has no header row.", 400)
+        reader.fieldnames = [name.strip().lower() for name in reader.fieldnames]
+        missing = [
+            field for field in required
+            if field not in reader.fieldnames and f"{field}_id" not in reader.fieldnames
+        ]
+        if missing:
+            raise AppError(f"CSV header is missing required columns: {', '.join(missing)}", 400)
+
+        # Başlık satırı 1. satır olduğu için veri satırları 2'den başlar
+        for row_number, row in enumerate(reader, start=2):
+            yield row_number, {k: (v.strip() if isinstance(v, str) else v) for k, v in row.items() if k}
+    except UnicodeDecodeError as e:
+        raise AppError(f"CSV file must be UTF-8 encoded: {e}", 400) from e
+
+
+def iter_chunks(rows, size=CHUNK_SIZE):
+    """Bir iterator'ı sabit boyutlu listelere böler."""
+    iterator = iter(rows)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+class NameLookup:
+    """
+    Referans tablolarındaki isimleri id'lere çeviren bellek içi sözlük.
+    Her içe aktarma işleminde bir kez oluşturulur, böylece satır başına sorgu atılmaz.
+    """
+
+    def __init__(self, model):
+        self.model = model
+        self.ids = set()
+        self.by_name = {}
+        self.ambiguous = set()
+        for id_, name in db.session.query(model.id, model.name):
+            self.ids.add(id_)
+            key = self._normalize(name)
+            if key in self.by_name:
+                self.ambiguous.add(key)
+            self.by_name[key] = id_
+
+    @staticmethod
+    def _normalize(name):
+        return ' '.join(str(name).split()).casefold()
+
+    def resolve(self, row, field):
+        """Satırdaki '<field>_id' ya da '<field>' (isim) kolonundan id'yi çözer."""
+        raw_id = row.get(f"{field}_id")
+        if raw_id:
+            try:
+                id_ = int(raw_id)
+            except ValueError:
+                raise ValueError(f"'{raw_id}' is not a valid id.")
+            if id_ not in self.ids:
+                raise ValueError(f"No record with id {id_}.")
+            return id_
+
+        name = row.get(field)
+        if not name:
+            raise ValueError("Missing data for required field.")
+        key = self._normalize(name)
+        if key in self.ambiguous:
+            raise ValueError(f"'{name}' matches more than one record, use '{field}_id' instead.")
+        if key not in self.by_name:
+            raise ValueError(f"'{name}' not found.")
+        return self.by_name[key]
+
+
+def parse_date(value):
+    if not value:
+        raise ValueError("Missing data for required field.")
+    for fmt in ('%Y-%m-%d', '%d.%m.%Y', '%d/%m/%Y'):
+        try:
+            return datetime.strptime(value, fmt).date()
+        except ValueError:
+            continue
+    raise ValueError(f"'{value}' is not a valid date. Use YYYY-MM-DD or DD.MM.YYYY.")
+
+
+# Kabul edilen tutar yazımları; tek ayırıcının ardından üç hane gelen "1.234" / "1,234" gibi
+# hem binlik hem ondalık okunabilecek değerler bilerek dışarıda bırakılır.
+AMOUNT_FORMATS = (
+    (re.compile(r'\d+(?:[.,]\d{1,2})?'), None),           # 1234 / 1234.5 / 1234,56
+    (re.compile(r'\d{1,3}(?:\.\d{3})+,\d{1,2}'), '.'),     # 1.234,56
+    (re.compile(r'\d{1,3}(?:\.\d{3}){2,}'), '.'),          # 1.234.567
+    (re.compile(r'\d{1,3}(?:,\d{3})+\.\d{1,2}'), ','),     # 1,234.56
+    (re.compile(r'\d{1,3}(?:,\d{3}){2,}'), ','),            # 1,234,567
+)
+
+
+def parse_amount(value, column=None):
+    """
+    Tutarı Decimal'e çevirir. `column` verilirse değerin kolonun hassasiyetine
+    (örn. Numeric(10,2) için 99999999.99) sığdığı da kontrol edilir; böylece taşan
+    değerler flush sırasında parçayı bozmak yerine satır hatası olarak raporlanır.
+    """
+    if not value:
+        raise ValueError("Missing data for required field.")
+    normalized = value.replace(' ', '')
+    for pattern, thousands in AMOUNT_FORMATS:
+        if pattern.fullmatch(normalized):
+            break
+    else:
+        raise ValueError(f"'{value}' is not a valid amount. Use 1234.56, 1234,56, 1.234,56 or 1,234.56.")
+    if thousands:
+        normalized = normalized.replace(thousands, '')
+    amount = Decimal(normalized.replace(',', '.')).quantize(Decimal('0.01'))
+    if amount < Decimal('0.01'):
+        raise ValueError("Amount must be positive.")
+    if column is not None:
+        limit = Decimal(10) ** (column.type.precision - column.type.scale)
+        if amount >= limit:
+            raise ValueError(f"Amount must be less than {limit}.")
+    return amount
+
+
+class ImportService:
+    """CSV dosyalarından toplu gider/gelir aktarımını yönetir."""
+
+    def __init__(self, chunk_size: int = CHUNK_SIZE):
+        self.chunk_size = chunk_size
+
+    def _build_expense_row(self, row, lookups):
+        errors = {}
+        values = {}
+        for field, parser in (
+            ('date', parse_date),
+            ('amount', partial(parse_amount, column=Expense.__table__.c.amount)),
+        ):
+            try:
+                values[field] = parser(row.get(field))
+            except ValueError as e:
+                errors[field] = str(e)
+        for field in ('region', 'payment_type', 'account_name', 'budget_item'):
+            try:
+                values[f"{field}_id"] = lookups[field].resolve(row, field)
+            except ValueError as e:
+                errors[field] = str(e)
+        description = row.get('description') or None
+        if description and len(description) > 255:
+            errors['description'] = "Longer than maximum length 255."
+        if errors:
+            return None, errors
+
+        values['description'] = description
+        values['remaining_amount'] = values['amount']
+        values['status'] = ExpenseStatus.UNPAID.name
+        values['created_at'] = datetime.utcnow()
+        return values, None
+
+    def _build_income_row(self, row, lookups):
+        errors = {}
+        values = {}
+        for field, parser in (
+            ('date', parse_date),
+            ('total_amount', partial(parse_amount, column=Income.__table__.c.total_amount)),
+        ):
+            try:
+                values[field] = parser(row.get(field))
+            except ValueError as e:
+                errors[field] = str(e)
+        for field in ('region', 'account_name', 'budget_item', 'company'):
+            try:
+                values[f"{field}_id"] = lookups[field].resolve(row, field)
+            except ValueError as e:
+                errors[field] = str(e)
+        description = row.get('description') or ''
+        if len(description) < 3:
+            errors['description'] = "Shorter than minimum length 3."
+        elif len(description) > 255:
+            errors['description'] = "Longer than maximum length 255."
+        if errors:
+            return None, errors
+
+        values['description'] = description
+        values['received_amount'] = Decimal('0.00')
+        values['status'] = IncomeStatus.UNRECEIVED
+        values['created_at'] = datetime.utcnow()
+        return values, None
+
+    def _run(self, model, rows, lookups, build_row, dry_run):
+        report = {"total_rows": 0, "valid": 0, "inserted": 0, "failed": 0, "errors": [], "dry_run": dry_run}
+
+        for chunk in iter_chunks(rows, self.chunk_size):
+            valid = []
+            for row_number, row in chunk:
+                values, errors = build_row(row, lookups)
+                if errors:
+                    report["failed"] += 1
+                    if len(report["errors"]) < MAX_REPORTED_ERRORS:
+                        report["errors"].append({"row": row_number, "errors": errors})
+                else:
+                    valid.append(values)
+            report["total_rows"] += len(chunk)
+
+            if valid and not dry_run:
+                # Her parça, değişiklik kaydıyla birlikte kendi transaction'ında executemany ile yazılır
+                try:
+                    ids = db.session.execute(
+                        insert(model).returning(model.id, sort_by_parameter_order=True), valid
+                    ).scalars().all()
+                    record_bulk_changes(
+                        db.session, model.__tablename__, 'insert',
+                        [{**values, 'id': id_} for id_, values in zip(ids, valid)]
+                    )
+                    db.session.commit()
+                    invalidate_dates(model.__tablename__, {values['date'] for values in valid})
+                except Exception as e:
+                    db.session.rollback()
+                    raise AppError(
+                        f"Import stopped at row {chunk[0][0]}: {e}. "
+                        f"{report['inserted']} rows were already imported.", 500
+                    ) from e
+                report["inserted"] += len(valid)
+            report["valid"] += len(valid)
+
+        report["errors_truncated"] = report["failed"] > len(report["errors"])
+        return report
+
+    def import_expenses(self, stream, delimiter: str = ',', dry_run: bool = False) -> dict:
+        """
+        Gider CSV'sini içe aktarır.
+        Kolonlar: date, amount, description, region, payment_type, account_name, budget_item
+        (isim yerine '<alan>_id' kolonları da kullanılabilir).
+        """
+        lookups = {
+            'region': NameLookup(Region),
+            'payment_type': NameLookup(PaymentType),
+            'account_name': NameLookup(AccountName),
+            'budget_item': NameLookup(BudgetItem),
+        }
+        required = ('date', 'amount', 'region', 'payment_type', 'account_name', 'budget_item')
+        return self._run(
+            Expense, iter_csv_rows(stream, delimiter, required), lookups,
+            self._build_expense_row, dry_run
+        )
+
+    def import_incomes(self, stream, delimiter: str = ',', dry_run: bool = False) -> dict:
+        """
+        Gelir CSV'sini içe aktarır.
+        Kolonlar: date, total_amount, description, region, account_name, budget_item, company
+        (isim yerine '<alan>_id' kolonları da kullanılabilir).
+        """
+        lookups = {
+            'region': NameLookup(Region),
+            'account_name': NameLookup(AccountName),
+            'budget_item': NameLookup(BudgetItem),
+            'company': NameLookup(Company),
+        }
+        required = ('date', 'total_amount', 'description', 'region', 'account_name', 'budget_item', 'company')
+        return self._run(
+            Income, iter_csv_rows(stream, delimiter, required), lookups,
+            self._build_income_row, dry_run
+        )
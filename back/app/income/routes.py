@@ -1,13 +1,18 @@
 from flask import Blueprint, request, jsonify
 from marshmallow import ValidationError
-from datetime import datetime
 from app import db
-from ..models import Income, Company, BudgetItem
+from ..models import Income, IncomeReceipt, Company, Region, AccountName, BudgetItem, FxRate
 from .services import CompanyService, IncomeService, IncomeReceiptService
 from .schemas import CompanySchema, IncomeSchema, IncomeUpdateSchema, IncomeReceiptSchema
 from ..errors import AppError
+from ..http_cache import enable_conditional_get
+from ..idempotency import idempotent
+from ..governance import governed, page_args, row_limit
+from ..changes.services import parse_modified_since, sync_info, sync_watermark
+from ..fx.services import parse_currency
 
 income_bp = Blueprint('income_api', __name__, url_prefix='/api')
+enable_conditional_get(income_bp, [Income, IncomeReceipt, Company, Region, AccountName, BudgetItem, FxRate])
 
 # Company routes
 company_service = CompanyService()
@@ -69,29 +74,39 @@ def create_income():
         return jsonify({"error": e.message}), e.status_code
 
 @income_bp.route('/incomes', methods=['GET'])
+@governed()
 def get_all_incomes():
     filters = request.args.to_dict()
-    page = int(filters.pop('page', 1))
-    per_page = int(filters.pop('per_page', 20))
+    page, per_page = page_args(filters)
     sort_by = filters.pop('sort_by', 'date')
     sort_order = filters.pop('sort_order', 'desc')
+    modified_since = filters.pop('modified_since', None)
+    modified_since = parse_modified_since(modified_since) if modified_since else None
+    facets = filters.pop('facets', None)
+    server_time = sync_watermark()
     
     paginated_result = income_service.get_all(
         filters=filters, 
         page=page, 
         per_page=per_page,
         sort_by=sort_by,
-        sort_order=sort_order
+        sort_order=sort_order,
+        modified_since=modified_since
     )
     
-    return jsonify({
+    response = {
         "data": incomes_schema.dump(paginated_result.items),
         "pagination": {
             "total_pages": paginated_result.pages,
             "total_items": paginated_result.total,
             "current_page": paginated_result.page
         }
-    })
+    }
+    if facets:
+        response["facets"] = income_service.get_facets(filters, facets)
+    if modified_since:
+        response["sync"] = sync_info('income', modified_since, server_time)
+    return jsonify(response)
 
 @income_bp.route('/incomes/<int:income_id>', methods=['GET', 'PUT', 'DELETE'])
 def handle_income(income_id):
@@ -118,20 +133,39 @@ receipt_schema = IncomeReceiptSchema()
 receipts_schema = IncomeReceiptSchema(many=True)
 
 @income_bp.route('/receipts', methods=['GET'], strict_slashes=False)
+@governed()
 def get_all_receipts():
     """Tarih aralığına göre tüm gelir makbuzlarını listeler."""
     try:
         filters = {k: v for k, v in request.args.items() if v is not None}
         sort_by = filters.pop('sort_by', 'receipt_date')
         sort_order = filters.pop('sort_order', 'desc')
+        limit = row_limit(filters.pop('limit', None))
+        modified_since = filters.pop('modified_since', None)
+        modified_since = parse_modified_since(modified_since) if modified_since else None
+        server_time = sync_watermark()
         
-        receipts = receipt_service.get_all(filters=filters, sort_by=sort_by, sort_order=sort_order)
-        
-        return jsonify(receipts_schema.dump(receipts)), 200
+        # Sonucun kesilip kesilmediğini anlamak için bir satır fazla okunur
+        receipts = receipt_service.get_all(filters=filters, sort_by=sort_by, sort_order=sort_order,
+                                           modified_since=modified_since, limit=limit + 1)
+        truncated = len(receipts) > limit
+        receipts = receipts[:limit]
+
+        # Artımlı istekte silinen kayıtlar da dönebilsin diye yanıt sarmalanır
+        headers = {'X-Result-Truncated': 'true'} if truncated else {}
+        if modified_since:
+            return jsonify({
+                "data": receipts_schema.dump(receipts),
+                "sync": sync_info('income_receipt', modified_since, server_time)
+            }), 200, headers
+        return jsonify(receipts_schema.dump(receipts)), 200, headers
+    except AppError as e:
+        return jsonify({"error": e.message}), e.status_code
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
 @income_bp.route('/incomes/<int:income_id>/receipts', methods=['POST'])
+@idempotent
 def create_receipt_for_income(income_id):
     json_data = request.get_json()
     try:
@@ -161,6 +195,7 @@ def handle_receipt(receipt_id):
 
 
 @income_bp.route('/incomes/pivot', methods=['GET'])
+@governed('report', heavy=True)
 def get_income_pivot():
     try:
         month_str = request.args.get("month")
@@ -168,44 +203,12 @@ def get_income_pivot():
             return jsonify({"error": "Month parameter is required"}), 400
 
         year, month = map(int, month_str.split("-"))
-        start_date = datetime(year, month, 1)
-        end_date = datetime(year + 1, 1, 1) if month == 12 else datetime(year, month + 1, 1)
-
-        query = (
-            db.session.query(
-                Income.id,
-                Income.date,
-                Income.total_amount,
-                Income.description,
-                Company.id.label("company_id"),
-                Company.name.label("company_name"),
-                BudgetItem.id.label("budget_item_id"),
-                BudgetItem.name.label("budget_item_name")
-            )
-            .join(Company, Company.id == Income.company_id)
-            .join(BudgetItem, BudgetItem.id == Income.budget_item_id)
-            .filter(Income.date >= start_date, Income.date < end_date)
-        )
-
-        results = query.all()
-
-        data = []
-        for row in results:
-            data.append({
-                "id": row.id,
-                "date": row.date.strftime("%Y-%m-%d"),
-                "day": row.date.day,
-                "description": row.description,
-                "amount": float(row.total_amount),
-                "budget_item_id": row.budget_item_id,
-                "budget_item_name": row.budget_item_name,
-                "company_id": row.company_id,
-                "company_name": row.company_name,
-            })
-
-        return jsonify(data), 200
+        currency = parse_currency(request.args.get('currency'))
+        return jsonify(income_service.get_pivot(year, month, currency)), 200
 
+    except AppError as e:
+        return jsonify({"error": e.message}), e.status_code
     except Exception as e:
         import traceback
         traceback.print_exc()
-        return jsonify({"error": str(e)}), 500
\ No newline at end of file
+        return jsonify({"error": str(e)}), 500
@@ -1,5 +1,5 @@
 from marshmallow import Schema, fields, validate, pre_load, EXCLUDE
-from ..models import IncomeStatus
+from ..models import IncomeStatus, BASE_CURRENCY, CURRENCIES
 
 # --- Ortak Kullanım için Basit Şemalar ---
 class NameOnlySchema(Schema):
@@ -15,6 +15,7 @@ class IncomeSchema(Schema):
     id = fields.Int(dump_only=True)
     description = fields.Str(required=True, validate=validate.Length(min=3))
     total_amount = fields.Decimal(as_string=True, places=2, required=True, validate=validate.Range(min=0.01))
+    currency = fields.Str(load_default=BASE_CURRENCY, validate=validate.OneOf(CURRENCIES))
     received_amount = fields.Decimal(as_string=True, places=2, dump_only=True)
     status = fields.Enum(IncomeStatus, by_value=False, dump_only=True)
     date = fields.Date(required=True)
@@ -60,6 +61,7 @@ class IncomeUpdateSchema(Schema):
 class IncomeReceiptSchema(Schema):
     id = fields.Int(dump_only=True)
     receipt_amount = fields.Decimal(as_string=True, places=2, required=True, validate=validate.Range(min=0.01))
+    currency = fields.Str(dump_only=True)
     receipt_date = fields.Date(required=True)
     notes = fields.Str(required=False, allow_none=True)
     created_at = fields.DateTime(dump_only=True)
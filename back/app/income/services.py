@@ -1,9 +1,49 @@
+from datetime import datetime, date
 from decimal import Decimal
-from sqlalchemy import desc, asc, func, or_
 from sqlalchemy.orm import joinedload
 from .. import db
-from ..models import Company, Income, IncomeStatus, IncomeReceipt
+from ..models import Company, Income, IncomeStatus, IncomeReceipt, BudgetItem, BASE_CURRENCY
 from ..errors import AppError
+from ..changes.services import record_change
+from ..result_cache import cached_result
+from ..concurrency import load_parent, guard_version
+from ..unit_of_work import transactional
+from ..archive.services import readable, attach_archived_parents
+from ..filters import FilterSpec, IN, MIN, MAX, CONTAINS
+from ..reporting import reporting_session
+from ..money import minor_units, to_api, to_minor
+from ..fx.services import rate_vector
+
+INCOME_FILTERS = FilterSpec(
+    Income,
+    params={
+        'company_id': ('company_id', IN),
+        'region_id': ('region_id', IN),
+        'account_name_id': ('account_name_id', IN),
+        'budget_item_id': ('budget_item_id', IN),
+        'status': ('status', IN),
+        'description': ('description', CONTAINS),
+        'amount_min': ('total_amount', MIN),
+        'amount_max': ('total_amount', MAX),
+        'date_start': ('date', MIN),
+        'date_end': ('date', MAX),
+    },
+    sorts=('date', 'total_amount', 'status'),
+    default_sort='date',
+    facets=('status', 'company_id', 'region_id', 'account_name_id', 'budget_item_id'),
+)
+RECEIPT_FILTERS = FilterSpec(
+    IncomeReceipt,
+    params={
+        'income_id': ('income_id', IN),
+        'amount_min': ('receipt_amount', MIN),
+        'amount_max': ('receipt_amount', MAX),
+        'date_start': ('receipt_date', MIN),
+        'date_end': ('receipt_date', MAX),
+    },
+    sorts=('receipt_date',),
+    default_sort='receipt_date',
+)
 
 
 class CompanyService:
@@ -18,15 +58,16 @@ class CompanyService:
     def get_all(self):
         return Company.query.order_by(Company.name).all()
 
+    @transactional()
     def create(self, data: dict) -> Company:
         if Company.query.filter_by(name=data['name']).first():
             raise AppError(f"Company with name '{data['name']}' already exists.", 409)
 
         new_company = Company(name=data['name'])
         db.session.add(new_company)
-        db.session.commit()
         return new_company
 
+    @transactional()
     def update(self, company_id: int, data: dict) -> Company:
         company = self.get_by_id(company_id)
         new_name = data.get('name')
@@ -34,13 +75,12 @@ class CompanyService:
             if Company.query.filter_by(name=new_name).first():
                 raise AppError(f"Company with name '{new_name}' already exists.", 409)
             company.name = new_name
-        db.session.commit()
         return company
 
+    @transactional()
     def delete(self, company_id: int) -> bool:
         company = self.get_by_id(company_id)
         db.session.delete(company)
-        db.session.commit()
         return True
 
 
@@ -51,62 +91,126 @@ class IncomeService:
             raise AppError(f"Income with id {income_id} not found.", 404)
         return income
 
-    def get_all(self, filters: dict = None, sort_by: str = 'date', sort_order: str = 'desc', page: int = 1, per_page: int = 20):
-        query = Income.query.options(
-            joinedload(Income.company),
-            joinedload(Income.region),
-            joinedload(Income.account_name),
-            joinedload(Income.budget_item)
+    def get_all(self, filters: dict = None, sort_by: str = 'date', sort_order: str = 'desc', page: int = 1, per_page: int = 20,
+                modified_since: datetime = None):
+        values = INCOME_FILTERS.parse(filters)
+        model = readable(Income, *INCOME_FILTERS.date_range(values))
+        query = db.session.query(model).options(
+            joinedload(model.company),
+            joinedload(model.region),
+            joinedload(model.account_name),
+            joinedload(model.budget_item)
         )
+        query = INCOME_FILTERS.apply(query, model, values)
+
+        if modified_since is not None:
+            query = query.filter(model.updated_at >= modified_since)
 
-        if filters:
-            # Açıklama alanına göre özel arama
-            if description_term := filters.get('description'):
-                search_pattern = f"%{description_term.lower()}%"
-                query = query.filter(func.lower(Income.description).contains(search_pattern))
-
-            # Tarih Filtrelemesi
-            if filters.get('date_start'):
-                query = query.filter(Income.date >= filters['date_start'])
-            if filters.get('date_end'):
-                query = query.filter(Income.date <= filters['date_end'])
-
-        valid_sort_columns = {'date': Income.date, 'total_amount': Income.total_amount, 'status': Income.status}
-        sort_column = valid_sort_columns.get(sort_by, Income.date)
-        query = query.order_by(desc(sort_column) if sort_order == 'desc' else asc(sort_column))
+        query = INCOME_FILTERS.order_by(query, model, sort_by, sort_order)
         return query.paginate(page=page, per_page=per_page, error_out=False)
 
+    def get_facets(self, filters: dict = None, facets: str = None) -> dict:
+        """İstenen faset kolonlarının, liste ile aynı filtre altındaki değer sayılarını döner."""
+        names = INCOME_FILTERS.parse_facets(facets)
+        values = INCOME_FILTERS.parse(filters)
+        model = readable(Income, *INCOME_FILTERS.date_range(values))
+        return INCOME_FILTERS.facet_counts(db.session, model, values, names)
+
+    @transactional()
     def create(self, data: dict) -> Income:
         new_income = Income(**data)
         new_income.received_amount = 0
         new_income.status = IncomeStatus.UNRECEIVED
         db.session.add(new_income)
-        db.session.commit()
+        db.session.flush()
+        record_change(new_income, 'insert')
         return new_income
 
+    @transactional()
     def update(self, income_id: int, data: dict) -> Income:
         income = self.get_by_id(income_id)
         for key, value in data.items():
             setattr(income, key, value)
-        db.session.commit()
+        # Toplam tutar değişirse durum da değişebilir
+        if 'total_amount' in data:
+            IncomeReceiptService._recalculate_income_status(income)
+        record_change(income, 'update')
         return income
 
+    @transactional()
     def delete(self, income_id: int) -> bool:
         income = self.get_by_id(income_id)
+        for receipt in income.receipts:
+            record_change(receipt, 'delete')
+        record_change(income, 'delete')
         db.session.delete(income)
-        db.session.commit()
         return True
 
+    @staticmethod
+    def _compute_pivot(year: int, month: int, currency: str) -> list:
+        start_date = date(year, month, 1)
+        end_date = date(year + 1, 1, 1) if month == 12 else date(year, month + 1, 1)
+
+        with reporting_session() as session:
+            model = readable(Income, start_date, end_date, session)
+            query = (
+                session.query(
+                    model.id,
+                    model.date,
+                    minor_units(model.total_amount).label("amount"),
+                    model.currency,
+                    model.description,
+                    Company.id.label("company_id"),
+                    Company.name.label("company_name"),
+                    BudgetItem.id.label("budget_item_id"),
+                    BudgetItem.name.label("budget_item_name")
+                )
+                .join(Company, Company.id == model.company_id)
+                .join(BudgetItem, BudgetItem.id == model.budget_item_id)
+                .filter(model.date >= start_date, model.date < end_date)
+            )
+            rows = query.all()
+            # Kurlar, satırların (gün, para birimi) kovaları için tek sorguda yüklenir
+            rates = rate_vector(session, currency, {(row.date, row.currency) for row in rows})
+
+        data = []
+        for row in rows:
+            data.append({
+                "id": row.id,
+                "date": row.date.strftime("%Y-%m-%d"),
+                "day": row.date.day,
+                "description": row.description,
+                "amount": to_api(rates.convert(row.amount, row.currency, row.date)),
+                "currency": currency,
+                "original_amount": to_api(row.amount),
+                "original_currency": row.currency,
+                "budget_item_id": row.budget_item_id,
+                "budget_item_name": row.budget_item_name,
+                "company_id": row.company_id,
+                "company_name": row.company_name,
+            })
+        return data
+
+    def get_pivot(self, year: int, month: int, currency: str = BASE_CURRENCY) -> list:
+        """Aylık gelir pivot verisini, ay kovasına bağlı önbellek üzerinden döner."""
+        return cached_result(
+            'income_pivot',
+            {"year": year, "month": month, "currency": currency},
+            [f"income_pivot:{year:04d}-{month:02d}"],
+            lambda: self._compute_pivot(year, month, currency)
+        )
+
 
 
 class IncomeReceiptService:
     @staticmethod
     def _recalculate_income_status(income: Income):
-        if income.received_amount == income.total_amount:
+        received, total = to_minor(income.received_amount), to_minor(income.total_amount)
+        if received == total:
             income.status = IncomeStatus.RECEIVED
-        elif income.received_amount > income.total_amount:
+        elif received > total:
             income.status = IncomeStatus.OVER_RECEIVED
-        elif income.received_amount <= 0:
+        elif received <= 0:
             income.status = IncomeStatus.UNRECEIVED
         else:
             income.status = IncomeStatus.PARTIALLY_RECEIVED
@@ -117,87 +221,75 @@ class IncomeReceiptService:
             raise AppError(f"Receipt with id {receipt_id} not found.", 404)
         return receipt
 
-    def get_all(self, filters: dict = None, sort_by: str = 'receipt_date', sort_order: str = 'desc'):
-        """Tüm gelir makbuzlarını filtreleme ve sıralama seçenekleriyle getirir."""
-        query = IncomeReceipt.query.options(
-            joinedload(IncomeReceipt.income).options(
+    def get_all(self, filters: dict = None, sort_by: str = 'receipt_date', sort_order: str = 'desc',
+                modified_since: datetime = None, limit: int = None):
+        """Tüm gelir makbuzlarını filtreleme ve sıralama seçenekleriyle, en fazla `limit` satır getirir."""
+        values = RECEIPT_FILTERS.parse(filters)
+        model = readable(IncomeReceipt, *RECEIPT_FILTERS.date_range(values))
+        query = db.session.query(model).options(
+            joinedload(model.income).options(
                 joinedload(Income.company),
                 joinedload(Income.region),
                 joinedload(Income.account_name),
                 joinedload(Income.budget_item)
             )
         )
-        
-        if filters:
-            if 'date_start' in filters:
-                query = query.filter(IncomeReceipt.receipt_date >= filters['date_start'])
-            if 'date_end' in filters:
-                query = query.filter(IncomeReceipt.receipt_date <= filters['date_end'])
-
-        # Sıralama
-        valid_sort_columns = {
-            'receipt_date': IncomeReceipt.receipt_date,
-            'receipt_amount': IncomeReceipt.receipt_amount
-        }
-        sort_column = valid_sort_columns.get(sort_by, IncomeReceipt.receipt_date)
-        
-        if sort_order == 'desc':
-            query = query.order_by(desc(sort_column))
-        else:
-            query = query.order_by(asc(sort_column))
-            
-        return query.all()
+        query = RECEIPT_FILTERS.apply(query, model, values)
+
+        if modified_since is not None:
+            query = query.filter(model.updated_at >= modified_since)
+
+        query = RECEIPT_FILTERS.order_by(query, model, sort_by, sort_order)
+        if limit is not None:
+            query = query.limit(limit)
+        receipts = query.all()
+        attach_archived_parents(receipts, 'income', Income, 'income_id')
+        return receipts
 
+    @transactional(error_message="Internal error on receipt creation")
     def create(self, income_id: int, data: dict) -> IncomeReceipt:
         receipt_amount = Decimal(data.get('receipt_amount', 0))
         if receipt_amount <= 0:
             raise AppError("Receipt amount must be positive.", 400)
-        try:
-            income = Income.query.with_for_update().get(income_id)
-            if not income:
-                raise AppError(f"Income with id {income_id} not found.", 404)
-            new_receipt = IncomeReceipt(income_id=income.id, receipt_amount=receipt_amount, receipt_date=data['receipt_date'], notes=data.get('notes'))
-            db.session.add(new_receipt)
-            income.received_amount += new_receipt.receipt_amount
-            self._recalculate_income_status(income)
-            db.session.commit()
-            return new_receipt
-        except Exception as e:
-            db.session.rollback()
-            if isinstance(e, AppError): raise e
-            raise AppError(f"Internal error on receipt creation: {e}", 500) from e
+        income = load_parent(Income, income_id)
+        if not income:
+            raise AppError(f"Income with id {income_id} not found.", 404)
+        new_receipt = IncomeReceipt(income_id=income.id, receipt_amount=receipt_amount, currency=income.currency, receipt_date=data['receipt_date'], notes=data.get('notes'))
+        db.session.add(new_receipt)
+        income.received_amount += new_receipt.receipt_amount
+        self._recalculate_income_status(income)
+        guard_version(income)
+        db.session.flush()
+        record_change(new_receipt, 'insert')
+        record_change(income, 'update')
+        return new_receipt
 
+    @transactional(error_message="Internal error on receipt update")
     def update(self, receipt_id: int, data: dict) -> IncomeReceipt:
-        try:
-            receipt = self.get_by_id(receipt_id)
-            income = Income.query.with_for_update().get(receipt.income_id)
-            old_amount = receipt.receipt_amount
-            new_amount = Decimal(data.get('receipt_amount', old_amount))
-            if new_amount <= 0:
-                raise AppError("Receipt amount must be positive.", 400)
-            income.received_amount = (income.received_amount - old_amount) + new_amount
-            self._recalculate_income_status(income)
-            receipt.receipt_amount = new_amount
-            receipt.receipt_date = data.get('receipt_date', receipt.receipt_date)
-            receipt.notes = data.get('notes', receipt.notes)
-            db.session.commit()
-            return receipt
-        except Exception as e:
-            db.session.rollback()
-            if isinstance(e, AppError): raise e
-            raise AppError(f"Internal error on receipt update: {e}", 500) from e
+        receipt = self.get_by_id(receipt_id)
+        income = load_parent(Income, receipt.income_id)
+        old_amount = receipt.receipt_amount
+        new_amount = Decimal(data.get('receipt_amount', old_amount))
+        if new_amount <= 0:
+            raise AppError("Receipt amount must be positive.", 400)
+        income.received_amount = (income.received_amount - old_amount) + new_amount
+        self._recalculate_income_status(income)
+        guard_version(income)
+        receipt.receipt_amount = new_amount
+        receipt.receipt_date = data.get('receipt_date', receipt.receipt_date)
+        receipt.notes = data.get('notes', receipt.notes)
+        record_change(receipt, 'update')
+        record_change(income, 'update')
+        return receipt
 
+    @transactional(error_message="Internal error on receipt deletion")
     def delete(self, receipt_id: int) -> bool:
-        try:
-            receipt = self.get_by_id(receipt_id)
-            income = Income.query.with_for_update().get(receipt.income_id)
-            income.received_amount -= receipt.receipt_amount
-            self._recalculate_income_status(income)
-            db.session.delete(receipt)
-            db.session.commit()
-            return True
-        except Exception as e:
-            db.session.rollback()
-            if isinstance(e, AppError): raise e
-            raise AppError(f"Internal error on receipt deletion: {e}", 500) from e
-
+        receipt = self.get_by_id(receipt_id)
+        income = load_parent(Income, receipt.income_id)
+        income.received_amount -= receipt.receipt_amount
+        self._recalculate_income_status(income)
+        guard_version(income)
+        record_change(receipt, 'delete')
+        record_change(income, 'update')
+        db.session.delete(receipt)
+        return True
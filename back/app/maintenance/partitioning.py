@@ -0,0 +1,253 @@
+from datetime import date
+from dateutil.relativedelta import relativedelta
+from sqlalchemy import inspect, text
+
+# Bölümlenen tablolar ve bölümleme (tarih) kolonları
+PARTITIONED_TABLES = {
+    'expense': 'date',
+    'payment': 'payment_date',
+    'income': 'date',
+    'income_receipt': 'receipt_date',
+}
+GRANULARITIES = ('year', 'month')
+
+
+def period_start(value: date, granularity: str) -> date:
+    return date(value.year, 1, 1) if granularity == 'year' else date(value.year, value.month, 1)
+
+
+def period_bounds(start: date, end: date, granularity: str):
+    """[start, end] aralığını kapsayan (alt, üst) dönem sınırlarını sırayla döner; üst sınır hariçtir."""
+    step = relativedelta(years=1) if granularity == 'year' else relativedelta(months=1)
+    lower = period_start(start, granularity)
+    while lower <= end:
+        yield lower, lower + step
+        lower += step
+
+
+def partition_name(table: str, lower: date, granularity: str) -> str:
+    suffix = f"{lower.year:04d}" if granularity == 'year' else f"{lower.year:04d}_{lower.month:02d}"
+    return f"{table}_p{suffix}"
+
+
+class PartitionManager:
+    """
+    expense, payment, income ve income_receipt tablolarını tarih kolonlarına göre
+    yıllık ya da aylık aralıklara böler ve ileriye dönük bölümleri oluşturur.
+
+    - mssql: partition function/scheme; kümelenmiş indeks (tarih, id) şema üzerine taşınır,
+      birincil anahtar id üzerinde kümelenmemiş olarak kalır, böylece yabancı anahtarlar korunur.
+      Birincil anahtar ve ikincil indeksler şemaya hizalı değildir (PRIMARY dosya grubunda
+      kalır): id tek başına benzersiz kalmalı, hizalı benzersiz indeks ise tarih kolonunu
+      içermek zorundadır. Bu nedenle bölüm SWITCH ile taşıma yapılamaz; bölüm eleme
+      kümelenmiş indeks üzerinden çalışır, arşivleme satır bazında taşır.
+    - postgresql: deklaratif RANGE bölümleme; tablo yeniden oluşturulup veri kopyalanır,
+      birincil anahtar (id, tarih) olur. İndeksler ve dışa giden yabancı anahtarlar katalogdaki
+      tanımlarıyla (filtre, INCLUDE, ON DELETE dahil) yeniden kurulur. PostgreSQL benzersiz
+      kısıtların bölüm anahtarını içermesini şart koştuğu için başka tabloların yabancı
+      anahtarla işaret ettiği tablolar (expense, income), tarihi boş satırı olan tablolar ve
+      tarih kolonunu içermeyen benzersiz indeksi olan tablolar bölümlenmez; nedenleri
+      `skipped` içinde döner.
+    - Diğer veritabanlarında (SQLite) tüm işlemler etkisizdir.
+    """
+
+    def __init__(self, connection, granularity: str = 'year'):
+        if granularity not in GRANULARITIES:
+            raise ValueError(f"granularity must be one of {', '.join(GRANULARITIES)}")
+        self.connection = connection
+        self.granularity = granularity
+        self.dialect = connection.dialect.name
+        self.skipped = {}    # tablo -> bölümlenmeme nedeni
+
+    @property
+    def supported(self) -> bool:
+        return self.dialect in ('mssql', 'postgresql')
+
+    def _execute(self, sql: str, **params):
+        return self.connection.execute(text(sql), params)
+
+    def is_partitioned(self, table: str) -> bool:
+        if self.dialect == 'mssql':
+            return self._execute(
+                "SELECT 1 FROM sys.partition_functions WHERE name = :name", name=f"pf_{table}"
+            ).first() is not None
+        if self.dialect == 'postgresql':
+            return self._execute(
+                "SELECT 1 FROM pg_partitioned_table pt JOIN pg_class c ON c.oid = pt.partrelid "
+                "WHERE c.relname = :name", name=table
+            ).first() is not None
+        return False
+
+    def _first_date(self, table: str, column: str) -> date:
+        first = self._execute(f"SELECT MIN({column}) FROM {table}").scalar()
+        if isinstance(first, str):
+            first = date.fromisoformat(first[:10])
+        return first or date.today()
+
+    def enable(self, until: date) -> list:
+        """
+        Henüz bölümlenmemiş tabloları bölümler; dönen liste dönüştürülen tablolardır.
+        Güvenle bölümlenemeyen tablolar atlanır ve `skipped` içinde nedeniyle listelenir.
+        """
+        if not self.supported:
+            return []
+        converted = []
+        for table, column in PARTITIONED_TABLES.items():
+            if self.is_partitioned(table):
+                continue
+            if self.dialect == 'postgresql':
+                reason = self._postgresql_blocker(table, column)
+                if reason:
+                    self.skipped[table] = reason
+                    continue
+            bounds = list(period_bounds(self._first_date(table, column), until, self.granularity))
+            if self.dialect == 'mssql':
+                self._enable_mssql(table, column, bounds)
+            else:
+                self._enable_postgresql(table, column, bounds)
+            converted.append(table)
+        return converted
+
+    def create_future_partitions(self, until: date) -> int:
+        """Bugünden `until` tarihine kadar eksik bölümleri oluşturur; oluşturulan bölüm sayısını döner."""
+        if not self.supported:
+            return 0
+        created = 0
+        for table in PARTITIONED_TABLES:
+            if not self.is_partitioned(table):
+                continue
+            for lower, upper in period_bounds(date.today(), until, self.granularity):
+                if self.dialect == 'mssql':
+                    created += self._split_mssql(table, lower)
+                else:
+                    created += self._attach_postgresql(table, lower, upper)
+        return created
+
+    # --- mssql ---
+
+    def _referencing_foreign_keys(self, table: str):
+        inspector = inspect(self.connection)
+        return [
+            (other, fk)
+            for other in inspector.get_table_names()
+            for fk in inspector.get_foreign_keys(other)
+            if fk['referred_table'] == table
+        ]
+
+    def _enable_mssql(self, table, column, bounds):
+        boundaries = ', '.join(f"'{lower.isoformat()}'" for lower, _ in bounds[1:]) or f"'{bounds[0][1].isoformat()}'"
+        self._execute(f"CREATE PARTITION FUNCTION pf_{table} (date) AS RANGE RIGHT FOR VALUES ({boundaries})")
+        self._execute(f"CREATE PARTITION SCHEME ps_{table} AS PARTITION pf_{table} ALL TO ([PRIMARY])")
+
+        # Kümelenmiş PK, bölümlenmiş kümelenmiş indekse yer açmak için kümelenmemiş olarak yeniden kurulur
+        referencing = self._referencing_foreign_keys(table)
+        for other, fk in referencing:
+            self._execute(f"ALTER TABLE {other} DROP CONSTRAINT {fk['name']}")
+        pk_name = inspect(self.connection).get_pk_constraint(table)['name']
+        self._execute(f"ALTER TABLE {table} DROP CONSTRAINT {pk_name}")
+        self._execute(f"ALTER TABLE {table} ADD CONSTRAINT {pk_name} PRIMARY KEY NONCLUSTERED (id) ON [PRIMARY]")
+        self._execute(f"CREATE CLUSTERED INDEX cx_{table}_{column} ON {table} ({column}, id) ON ps_{table} ({column})")
+        for other, fk in referencing:
+            columns = ', '.join(fk['constrained_columns'])
+            referred = ', '.join(fk['referred_columns'])
+            self._execute(
+                f"ALTER TABLE {other} ADD CONSTRAINT {fk['name']} FOREIGN KEY ({columns}) "
+                f"REFERENCES {table} ({referred})"
+            )
+
+    def _split_mssql(self, table, lower) -> int:
+        exists = self._execute(
+            "SELECT 1 FROM sys.partition_range_values rv "
+            "JOIN sys.partition_functions pf ON pf.function_id = rv.function_id "
+            "WHERE pf.name = :name AND CAST(rv.value AS date) = :lower",
+            name=f"pf_{table}", lower=lower
+        ).first()
+        if exists:
+            return 0
+        self._execute(f"ALTER PARTITION SCHEME ps_{table} NEXT USED [PRIMARY]")
+        self._execute(f"ALTER PARTITION FUNCTION pf_{table}() SPLIT RANGE ('{lower.isoformat()}')")
+        return 1
+
+    # --- postgresql ---
+
+    def _postgresql_blocker(self, table, column):
+        """Tablo bütünlük kaybı olmadan bölümlenemiyorsa nedenini, aksi halde None döner."""
+        referencing = self._referencing_foreign_keys(table)
+        if referencing:
+            names = ', '.join(f"{other}.{fk['name']}" for other, fk in referencing)
+            return (f"referenced by foreign keys ({names}); a partitioned table can only be "
+                    f"referenced through a key that includes {column}")
+        nulls = self._execute(f"SELECT COUNT(*) FROM {table} WHERE {column} IS NULL").scalar()
+        if nulls:
+            return f"{nulls} rows have no {column}; fill them before partitioning"
+        inspector = inspect(self.connection)
+        unique = [
+            index['name'] for index in inspector.get_indexes(table)
+            if index.get('unique') and column not in index['column_names']
+        ] + [
+            constraint['name'] for constraint in inspector.get_unique_constraints(table)
+            if column not in constraint['column_names']
+        ]
+        if unique:
+            return f"unique keys without {column}: {', '.join(sorted(set(unique)))}"
+        return None
+
+    def _enable_postgresql(self, table, column, bounds):
+        # İndeks ve yabancı anahtar tanımları (WHERE, INCLUDE, ON DELETE dahil) katalogdan aynen alınır
+        index_definitions = self._execute(
+            "SELECT pg_get_indexdef(i.indexrelid) FROM pg_index i "
+            "LEFT JOIN pg_constraint c ON c.conindid = i.indexrelid AND c.conrelid = i.indrelid "
+            "WHERE i.indrelid = CAST(:table AS regclass) AND NOT i.indisprimary AND c.oid IS NULL",
+            table=table
+        ).scalars().all()
+        constraints = self._execute(
+            "SELECT conname, pg_get_constraintdef(oid) FROM pg_constraint "
+            "WHERE conrelid = CAST(:table AS regclass) AND contype IN ('f', 'u')",
+            table=table
+        ).all()
+
+        legacy = f"{table}_unpartitioned"
+        sequence = self._execute("SELECT pg_get_serial_sequence(:table, 'id')", table=table).scalar()
+        self._execute(f"ALTER TABLE {table} ALTER COLUMN {column} SET NOT NULL")
+        self._execute(f"ALTER TABLE {table} RENAME TO {legacy}")
+        self._execute(
+            f"CREATE TABLE {table} (LIKE {legacy} INCLUDING DEFAULTS INCLUDING CONSTRAINTS) "
+            f"PARTITION BY RANGE ({column})"
+        )
+        for lower, upper in bounds:
+            self._attach_postgresql(table, lower, upper)
+        # Aralık dışında kalan tarihler için
+        self._execute(f"CREATE TABLE IF NOT EXISTS {table}_default PARTITION OF {table} DEFAULT")
+        self._execute(f"INSERT INTO {table} SELECT * FROM {legacy}")
+        if sequence:
+            self._execute(f"ALTER SEQUENCE {sequence} OWNED BY {table}.id")
+        self._execute(f"DROP TABLE {legacy}")
+
+        self._execute(f"ALTER TABLE {table} ADD CONSTRAINT {table}_pkey PRIMARY KEY (id, {column})")
+        for definition in index_definitions:
+            self._execute(definition)
+        for name, definition in constraints:
+            self._execute(f"ALTER TABLE {table} ADD CONSTRAINT {name} {definition}")
+
+    def _attach_postgresql(self, table, lower, upper) -> int:
+        name = partition_name(table, lower, self.granularity)
+        if self._execute("SELECT 1 FROM pg_class WHERE relname = :name", name=name).first():
+            return 0
+        # Aralığa düşen satırlar varsayılan bölümdeyse yeni bölüm doğrudan eklenemez
+        # (default partition constraint ihlali); varsayılan bölüm ayrılır, satırlar taşınır, geri bağlanır
+        column = PARTITIONED_TABLES[table]
+        default = f"{table}_default"
+        in_range = f"{column} >= '{lower.isoformat()}' AND {column} < '{upper.isoformat()}'"
+        has_default = self._execute("SELECT 1 FROM pg_class WHERE relname = :name", name=default).first()
+        moving = has_default and self._execute(f"SELECT 1 FROM {default} WHERE {in_range} LIMIT 1").first()
+        if moving:
+            self._execute(f"ALTER TABLE {table} DETACH PARTITION {default}")
+        self._execute(
+            f"CREATE TABLE {name} PARTITION OF {table} "
+            f"FOR VALUES FROM ('{lower.isoformat()}') TO ('{upper.isoformat()}')"
+        )
+        if moving:
+            self._execute(f"INSERT INTO {name} SELECT * FROM {default} WHERE {in_range}")
+            self._execute(f"DELETE FROM {default} WHERE {in_range}")
+            self._execute(f"ALTER TABLE {table} ATTACH PARTITION {default} DEFAULT")
+        return 1
@@ -0,0 +1,125 @@
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from sqlalchemy import select, update, func, case, literal, or_
+from .. import db
+from ..models import Expense, ExpenseStatus, Payment, Income, IncomeStatus, IncomeReceipt
+from ..changes.services import record_bulk_changes
+from ..money import minor_units, minor_sum, from_minor
+
+DEFAULT_CHUNK_SIZE = 50000
+
+
+class StatusRecomputeService:
+    """
+    Gider ve gelirlerin kalan/tahsil edilen tutarlarını ve durumlarını
+    ödeme/tahsilat tablolarından toplu (set-wise) olarak yeniden hesaplar.
+    Satır başına ORM çağrısı yerine her id aralığı için tek bir UPDATE ... FROM atılır;
+    değişen satırlar aynı transaction içinde değişiklik kaydına yazılır.
+    Tutarlar PaymentService'teki gibi kuruş cinsinden tamsayılarla karşılaştırılır.
+    """
+
+    def __init__(self, chunk_size: int = DEFAULT_CHUNK_SIZE, workers: int = 1):
+        self.chunk_size = chunk_size
+        self.workers = max(workers, 1)
+
+    @staticmethod
+    def _expense_statement(start_id: int, end_id: int, today):
+        paid = (
+            select(
+                Expense.id.label('id'),
+                minor_sum(Payment.payment_amount).label('paid')
+            )
+            .outerjoin(Payment, Payment.expense_id == Expense.id)
+            .where(Expense.id.between(start_id, end_id))
+            .group_by(Expense.id)
+            .subquery()
+        )
+        amount = minor_units(Expense.amount)
+        remaining = amount - paid.c.paid
+        status = case(
+            (remaining == 0, literal(ExpenseStatus.PAID, Expense.status.type)),
+            (remaining < 0, literal(ExpenseStatus.OVERPAID, Expense.status.type)),
+            (remaining >= amount, literal(ExpenseStatus.UNPAID, Expense.status.type)),
+            else_=literal(ExpenseStatus.PARTIALLY_PAID, Expense.status.type)
+        )
+        completed_at = case(
+            (remaining == 0, func.coalesce(Expense.completed_at, today)),
+            else_=None
+        )
+        return (
+            update(Expense)
+            .where(Expense.id == paid.c.id, Expense.amount.isnot(None))
+            .where(or_(
+                Expense.remaining_amount.is_(None),
+                minor_units(Expense.remaining_amount) != remaining,
+                Expense.status != status,
+                (remaining == 0) & Expense.completed_at.is_(None),
+                (remaining != 0) & Expense.completed_at.isnot(None),
+            ))
+            .values(remaining_amount=remaining * from_minor(1), status=status, completed_at=completed_at,
+                    version_id=Expense.version_id + 1)
+            .returning(Expense.id, Expense.remaining_amount, Expense.status, Expense.completed_at)
+            .execution_options(synchronize_session=False)
+        )
+
+    @staticmethod
+    def _income_statement(start_id: int, end_id: int, today):
+        received = (
+            select(
+                Income.id.label('id'),
+                minor_sum(IncomeReceipt.receipt_amount).label('received')
+            )
+            .outerjoin(IncomeReceipt, IncomeReceipt.income_id == Income.id)
+            .where(Income.id.between(start_id, end_id))
+            .group_by(Income.id)
+            .subquery()
+        )
+        total = minor_units(Income.total_amount)
+        status = case(
+            (received.c.received == total, literal(IncomeStatus.RECEIVED, Income.status.type)),
+            (received.c.received > total, literal(IncomeStatus.OVER_RECEIVED, Income.status.type)),
+            (received.c.received <= 0, literal(IncomeStatus.UNRECEIVED, Income.status.type)),
+            else_=literal(IncomeStatus.PARTIALLY_RECEIVED, Income.status.type)
+        )
+        return (
+            update(Income)
+            .where(Income.id == received.c.id)
+            .where(or_(minor_units(Income.received_amount) != received.c.received, Income.status != status))
+            .values(received_amount=received.c.received * from_minor(1), status=status, version_id=Income.version_id + 1)
+            .returning(Income.id, Income.received_amount, Income.status)
+            .execution_options(synchronize_session=False)
+        )
+
+    def _id_ranges(self, model):
+        low, high = db.session.query(func.min(model.id), func.max(model.id)).one()
+        if low is None:
+            return []
+        return [
+            (start, min(start + self.chunk_size - 1, high))
+            for start in range(low, high + 1, self.chunk_size)
+        ]
+
+    def _run(self, model, build_statement) -> int:
+        """Her id aralığını kendi transaction'ında, gerekirse paralel olarak günceller."""
+        engine = db.engine
+        today = datetime.utcnow().date()
+        ranges = self._id_ranges(model)
+
+        def run_chunk(bounds):
+            with engine.begin() as connection:
+                changed = [dict(row._mapping) for row in connection.execute(build_statement(*bounds, today))]
+                record_bulk_changes(connection, model.__tablename__, 'update', changed)
+                return len(changed)
+
+        if self.workers == 1:
+            return sum(run_chunk(bounds) for bounds in ranges)
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            return sum(executor.map(run_chunk, ranges))
+
+    def recompute_expenses(self) -> int:
+        """Tüm giderleri yeniden hesaplar; değişen satır sayısını döner."""
+        return self._run(Expense, self._expense_statement)
+
+    def recompute_incomes(self) -> int:
+        """Tüm gelirleri yeniden hesaplar; değişen satır sayısını döner."""
+        return self._run(Income, self._income_statement)
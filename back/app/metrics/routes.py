@@ -0,0 +1,10 @@
+from flask import Blueprint, jsonify
+from ..unit_of_work import get_metrics
+
+metrics_bp = Blueprint('metrics_api', __name__, url_prefix='/api/metrics')
+
+
+@metrics_bp.route('/transactions', methods=['GET'])
+def transaction_metrics():
+    """Servis transaction'larının işlem adına göre süre, yeniden deneme ve hata sayılarını döner."""
+    return jsonify(get_metrics().snapshot()), 200
@@ -1,7 +1,61 @@
 from enum import Enum
+from sqlalchemy import bindparam
 from . import db
 from datetime import datetime
 
+
+class CodedEnum(db.TypeDecorator):
+    """
+    Enum'u üyenin değeri olan küçük bir tamsayı kodu (SMALLINT) olarak saklar.
+    Yazarken üye, üye adı ya da kod kabul edilir; okurken üye döner, `as_name` verilirse
+    üyenin adı (kolonun Python tarafındaki değeri string olarak kalır).
+    """
+    impl = db.SmallInteger
+    cache_ok = True
+
+    def __init__(self, enum_class, as_name: bool = False):
+        super().__init__()
+        self.enum_class = enum_class
+        self.as_name = as_name
+
+    def member(self, value):
+        if isinstance(value, self.enum_class):
+            return value
+        if isinstance(value, str):
+            return self.enum_class[value]
+        return self.enum_class(value)
+
+    def process_bind_param(self, value, dialect):
+        return None if value is None else self.member(value).value
+
+    def process_literal_param(self, value, dialect):
+        return str(self.process_bind_param(value, dialect))
+
+    def process_result_value(self, value, dialect):
+        if value is None:
+            return None
+        member = self.enum_class(value)
+        return member.name if self.as_name else member
+
+
+def status_in(column, statuses):
+    """
+    Durum kodlarını sorguya parametre yerine sabit olarak yazan IN koşulu. Filtreli
+    (yalnızca açık kalemleri kapsayan) indeksler ancak sorgunun koşulu indeksin
+    koşuluyla sabitler üzerinden eşleştiğinde kullanılabilir.
+    """
+    return column.in_(bindparam(None, list(statuses), type_=column.type, expanding=True, literal_execute=True))
+
+
+# Tutarların para birimi (ISO 4217). Kurlar 1 birim yabancı paranın BASE_CURRENCY karşılığıdır.
+BASE_CURRENCY = 'TRY'
+CURRENCIES = ('TRY', 'EUR', 'USD')
+
+
+def currency_column():
+    return db.Column(db.String(3), nullable=False, default=BASE_CURRENCY, server_default=BASE_CURRENCY)
+
+
 class ExpenseStatus(Enum):
     UNPAID = 0
     PAID = 1
@@ -9,10 +63,14 @@ class ExpenseStatus(Enum):
     OVERPAID = 3
 
 
+OPEN_EXPENSE_STATUSES = (ExpenseStatus.UNPAID, ExpenseStatus.PARTIALLY_PAID)
+
+
 class Region(db.Model):
     __tablename__ = 'region'
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(100), nullable=False)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
     payment_types = db.relationship('PaymentType', backref='region', lazy=True)
 
@@ -24,6 +82,7 @@ class PaymentType(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(100), nullable=False)
     region_id = db.Column(db.Integer, db.ForeignKey('region.id'), nullable=False)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
     account_names = db.relationship('AccountName', backref='payment_type', lazy=True)
 
@@ -49,6 +108,7 @@ class AccountName(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(100), nullable=False)
     payment_type_id = db.Column(db.Integer, db.ForeignKey('payment_type.id'), nullable=False)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
     budget_items = db.relationship('BudgetItem', backref='account_name', lazy=True)
 
@@ -67,6 +127,7 @@ class BudgetItem(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(100), nullable=False)
     account_name_id = db.Column(db.Integer, db.ForeignKey('account_name.id'), nullable=False)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
     def __repr__(self):
         return f"<BudgetItem {self.name}>"
@@ -83,6 +144,7 @@ class ExpenseGroup(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(100), nullable=False)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
     expenses = db.relationship('Expense', backref='group', lazy=True)
 
@@ -90,17 +152,37 @@ class ExpenseGroup(db.Model):
         return f"<ExpenseGroup {self.name}>"
 
 class Payment(db.Model):
+    __table_args__ = (
+        # Son işlemler akışının (tarih, oluşturulma) sırasıyla okunması için
+        db.Index('ix_payment_date_created_at', 'payment_date', 'created_at', 'id'),
+    )
     id = db.Column(db.Integer, primary_key=True)
     expense_id = db.Column(db.Integer, db.ForeignKey('expense.id'), nullable=False)
     payment_amount = db.Column(db.Numeric(10, 2), nullable=False)
+    # Her zaman ödenen giderin para birimidir
+    currency = currency_column()
     payment_date = db.Column(db.Date, nullable=False)
     description = db.Column(db.String(255), nullable=True)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, index=True)
 
     expense = db.relationship('Expense', back_populates='payments')
 
 class Expense(db.Model):
     __tablename__ = 'expense'
+    __table_args__ = (
+        db.Index('ix_expense_status_date', 'status', 'date'),
+        # Yalnızca açık kalemleri (UNPAID/PARTIALLY_PAID) içeren, raporları kapsayan filtreli indeks
+        db.Index('ix_expense_open_date', 'date',
+                 mssql_include=['status', 'remaining_amount', 'region_id'],
+                 postgresql_include=['status', 'remaining_amount', 'region_id'],
+                 mssql_where=db.text('status IN (0, 2)'),
+                 postgresql_where=db.text('status IN (0, 2)'),
+                 sqlite_where=db.text('status IN (0, 2)')),
+        # Liste endpoint'inde izin verilen sıralamalar için
+        db.Index('ix_expense_date', 'date'),
+        db.Index('ix_expense_amount', 'amount'),
+    )
     id = db.Column(db.Integer, primary_key=True)
     group_id = db.Column(db.Integer, db.ForeignKey('expense_group.id'))
     region_id = db.Column(db.Integer, db.ForeignKey('region.id'))
@@ -111,10 +193,15 @@ class Expense(db.Model):
     description = db.Column(db.String(255))
     date = db.Column(db.Date)
     amount = db.Column(db.Numeric(10,2))
+    currency = currency_column()
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, index=True)
     completed_at = db.Column(db.Date, nullable=True)
 
-    status = db.Column(db.String(20), nullable=False, default=ExpenseStatus.UNPAID.name)
+    # Kod olarak saklanır; Python tarafında ve API'de durum adı (örn. 'PARTIALLY_PAID') olarak görünür
+    status = db.Column(CodedEnum(ExpenseStatus, as_name=True), nullable=False, default=ExpenseStatus.UNPAID.name)
+    # Her ORM güncellemesinde artan sürüm; iyimser eşzamanlılık modunda çakışmaları yakalar
+    version_id = db.Column(db.Integer, nullable=False, default=1, server_default='1')
     payments = db.relationship('Payment', back_populates='expense', cascade="all, delete-orphan")
 
     # İlişkileri tanımla
@@ -123,6 +210,8 @@ class Expense(db.Model):
     account_name = db.relationship('AccountName', backref='expenses')
     budget_item = db.relationship('BudgetItem', backref='expenses')
 
+    __mapper_args__ = {'version_id_col': version_id}
+
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
         if self.remaining_amount is None:
@@ -144,6 +233,7 @@ class Expense(db.Model):
             'description': self.description,
             'date': self.date.isoformat() if self.date else None,
             'amount': float(self.amount),
+            'currency': self.currency,
             'status': self.status
         }
 
@@ -151,6 +241,7 @@ class Company(db.Model):
     __tablename__ = 'company'
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(120), nullable=False, unique=True)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     # Şirketle ilgili vergi no, adres gibi ek alanlar eklenebilir
 
 class IncomeStatus(Enum):
@@ -159,15 +250,33 @@ class IncomeStatus(Enum):
     PARTIALLY_RECEIVED = 2 # Kısmen Tahsil Edildi
     OVER_RECEIVED = 3   # Fazla Tahsil Edildi
 
+
+OPEN_INCOME_STATUSES = (IncomeStatus.UNRECEIVED, IncomeStatus.PARTIALLY_RECEIVED)
+
 class Income(db.Model):
     __tablename__ = 'income'
+    __table_args__ = (
+        db.Index('ix_income_status_date', 'status', 'date'),
+        # Yalnızca açık kalemleri (UNRECEIVED/PARTIALLY_RECEIVED) içeren filtreli indeks
+        db.Index('ix_income_open_date', 'date',
+                 mssql_include=['status', 'total_amount', 'received_amount', 'region_id', 'company_id'],
+                 postgresql_include=['status', 'total_amount', 'received_amount', 'region_id', 'company_id'],
+                 mssql_where=db.text('status IN (0, 2)'),
+                 postgresql_where=db.text('status IN (0, 2)'),
+                 sqlite_where=db.text('status IN (0, 2)')),
+        db.Index('ix_income_date', 'date'),
+        db.Index('ix_income_total_amount', 'total_amount'),
+    )
     id = db.Column(db.Integer, primary_key=True)
     description = db.Column(db.String(255), nullable=False)
     total_amount = db.Column(db.Numeric(10, 2), nullable=False)
+    currency = currency_column()
     received_amount = db.Column(db.Numeric(10, 2), nullable=False, default=0) # Alınan tutar
-    status = db.Column(db.Enum(IncomeStatus), nullable=False, default=IncomeStatus.UNRECEIVED)
+    status = db.Column(CodedEnum(IncomeStatus), nullable=False, default=IncomeStatus.UNRECEIVED)
     date = db.Column(db.Date, nullable=False)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, index=True)
+    version_id = db.Column(db.Integer, nullable=False, default=1, server_default='1')
 
     region_id = db.Column(db.Integer, db.ForeignKey('region.id'), nullable=False)
     account_name_id = db.Column(db.Integer, db.ForeignKey('account_name.id'), nullable=False)
@@ -182,6 +291,8 @@ class Income(db.Model):
     account_name = db.relationship('AccountName', backref='incomes')
     budget_item = db.relationship('BudgetItem', backref='incomes')
 
+    __mapper_args__ = {'version_id_col': version_id}
+
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
         if self.received_amount is None:
@@ -191,11 +302,118 @@ class Income(db.Model):
 ## expense için payment ne ise income için income receipt bu.
 class IncomeReceipt(db.Model):
     __tablename__ = 'income_receipt'
+    __table_args__ = (
+        db.Index('ix_income_receipt_date_created_at', 'receipt_date', 'created_at', 'id'),
+    )
     id = db.Column(db.Integer, primary_key=True)
     income_id = db.Column(db.Integer, db.ForeignKey('income.id'), nullable=False)
     receipt_amount = db.Column(db.Numeric(10, 2), nullable=False)
+    # Her zaman tahsil edilen gelirin para birimidir
+    currency = currency_column()
     receipt_date = db.Column(db.Date, nullable=False)
     notes = db.Column(db.String(255), nullable=True)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, index=True)
 
     income = db.relationship('Income', back_populates='receipts')
+
+
+def _archive_table(model, *indexes):
+    """
+    Kapanmış dönemlerin taşındığı arşiv tablosu: sıcak tablonun kolonlarının
+    yabancı anahtarsız bir kopyası ve taşıma zamanı.
+    """
+    columns = [
+        db.Column(column.name, column.type, primary_key=column.primary_key,
+                  nullable=column.nullable, autoincrement=False)
+        for column in model.__table__.columns
+    ]
+    return db.Table(
+        f"{model.__tablename__}_archive", *columns,
+        db.Column('archived_at', db.DateTime, nullable=False),
+        *indexes
+    )
+
+
+expense_archive = _archive_table(Expense, db.Index('ix_expense_archive_date', 'date'))
+payment_archive = _archive_table(
+    Payment,
+    db.Index('ix_payment_archive_payment_date', 'payment_date'),
+    db.Index('ix_payment_archive_expense_id', 'expense_id'),
+)
+income_archive = _archive_table(Income, db.Index('ix_income_archive_date', 'date'))
+income_receipt_archive = _archive_table(
+    IncomeReceipt,
+    db.Index('ix_income_receipt_archive_receipt_date', 'receipt_date'),
+    db.Index('ix_income_receipt_archive_income_id', 'income_id'),
+)
+
+
+class FxRate(db.Model):
+    """Günlük kur: `rate_date` günü 1 `currency` biriminin BASE_CURRENCY karşılığı."""
+    __tablename__ = 'fx_rate'
+    currency = db.Column(db.String(3), primary_key=True)
+    rate_date = db.Column(db.Date, primary_key=True)
+    rate = db.Column(db.Numeric(18, 6), nullable=False)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+
+class BudgetPlan(db.Model):
+    """Bir bütçe kaleminin bir ay için planlanan gider ve gelir tutarları (BASE_CURRENCY cinsinden)."""
+    __tablename__ = 'budget_plan'
+    __table_args__ = (
+        # Sapma raporu ayın planlarını period ile okur; aynı ay/kalem için tek plan olur
+        db.UniqueConstraint('period', 'budget_item_id', name='uq_budget_plan_period_item'),
+    )
+    id = db.Column(db.Integer, primary_key=True)
+    budget_item_id = db.Column(db.Integer, db.ForeignKey('budget_item.id'), nullable=False)
+    period = db.Column(db.Date, nullable=False)    # Ayın ilk günü
+    planned_expense = db.Column(db.Numeric(12, 2), nullable=False, default=0)
+    planned_income = db.Column(db.Numeric(12, 2), nullable=False, default=0)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    budget_item = db.relationship('BudgetItem', lazy=True)
+
+
+class ChangeLog(db.Model):
+    """
+    Finansal kayıtlardaki değişikliklerin sıralı kaydı (transactional outbox).
+    Servisler kaydı değiştirdikleri transaction içinde buraya da yazar; dış sistemler
+    tabloları baştan okumak yerine 'seq' imlecinden sonraki değişiklikleri çeker.
+    """
+    __tablename__ = 'change_log'
+    __table_args__ = (
+        # Silme kayıtlarını (tombstone) ve eski kayıt temizliğini hızlandırır
+        db.Index('ix_change_log_entity_created_at', 'entity', 'created_at'),
+    )
+    seq = db.Column(db.BigInteger().with_variant(db.Integer, 'sqlite'), primary_key=True, autoincrement=True)
+    entity = db.Column(db.String(30), nullable=False)        # expense, payment, income, income_receipt
+    entity_id = db.Column(db.Integer, nullable=False)
+    operation = db.Column(db.String(10), nullable=False)     # insert, update, delete
+    payload = db.Column(db.JSON, nullable=True)
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+
+    def __repr__(self):
+        return f"<ChangeLog {self.seq} {self.operation} {self.entity}:{self.entity_id}>"
+
+
+class IdempotencyKey(db.Model):
+    """
+    İstemcinin Idempotency-Key başlığıyla gönderdiği yazma isteklerinin sonucu.
+    Aynı anahtarla tekrar gelen istek yeniden işlenmez, saklanan yanıt döner.
+    """
+    __tablename__ = 'idempotency_key'
+    __table_args__ = (
+        db.UniqueConstraint('key', 'scope', name='uq_idempotency_key_scope'),
+    )
+    id = db.Column(db.Integer, primary_key=True)
+    key = db.Column(db.String(255), nullable=False)
+    scope = db.Column(db.String(255), nullable=False)           # örn. "POST /api/expenses/5/payments"
+    request_hash = db.Column(db.String(64), nullable=False)
+    status_code = db.Column(db.Integer, nullable=True)          # None: istek hâlâ işleniyor
+    response_body = db.Column(db.JSON, nullable=True)
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    expires_at = db.Column(db.DateTime, nullable=False, index=True)
+
+    def __repr__(self):
+        return f"<IdempotencyKey {self.scope} {self.key}>"
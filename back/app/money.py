@@ -0,0 +1,54 @@
+from array import array
+from decimal import Decimal, ROUND_HALF_UP
+from sqlalchemy import BigInteger, cast, func
+
+# Tutarlar Numeric(10, 2) olarak saklanır; toplama ve kovalama kuruş cinsinden tamsayılarla yapılır
+MINOR_UNITS = 100
+_ONE = Decimal('1')
+
+
+def to_minor(value) -> int:
+    """Decimal/int/float tutarı en yakın kuruşa yuvarlanmış tamsayıya çevirir."""
+    if value is None:
+        return 0
+    if isinstance(value, int):
+        return value * MINOR_UNITS
+    if isinstance(value, float):
+        value = Decimal(repr(value))
+    return int((value * MINOR_UNITS).quantize(_ONE, rounding=ROUND_HALF_UP))
+
+
+def from_minor(minor: int) -> Decimal:
+    """Kuruş tamsayısını iki basamaklı Decimal'e çevirir (veritabanına yazmak için)."""
+    return Decimal(minor).scaleb(-2)
+
+
+def to_api(minor: int) -> float:
+    """
+    Kuruş tamsayısını API'nin kullandığı float'a çevirir. Tamsayının 100'e bölümü, iki
+    basamaklı ondalık değere en yakın float olduğundan JSON'da değer birebir görünür.
+    """
+    return minor / MINOR_UNITS
+
+
+def scaled(minor: int, factor: Decimal) -> int:
+    """Kuruş tutarını bir çarpanla ölçekleyip yine en yakın kuruşa yuvarlar."""
+    return int((Decimal(minor) * factor).quantize(_ONE, rounding=ROUND_HALF_UP))
+
+
+def minor_units(column):
+    """
+    Tutar kolonunu SQL tarafında kuruş tamsayısına çeviren ifade. SQLite Numeric'i REAL
+    olarak sakladığı için önce yuvarlanır, sonra tamsayıya çevrilir.
+    """
+    return cast(func.round(column * MINOR_UNITS, 0), BigInteger)
+
+
+def minor_sum(column):
+    """Kolonun kuruş cinsinden toplamı; boş kümede 0."""
+    return func.coalesce(func.sum(minor_units(column)), 0)
+
+
+def zeros(size: int) -> array:
+    """Kovalanmış toplamlar için 64 bit tamsayı dizisi."""
+    return array('q', bytes(8 * size))
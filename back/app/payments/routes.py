@@ -4,9 +4,15 @@ from marshmallow import ValidationError
 from .services import PaymentService
 from .schemas import PaymentSchema, PaymentUpdateSchema
 from ..errors import AppError
+from ..models import Payment, Expense, Region, PaymentType, AccountName, BudgetItem
+from ..http_cache import enable_conditional_get
+from ..idempotency import idempotent
+from ..governance import governed, page_args
+from ..changes.services import parse_modified_since, sync_info, sync_watermark
 
 # URL prefix'i ile tüm bu blueprint'teki endpoint'lerin /api ile başlamasını sağlıyoruz.
 payment_bp = Blueprint('payments_api', __name__, url_prefix='/api')
+enable_conditional_get(payment_bp, [Payment, Expense, Region, PaymentType, AccountName, BudgetItem])
 
 # Servis ve şemaları başlat
 payment_service = PaymentService()
@@ -17,6 +23,7 @@ payment_update_schema = PaymentUpdateSchema()
 
 # Bir gidere yeni bir ödeme eklemek için
 @payment_bp.route('/expenses/<int:expense_id>/payments', methods=['POST'])
+@idempotent
 def create_payment_for_expense(expense_id):
     """Bir gidere yeni bir ödeme oluşturur."""
     json_data = request.get_json()
@@ -39,26 +46,35 @@ def create_payment_for_expense(expense_id):
 
 # Tüm ödemeleri filtreli/sıralı/sayfalı getirmek için
 @payment_bp.route('/payments', methods=['GET'])
+@governed()
 def get_all_payments():
     """Tüm ödemeleri listeler. Filtre, sıralama ve sayfalama destekler."""
     try:
         # URL query parametrelerini (örn: ?expense_id=5&page=1) al
         filters = request.args.to_dict()
 
-        # Sayfa ve limit değerlerini integer'a çevir
-        page = int(filters.pop('page', 1))
-        per_page = int(filters.pop('per_page', 20))
+        # Sayfa ve limit değerlerini integer'a çevir; per_page üst sınıra çekilir
+        page, per_page = page_args(filters)
+        modified_since = filters.pop('modified_since', None)
+        modified_since = parse_modified_since(modified_since) if modified_since else None
+        server_time = sync_watermark()
 
-        paginated_result = payment_service.get_all(filters=filters, page=page, per_page=per_page)
+        paginated_result = payment_service.get_all(filters=filters, page=page, per_page=per_page,
+                                                   modified_since=modified_since)
 
-        return jsonify({
+        response = {
             "data": payments_schema.dump(paginated_result.items),
             "pagination": {
                 "total_pages": paginated_result.pages,
                 "total_items": paginated_result.total,
                 "current_page": paginated_result.page
             }
-        })
+        }
+        if modified_since:
+            response["sync"] = sync_info('payment', modified_since, server_time)
+        return jsonify(response)
+    except AppError as e:
+        return jsonify({"error": e.message}), e.status_code
     except Exception as e:
         return jsonify({"error": "An unexpected error occurred", "details": str(e)}), 500
 
@@ -19,8 +19,9 @@ class ExpenseNestedSchema(Schema):
 class PaymentSchema(Schema):
     """Ödeme verilerini serileştirme ve temel doğrulama için kullanılır."""
     id = fields.Int(dump_only=True)
-    expense_id = fields.Int(required=True)
+    expense_id = fields.Int(dump_only=True)     # URL'den alınır, gövdeden değil
     payment_amount = fields.Decimal(as_string=True, places=2, required=True, validate=validate.Range(min=0.01))
+    currency = fields.Str(dump_only=True)
     payment_date = fields.Date(required=True)
     notes = fields.Str(required=False, allow_none=True)
     created_at = fields.DateTime(dump_only=True)
@@ -1,12 +1,31 @@
 import sys
 from decimal import Decimal
-from sqlalchemy import func, desc, asc
 from sqlalchemy.orm import joinedload
 from .. import db
 from ..models import Payment, Expense, ExpenseStatus
 from ..errors import AppError
+from ..changes.services import record_change
+from ..concurrency import load_parent, guard_version
+from ..unit_of_work import transactional
+from ..archive.services import readable, attach_archived_parents
+from ..filters import FilterSpec, IN, MIN, MAX
+from ..money import minor_sum, to_minor, from_minor
 from datetime import datetime
 
+PAYMENT_FILTERS = FilterSpec(
+    Payment,
+    params={
+        'expense_id': ('expense_id', IN),
+        'amount_min': ('payment_amount', MIN),
+        'amount_max': ('payment_amount', MAX),
+        'date_start': ('payment_date', MIN),
+        'date_end': ('payment_date', MAX),
+    },
+    sorts=('payment_date',),
+    default_sort='payment_date',
+)
+
+
 class PaymentService:
     """Ödeme ile ilgili tüm veritabanı işlemlerini ve iş mantığını yönetir."""
 
@@ -16,16 +35,18 @@ class PaymentService:
         Bir giderin kalan tutarına ve ödemelerine göre durumunu ve tamamlanma tarihini
         merkezi olarak yeniden hesaplar.
         """
-        # Kalan tutarı, ödemelerin toplamına göre yeniden hesapla
-        total_paid = db.session.query(func.sum(Payment.payment_amount)).filter(Payment.expense_id == expense.id).scalar() or Decimal('0.00')
-        expense.remaining_amount = expense.amount - total_paid
+        # Kalan tutarı, ödemelerin toplamına göre kuruş cinsinden yeniden hesapla
+        total_paid = db.session.query(minor_sum(Payment.payment_amount)).filter(Payment.expense_id == expense.id).scalar()
+        amount = to_minor(expense.amount)
+        remaining = amount - total_paid
+        expense.remaining_amount = from_minor(remaining)
 
         # Durumu belirle
-        if expense.remaining_amount == 0:
+        if remaining == 0:
             new_status = ExpenseStatus.PAID.name
-        elif expense.remaining_amount < 0:
+        elif remaining < 0:
             new_status = ExpenseStatus.OVERPAID.name
-        elif expense.remaining_amount >= expense.amount:
+        elif remaining >= amount:
             new_status = ExpenseStatus.UNPAID.name
         else:
             new_status = ExpenseStatus.PARTIALLY_PAID.name
@@ -46,114 +67,100 @@ class PaymentService:
             raise AppError(f"Payment with id {payment_id} not found.", 404)
         return payment
 
+    @transactional(error_message="Internal error on payment creation")
     def create(self, expense_id: int, payment_data: dict) -> Payment:
         """Bir gidere yeni bir ödeme ekler ve gider durumunu günceller."""
         payment_amount = Decimal(payment_data.get('payment_amount', 0))
         if payment_amount <= 0:
             raise AppError("Payment amount must be positive.", 400)
 
-        try:
-            expense = Expense.query.with_for_update().get(expense_id)
-            if not expense:
-                raise AppError(f"Expense with id {expense_id} not found.", 404)
-            if expense.remaining_amount <= 0:
-                raise AppError(f"Expense is already {expense.status.lower()}.", 400)
-
-            new_payment = Payment(
-                expense_id=expense.id,
-                payment_amount=payment_amount,
-                payment_date=payment_data['payment_date'],
-                description=payment_data.get('description')
-            )
-            db.session.add(new_payment)
-
-            # Yan Etki: Gideri güncelle
-            expense.remaining_amount -= new_payment.payment_amount
-            PaymentService._recalculate_expense_status(expense)
-
-            db.session.commit()
-            return new_payment
-        except Exception as e:
-            db.session.rollback()
-            if isinstance(e, AppError): raise e
-            raise AppError(f"Internal error on payment creation: {e}", 500) from e
+        expense = load_parent(Expense, expense_id)
+        if not expense:
+            raise AppError(f"Expense with id {expense_id} not found.", 404)
+        if expense.remaining_amount <= 0:
+            raise AppError(f"Expense is already {expense.status.lower()}.", 400)
+
+        new_payment = Payment(
+            expense_id=expense.id,
+            payment_amount=payment_amount,
+            currency=expense.currency,
+            payment_date=payment_data['payment_date'],
+            description=payment_data.get('description')
+        )
+        db.session.add(new_payment)
+
+        # Yan Etki: Gideri güncelle
+        expense.remaining_amount -= new_payment.payment_amount
+        PaymentService._recalculate_expense_status(expense)
+        guard_version(expense)
 
+        db.session.flush()
+        record_change(new_payment, 'insert')
+        record_change(expense, 'update')
+        return new_payment
+
+    @transactional(error_message="Internal error on payment update")
     def update(self, payment_id: int, data: dict) -> Payment:
         """Bir ödemeyi günceller ve ilişkili gider durumunu yeniden hesaplar."""
-        try:
-            payment = self.get_by_id(payment_id)
-            expense = Expense.query.with_for_update().get(payment.expense_id)
-
-            old_amount = payment.payment_amount
-            new_amount = Decimal(data.get('payment_amount', old_amount))
-            if new_amount <= 0:
-                raise AppError("Payment amount must be positive.", 400)
-
-            # Yan Etki: Gideri güncelle (eskiyi ekle, yeniyi çıkar)
-            expense.remaining_amount = (expense.remaining_amount + old_amount) - new_amount
-            PaymentService._recalculate_expense_status(expense)
-
-            # Ödeme kaydını güncelle
-            payment.payment_amount = new_amount
-            payment.payment_date = data.get('payment_date', payment.payment_date)
-            payment.notes = data.get('notes', payment.notes)
-
-            db.session.commit()
-            return payment
-        except Exception as e:
-            db.session.rollback()
-            if isinstance(e, AppError): raise e
-            raise AppError(f"Internal error on payment update: {e}", 500) from e
+        payment = self.get_by_id(payment_id)
+        expense = load_parent(Expense, payment.expense_id)
+
+        old_amount = payment.payment_amount
+        new_amount = Decimal(data.get('payment_amount', old_amount))
+        if new_amount <= 0:
+            raise AppError("Payment amount must be positive.", 400)
 
+        # Yan Etki: Gideri güncelle (eskiyi ekle, yeniyi çıkar)
+        expense.remaining_amount = (expense.remaining_amount + old_amount) - new_amount
+        PaymentService._recalculate_expense_status(expense)
+        guard_version(expense)
+
+        # Ödeme kaydını güncelle
+        payment.payment_amount = new_amount
+        payment.payment_date = data.get('payment_date', payment.payment_date)
+        payment.notes = data.get('notes', payment.notes)
+
+        record_change(payment, 'update')
+        record_change(expense, 'update')
+        return payment
+
+    @transactional(error_message="Internal error on payment deletion")
     def delete(self, payment_id: int) -> bool:
         """Bir ödemeyi siler ve ilişkili gider durumunu yeniden hesaplar."""
-        try:
-            payment = self.get_by_id(payment_id)
-            expense = Expense.query.with_for_update().get(payment.expense_id)
-
-            # Yan Etki: Gideri güncelle (silinen tutarı geri ekle)
-            expense.remaining_amount += payment.payment_amount
-            PaymentService._recalculate_expense_status(expense)
-
-            db.session.delete(payment)
-            db.session.commit()
-            return True
-        except Exception as e:
-            db.session.rollback()
-            if isinstance(e, AppError): raise e
-            raise AppError(f"Internal error on payment deletion: {e}", 500) from e
-
-    def get_all(self, filters: dict, page: int, per_page: int):
+        payment = self.get_by_id(payment_id)
+        expense = load_parent(Expense, payment.expense_id)
+
+        # Yan Etki: Gideri güncelle (silinen tutarı geri ekle)
+        expense.remaining_amount += payment.payment_amount
+        PaymentService._recalculate_expense_status(expense)
+        guard_version(expense)
+
+        record_change(payment, 'delete')
+        record_change(expense, 'update')
+        db.session.delete(payment)
+        return True
+
+    def get_all(self, filters: dict, page: int, per_page: int, modified_since: datetime = None):
         """
         Tüm ödemeleri filtre, sıralama ve sayfalama ile getirir.
-        Filtreler: 'expense_id', 'date_start', 'date_end'
+        Filtreler: 'expense_id', 'date_start', 'date_end', modified_since (updated_at >=)
         Sıralama: 'sort_by' (örn: 'payment_date'), 'sort_order' ('asc' veya 'desc')
         """
-        query = Payment.query.options(
-            joinedload(Payment.expense).joinedload(Expense.region),
-            joinedload(Payment.expense).joinedload(Expense.payment_type),
-            joinedload(Payment.expense).joinedload(Expense.account_name),
-            joinedload(Payment.expense).joinedload(Expense.budget_item)
+        values = PAYMENT_FILTERS.parse(filters)
+        model = readable(Payment, *PAYMENT_FILTERS.date_range(values))
+        query = db.session.query(model).options(
+            joinedload(model.expense).joinedload(Expense.region),
+            joinedload(model.expense).joinedload(Expense.payment_type),
+            joinedload(model.expense).joinedload(Expense.account_name),
+            joinedload(model.expense).joinedload(Expense.budget_item)
         )
+        query = PAYMENT_FILTERS.apply(query, model, values)
+        if modified_since is not None:
+            query = query.filter(model.updated_at >= modified_since)
 
-        # Filtreleme
-        if 'expense_id' in filters:
-            query = query.filter(Payment.expense_id == filters['expense_id'])
-        if 'date_start' in filters:
-            start_date = datetime.strptime(filters['date_start'], '%Y-%m-%d').date()
-            query = query.filter(Payment.payment_date >= start_date)
-        if 'date_end' in filters:
-            end_date = datetime.strptime(filters['date_end'], '%Y-%m-%d').date()
-            query = query.filter(Payment.payment_date <= end_date)
-
-        # Sıralama
-        sort_by = filters.get('sort_by', 'payment_date')
-        sort_order = filters.get('sort_order', 'desc')
-        if hasattr(Payment, sort_by):
-            if sort_order == 'desc':
-                query = query.order_by(desc(sort_by))
-            else:
-                query = query.order_by(asc(sort_by))
+        query = PAYMENT_FILTERS.order_by(query, model, filters.get('sort_by'), filters.get('sort_order', 'desc'))
 
         # Sayfalama
-        return query.paginate(page=page, per_page=per_page, error_out=False)
+        paginated = query.paginate(page=page, per_page=per_page, error_out=False)
+        attach_archived_parents(paginated.items, 'expense', Expense, 'expense_id')
+        return paginated
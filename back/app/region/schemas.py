@@ -8,3 +8,4 @@ class RegionSchema(SQLAlchemyAutoSchema):
     class Meta:
         model = Region
         include_fk = True
+        dump_only = ("updated_at",)
@@ -0,0 +1,78 @@
+import random
+import time
+from flask import g, request, has_app_context
+from flask_sqlalchemy.session import Session
+from sqlalchemy import create_engine
+
+# İstemcinin kendi yazımından sonra okumalarının birincil veritabanına gideceği zamanın (epoch) tutulduğu çerez
+STICKY_COOKIE = 'db_primary_until'
+READ_METHODS = ('GET', 'HEAD')
+
+
+def current_replica():
+    """Bu app context'te okumaların yönlendirildiği kopyanın engine'i; birincil için None."""
+    return g.get('db_replica') if has_app_context() else None
+
+
+def route_reads_to(engine):
+    """Yeni açılan app context'lerde (örn. thread havuzu) isteğin yönlendirme kararını sürdürür."""
+    g.db_replica = engine
+
+
+class RoutingSession(Session):
+    """
+    Okuma isteklerinde SELECT'leri seçilen okuma kopyasına, flush ve DML ifadelerini
+    her zaman birincil veritabanına gönderen oturum.
+    """
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        replica = current_replica()
+        if (
+            bind is None
+            and replica is not None
+            and not self._flushing
+            and not getattr(clause, 'is_dml', False)
+        ):
+            return replica
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+
+def _is_sticky() -> bool:
+    try:
+        return float(request.cookies.get(STICKY_COOKIE, 0)) > time.time()
+    except ValueError:
+        return False
+
+
+def init_replicas(app):
+    """
+    GET/HEAD isteklerini yapılandırılmış okuma kopyalarından birine yönlendirir.
+    Başarılı bir yazım yapan istemci, REPLICA_STICKY_SECONDS boyunca kendi yazımını
+    görebilmek için birincil veritabanından okur.
+    """
+    # Kopyalar SQLALCHEMY_BINDS'e eklenmez; aksi halde create_all/drop_all onlara da şema yazardı
+    options = app.config.get('SQLALCHEMY_ENGINE_OPTIONS') or {}
+    engines = [create_engine(uri, **options) for uri in app.config.get('SQLALCHEMY_REPLICA_URIS') or ()]
+    app.extensions['db_replicas'] = engines
+    if not engines:
+        return
+
+    @app.before_request
+    def _choose_replica():
+        if request.method in READ_METHODS and not _is_sticky():
+            route_reads_to(random.choice(engines))
+
+    @app.after_request
+    def _stick_to_primary(response):
+        if request.method not in READ_METHODS + ('OPTIONS',) and response.status_code < 400:
+            window = app.config['REPLICA_STICKY_SECONDS']
+            response.set_cookie(
+                STICKY_COOKIE, f"{time.time() + window:.3f}", max_age=window, httponly=True, samesite='Lax'
+            )
+        return response
+
+    @app.teardown_request
+    def _reset_routing(exc):
+        # Aynı app context'te ardışık istekler çalışabileceği için (örn. test istemcisi) karar sıfırlanır
+        if has_app_context():
+            g.pop('db_replica', None)
@@ -0,0 +1,60 @@
+from contextlib import contextmanager
+from flask import current_app
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from . import db
+from .replicas import current_replica
+
+# Rapor sorgularının açıldığı bağlantı için veritabanına göre yalıtım seçenekleri.
+# SNAPSHOT/REPEATABLE READ, okuyucunun transaction başındaki tutarlı görüntüyü okumasını ve
+# ödeme/tahsilat yazımlarının aldığı satır kilitlerini beklememesini sağlar.
+SNAPSHOT_OPTIONS = {
+    'mssql': {'isolation_level': 'SNAPSHOT'},
+    'postgresql': {'isolation_level': 'REPEATABLE READ', 'postgresql_readonly': True},
+}
+
+
+class ReadOnlySessionError(RuntimeError):
+    """Raporlama oturumu üzerinden yazım yapılmaya çalışıldığında fırlatılır."""
+
+
+def _reject_writes(session, flush_context, instances):
+    if session.new or session.dirty or session.deleted:
+        raise ReadOnlySessionError("Reporting sessions are read-only.")
+
+
+def read_only_session(connection) -> Session:
+    """Verilen bağlantıya bağlı, flush sırasında her türlü yazımı reddeden bir oturum açar."""
+    session = Session(bind=connection, autoflush=False, expire_on_commit=False)
+    event.listen(session, 'before_flush', _reject_writes)
+    return session
+
+
+def snapshot_supported() -> bool:
+    return (
+        current_app.config.get('REPORTING_SNAPSHOT_ENABLED', True)
+        and db.engine.dialect.name in SNAPSHOT_OPTIONS
+    )
+
+
+@contextmanager
+def reporting_session():
+    """
+    Özet, pivot ve rapor sorgularını tek bir anlık görüntü (snapshot) üzerinde çalıştıran
+    salt okunur oturum. Tüm toplamlar aynı andan okunur; transaction sonunda geri alınır.
+    Anlık görüntü desteklenmiyorsa (SQLite) ya da kapatılmışsa varsayılan oturum kullanılır.
+    """
+    if not snapshot_supported():
+        yield db.session
+        return
+
+    options = SNAPSHOT_OPTIONS[db.engine.dialect.name]
+    # Okuma isteği bir kopyaya yönlendirildiyse anlık görüntü de o kopyada açılır
+    with (current_replica() or db.engine).connect() as connection:
+        connection = connection.execution_options(**options)
+        session = read_only_session(connection)
+        try:
+            yield session
+        finally:
+            session.close()
+            connection.rollback()
@@ -0,0 +1,44 @@
+from datetime import datetime
+from flask import Blueprint, request, jsonify
+from marshmallow import ValidationError
+from .services import ReportService
+from .schemas import ForecastRequestSchema
+from ..errors import AppError
+from ..governance import governed
+from ..fx.services import parse_currency
+
+reports_bp = Blueprint('reports_api', __name__, url_prefix='/api/reports')
+
+report_service = ReportService()
+forecast_request_schema = ForecastRequestSchema()
+
+
+@reports_bp.route('/aging', methods=['GET'])
+@governed('report', heavy=True)
+def get_aging_report():
+    """Açık gider ve gelirleri 0-30/31-60/61-90/90+ gün kovalarında özetler."""
+    as_of_str = request.args.get('as_of')
+    group_by = request.args.get('group_by') or None
+    try:
+        as_of = datetime.strptime(as_of_str, '%Y-%m-%d').date() if as_of_str else None
+    except ValueError:
+        return jsonify({"error": "Invalid date format. Please use YYYY-MM-DD."}), 400
+
+    try:
+        currency = parse_currency(request.args.get('currency'))
+        return jsonify(report_service.aging(as_of=as_of, group_by=group_by, currency=currency)), 200
+    except AppError as e:
+        return jsonify({"error": e.message}), e.status_code
+
+
+@reports_bp.route('/forecast', methods=['POST'])
+@governed('report', heavy=True)
+def get_cash_flow_forecast():
+    """Açık gider/gelirlerden tahmini nakit akışını hesaplar; gövdede 'what-if' senaryosu verilebilir."""
+    try:
+        params = forecast_request_schema.load(request.get_json(silent=True) or {})
+        return jsonify(report_service.forecast(params)), 200
+    except ValidationError as err:
+        return jsonify(err.messages), 400
+    except AppError as e:
+        return jsonify({"error": e.message}), e.status_code
@@ -0,0 +1,48 @@
+from decimal import Decimal
+from marshmallow import Schema, fields, validate, post_load, EXCLUDE
+from ..models import BASE_CURRENCY, CURRENCIES
+
+MAX_FORECAST_DAYS = 1830
+
+
+class ForecastAdjustmentSchema(Schema):
+    """Senaryoya elle eklenen tek seferlik giriş/çıkış."""
+    date = fields.Date(required=True)
+    amount = fields.Decimal(required=True, places=2, validate=validate.Range(min=0.01))
+    type = fields.Str(required=True, validate=validate.OneOf(['income', 'expense']))
+    description = fields.Str(required=False, allow_none=True)
+
+
+class ForecastOverridesSchema(Schema):
+    """'What-if' senaryosu için beklenen nakit akışlarına uygulanan değişiklikler."""
+    class Meta:
+        unknown = EXCLUDE
+
+    expense_scale = fields.Decimal(load_default=Decimal('1'), validate=validate.Range(min=0))
+    income_scale = fields.Decimal(load_default=Decimal('1'), validate=validate.Range(min=0))
+    expense_delay_days = fields.Int(load_default=0, validate=validate.Range(min=0))
+    income_delay_days = fields.Int(load_default=0, validate=validate.Range(min=0))
+    exclude_expense_ids = fields.List(fields.Int(), load_default=list)
+    exclude_income_ids = fields.List(fields.Int(), load_default=list)
+    adjustments = fields.List(fields.Nested(ForecastAdjustmentSchema), load_default=list)
+
+
+class ForecastRequestSchema(Schema):
+    class Meta:
+        unknown = EXCLUDE
+
+    start_date = fields.Date(load_default=None)
+    horizon_days = fields.Int(load_default=90, validate=validate.Range(min=1, max=MAX_FORECAST_DAYS))
+    granularity = fields.Str(load_default='daily', validate=validate.OneOf(['daily', 'weekly']))
+    # Tutarların, açılış bakiyesinin ve elle eklenen girişlerin para birimi
+    currency = fields.Str(load_default=BASE_CURRENCY, validate=validate.OneOf(CURRENCIES))
+    opening_balance = fields.Decimal(load_default=Decimal('0.00'), places=2)
+    include_overdue = fields.Bool(load_default=True)
+    overrides = fields.Nested(ForecastOverridesSchema, load_default=None)
+
+    @post_load
+    def fill_overrides(self, data, **kwargs):
+        """Gövdede 'overrides' yoksa varsayılan (etkisiz) senaryoyu kullan."""
+        if data.get('overrides') is None:
+            data['overrides'] = ForecastOverridesSchema().load({})
+        return data
@@ -0,0 +1,260 @@
+from datetime import date, timedelta
+from decimal import Decimal
+from itertools import accumulate
+from array import array
+from sqlalchemy import select, func, case, literal
+from .. import db
+from ..models import (
+    Expense, Income, Region, Company, OPEN_EXPENSE_STATUSES, OPEN_INCOME_STATUSES, BASE_CURRENCY, status_in
+)
+from ..errors import AppError
+from ..reporting import reporting_session
+from ..money import minor_sum, to_minor, to_api, scaled, zeros
+from ..fx.services import rate_vector
+
+# (etiket, en fazla gün) — son kova üst sınırsızdır
+AGING_BUCKETS = (('0_30', 30), ('31_60', 60), ('61_90', 90), ('90_plus', None))
+NOT_DUE_BUCKET = 'not_due'
+BUCKET_LABELS = (NOT_DUE_BUCKET,) + tuple(label for label, _ in AGING_BUCKETS)
+BUCKET_INDEX = {label: index for index, label in enumerate(BUCKET_LABELS)}
+
+
+class ReportService:
+    """Ödenmemiş gider ve tahsil edilmemiş gelirler için özet raporları üretir."""
+
+    @staticmethod
+    def _bucket_expression(date_column, as_of: date):
+        """
+        Yaşlandırma kovasını, sütun yerine sabit tarih sınırlarıyla karşılaştırarak üretir.
+        Böylece açık kalemlerin filtreli date indeksi üzerinde aralık taraması yapılabilir.
+        """
+        whens = [(date_column > as_of, literal(NOT_DUE_BUCKET))]
+        for label, max_days in AGING_BUCKETS[:-1]:
+            whens.append((date_column >= as_of - timedelta(days=max_days), literal(label)))
+        return case(*whens, else_=literal(AGING_BUCKETS[-1][0]))
+
+    @staticmethod
+    def _bucket_amounts(minor_amounts) -> dict:
+        return {label: to_api(amount) for label, amount in zip(BUCKET_LABELS, minor_amounts)}
+
+    def _aggregate(self, open_rows, as_of: date, currency: str, group_model=None, session=None):
+        """
+        Açık kalemleri tek bir gruplu sorgu ile kova × para birimi toplamlarına ayırır; toplamlar
+        `as_of` günündeki kurla raporlama para birimine çevrilir. Tutarlar kuruş cinsinden,
+        kova sırasıyla dizilmiş tamsayı dizilerinde biriktirilir.
+        `open_rows` alt sorgusu 'bucket', 'currency', 'amount' ve (varsa) 'group_id' kolonlarını içermelidir.
+        """
+        columns = [
+            open_rows.c.bucket, open_rows.c.currency,
+            func.count().label('count'), minor_sum(open_rows.c.amount).label('amount'),
+        ]
+        group_by = [open_rows.c.bucket, open_rows.c.currency]
+        query = select(*columns)
+        if group_model is not None:
+            query = (
+                query.add_columns(group_model.id.label('group_id'), group_model.name.label('group_name'))
+                .select_from(open_rows)
+                .join(group_model, group_model.id == open_rows.c.group_id)
+            )
+            group_by += [group_model.id, group_model.name]
+        query = query.group_by(*group_by)
+
+        session = session or db.session
+        rows = session.execute(query).all()
+        rates = rate_vector(session, currency, {(as_of, row.currency) for row in rows})
+
+        totals = zeros(len(BUCKET_LABELS))
+        counts = zeros(len(BUCKET_LABELS))
+        groups = {}
+        for row in rows:
+            index = BUCKET_INDEX[row.bucket]
+            amount = rates.convert(row.amount, row.currency, as_of)
+            totals[index] += amount
+            counts[index] += row.count
+            if group_model is not None:
+                group = groups.setdefault(row.group_id, {
+                    "id": row.group_id, "name": row.group_name, "buckets": zeros(len(BUCKET_LABELS))
+                })
+                group["buckets"][index] += amount
+
+        result = {
+            "buckets": self._bucket_amounts(totals),
+            "counts": dict(zip(BUCKET_LABELS, counts)),
+            "total": to_api(sum(totals)),
+        }
+        if group_model is not None:
+            result["groups"] = [
+                {
+                    "id": group["id"],
+                    "name": group["name"],
+                    "buckets": self._bucket_amounts(group["buckets"]),
+                    "total": to_api(sum(group["buckets"])),
+                }
+                for group in sorted(groups.values(), key=lambda g: g["name"])
+            ]
+        return result
+
+    def expense_aging(self, as_of: date, group_by: str = None, session=None, currency: str = BASE_CURRENCY) -> dict:
+        """Açık giderlerin kalan tutarlarını vade yaşına göre kovalara ayırır."""
+        group_model = {None: None, 'region': Region}.get(group_by)
+        columns = [
+            self._bucket_expression(Expense.date, as_of).label('bucket'),
+            Expense.currency,
+            Expense.remaining_amount.label('amount'),
+        ]
+        if group_model is not None:
+            columns.append(Expense.region_id.label('group_id'))
+        open_rows = (
+            select(*columns)
+            .where(status_in(Expense.status, OPEN_EXPENSE_STATUSES))
+            .subquery()
+        )
+        return self._aggregate(open_rows, as_of, currency, group_model, session)
+
+    def income_aging(self, as_of: date, group_by: str = None, session=None, currency: str = BASE_CURRENCY) -> dict:
+        """Açık gelirlerin tahsil edilmemiş tutarlarını vade yaşına göre kovalara ayırır."""
+        group_model = {None: None, 'region': Region, 'company': Company}[group_by]
+        columns = [
+            self._bucket_expression(Income.date, as_of).label('bucket'),
+            Income.currency,
+            (Income.total_amount - Income.received_amount).label('amount'),
+        ]
+        if group_model is Region:
+            columns.append(Income.region_id.label('group_id'))
+        elif group_model is Company:
+            columns.append(Income.company_id.label('group_id'))
+        open_rows = (
+            select(*columns)
+            .where(status_in(Income.status, OPEN_INCOME_STATUSES))
+            .subquery()
+        )
+        return self._aggregate(open_rows, as_of, currency, group_model, session)
+
+    def aging(self, as_of: date = None, group_by: str = None, currency: str = BASE_CURRENCY) -> dict:
+        """
+        Gider ve gelir yaşlandırma raporunu `currency` cinsinden birlikte döner.
+        group_by: None, 'region' veya 'company' (company kırılımı sadece gelirlerde vardır).
+        """
+        if group_by not in (None, 'region', 'company'):
+            raise AppError("group_by must be 'region' or 'company'.", 400)
+        as_of = as_of or date.today()
+        # Gider ve gelir tarafı aynı anlık görüntüden okunur
+        with reporting_session() as session:
+            return {
+                "as_of": as_of.isoformat(),
+                "group_by": group_by,
+                "currency": currency,
+                "buckets": list(BUCKET_LABELS),
+                "expenses": self.expense_aging(as_of, group_by, session, currency),
+                "incomes": self.income_aging(as_of, group_by, session, currency),
+            }
+
+    @staticmethod
+    def _daily_totals(session, date_column, currency_column, amount_column, open_filter, start: date, end: date,
+                      include_overdue: bool, excluded_ids, id_column):
+        """Beklenen tutarları tek bir sorguda gün × para birimine göre gruplayarak, kuruş cinsinden getirir."""
+        query = (
+            select(date_column.label('day'), currency_column, minor_sum(amount_column).label('amount'))
+            .where(open_filter, date_column <= end)
+            .group_by(date_column, currency_column)
+        )
+        if not include_overdue:
+            query = query.where(date_column >= start)
+        if excluded_ids:
+            query = query.where(id_column.notin_(excluded_ids))
+        return session.execute(query).all()
+
+    @staticmethod
+    def _to_vector(rows, start: date, days: int, rates, shift: int = 0, scale: Decimal = Decimal('1')):
+        """
+        Gün × para birimi kuruş toplamlarını raporlama para birimine çevirip ufuk uzunluğunda
+        yoğun bir tamsayı dizisine yerleştirir. Vadesi geçmiş tutarlar ilk güne (ve o günün
+        kuruyla), kaydırma ile ufuk dışına çıkanlar atılır.
+        """
+        vector = zeros(days)
+        for day, currency, amount in rows:
+            index = max((day - start).days, 0) + shift
+            if index < days and amount:
+                vector[index] += rates.convert(amount, currency, max(day, start))
+        if scale != 1:
+            vector = array('q', (scaled(value, scale) for value in vector))
+        return vector
+
+    def forecast(self, params: dict) -> dict:
+        """
+        Açık gider ve gelirlerden günlük/haftalık tahmini nakit bakiyesini hesaplar.
+        Her taraf için tek bir gruplu sorgu atılır; bakiye, gün vektörleri üzerinde
+        kümülatif toplam ile bulunur, böylece maliyet satır sayısından bağımsızdır.
+        """
+        start = params.get('start_date') or date.today()
+        days = params['horizon_days']
+        end = start + timedelta(days=days - 1)
+        overrides = params['overrides']
+        include_overdue = params['include_overdue']
+        currency = params.get('currency', BASE_CURRENCY)
+
+        with reporting_session() as session:
+            expense_rows = self._daily_totals(
+                session, Expense.date, Expense.currency, Expense.remaining_amount,
+                status_in(Expense.status, OPEN_EXPENSE_STATUSES),
+                start, end, include_overdue, overrides['exclude_expense_ids'], Expense.id
+            )
+            income_rows = self._daily_totals(
+                session, Income.date, Income.currency, Income.total_amount - Income.received_amount,
+                status_in(Income.status, OPEN_INCOME_STATUSES),
+                start, end, include_overdue, overrides['exclude_income_ids'], Income.id
+            )
+            # Kurlar ufuk içindeki (gün, para birimi) kovaları için tek sorguda yüklenir
+            rates = rate_vector(session, currency, {
+                (max(day, start), code) for day, code, _ in (*expense_rows, *income_rows)
+            })
+
+        outflow = self._to_vector(expense_rows, start, days, rates,
+                                  overrides['expense_delay_days'], overrides['expense_scale'])
+        inflow = self._to_vector(income_rows, start, days, rates,
+                                 overrides['income_delay_days'], overrides['income_scale'])
+        for adjustment in overrides['adjustments']:
+            index = (adjustment['date'] - start).days
+            if 0 <= index < days:
+                target = inflow if adjustment['type'] == 'income' else outflow
+                target[index] += to_minor(adjustment['amount'])
+
+        opening_balance = to_minor(params['opening_balance'])
+        net = [i - o for i, o in zip(inflow, outflow)]
+        balance = list(accumulate(net, initial=opening_balance))[1:]
+
+        step = 7 if params['granularity'] == 'weekly' else 1
+        series = []
+        for offset in range(0, days, step):
+            last = min(offset + step, days) - 1
+            period_in = sum(inflow[offset:last + 1])
+            period_out = sum(outflow[offset:last + 1])
+            series.append({
+                "date": (start + timedelta(days=offset)).isoformat(),
+                "inflow": to_api(period_in),
+                "outflow": to_api(period_out),
+                "net": to_api(period_in - period_out),
+                "balance": to_api(balance[last]),
+            })
+
+        min_index = min(range(days), key=balance.__getitem__)
+        total_in = sum(inflow)
+        total_out = sum(outflow)
+        return {
+            "start_date": start.isoformat(),
+            "end_date": end.isoformat(),
+            "granularity": params['granularity'],
+            "currency": currency,
+            "opening_balance": to_api(opening_balance),
+            "series": series,
+            "totals": {
+                "inflow": to_api(total_in),
+                "outflow": to_api(total_out),
+                "net": to_api(total_in - total_out),
+                "closing_balance": to_api(balance[-1]),
+            },
+            "min_balance": {
+                "date": (start + timedelta(days=min_index)).isoformat(),
+                "balance": to_api(balance[min_index]),
+            },
+        }
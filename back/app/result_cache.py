@@ -0,0 +1,285 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from datetime import date
+from flask import current_app, has_app_context
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+
+# Tablo -> (kova tarihi kolonu, etkilenen önbellek alanları, sonuçlarda okunan kolonlar).
+# Güncellenen bir satır yalnızca okunan kolonlardan biri değiştiyse önbelleği bozar;
+# örn. ödeme sonrası giderin status/remaining_amount değişimi pivotları etkilemez.
+INVALIDATION_RULES = {
+    'expense': ('date', ('summary', 'expense_pivot', 'budget_variance'),
+                ('date', 'amount', 'currency', 'description', 'region_id', 'budget_item_id')),
+    'payment': ('payment_date', ('summary', 'budget_variance'), ('payment_date', 'payment_amount', 'currency')),
+    'income': ('date', ('summary', 'income_pivot', 'budget_variance'),
+               ('date', 'total_amount', 'currency', 'description', 'company_id', 'budget_item_id')),
+    'income_receipt': ('receipt_date', ('summary',), ('receipt_date', 'receipt_amount', 'currency')),
+    'budget_plan': ('period', ('budget_variance',),
+                    ('period', 'budget_item_id', 'planned_expense', 'planned_income')),
+}
+# İsimleri pivot ve sapma sonuçlarında yer alan (ya da hiyerarşiyi belirleyen) referans tabloları
+REFERENCE_RULES = {
+    'region': ('expense_pivot', 'budget_variance'),
+    'payment_type': ('budget_variance',),
+    'account_name': ('budget_variance',),
+    'budget_item': ('expense_pivot', 'income_pivot', 'budget_variance'),
+    'company': ('income_pivot',),
+    # Kur değişikliği, raporlama para birimine çevrilmiş tüm tutarları etkiler
+    'fx_rate': ('summary', 'expense_pivot', 'income_pivot', 'budget_variance'),
+}
+# Değişince kendi tarih kovasının dışındaki ayları da etkileyen kolonlar. Ödemenin bütçe kalemi
+# giderinden okunduğu için giderin kalemi değişince ödemelerin düştüğü aylar da bayatlar;
+# bu durumda alanın tamamı geçersiz kılınır.
+SPILLOVER_RULES = {
+    'expense': (('budget_item_id',), ('budget_variance',)),
+}
+
+
+def month_bucket(value: date) -> str:
+    return f"{value.year:04d}-{value.month:02d}"
+
+
+def month_buckets(namespace: str, start: date, end: date):
+    """[start, end] aralığının kapsadığı her ay için '<alan>:YYYY-MM' etiketlerini döner."""
+    buckets = []
+    year, month = start.year, start.month
+    while (year, month) <= (end.year, end.month):
+        buckets.append(f"{namespace}:{year:04d}-{month:02d}")
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+    return buckets
+
+
+def make_key(namespace: str, params: dict) -> str:
+    """Parametreleri sıralı JSON'a çevirerek normalize edilmiş bir anahtar üretir."""
+    return f"{namespace}|{json.dumps(params, sort_keys=True, default=str)}"
+
+
+class MemoryCacheBackend:
+    """Süre sınırlı (TTL), boyutu sınırlı, süreç içi LRU önbellek."""
+
+    def __init__(self, max_entries: int = 512, ttl: float = 300):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()   # key -> (expires_at, buckets, value)
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry[2]
+
+    def set(self, key, value, buckets):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, frozenset(buckets), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, buckets):
+        buckets = set(buckets)
+        with self._lock:
+            stale = [key for key, entry in self._entries.items() if entry[1] & buckets]
+            for key in stale:
+                del self._entries[key]
+
+    def invalidate_namespace(self, namespace):
+        prefix = f"{namespace}|"
+        with self._lock:
+            for key in [key for key in self._entries if key.startswith(prefix)]:
+                del self._entries[key]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+class SQLiteCacheBackend:
+    """
+    Aynı makinedeki birden fazla worker sürecinin paylaştığı, dosya tabanlı önbellek.
+    Geçersiz kılma da aynı dosya üzerinden yapıldığı için tüm worker'lar tutarlı kalır.
+    """
+
+    def __init__(self, path: str, max_entries: int = 5000, ttl: float = 300):
+        self.path = path
+        self.max_entries = max_entries
+        self.ttl = ttl
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with self._connect() as connection:
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS cache_entry ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+            )
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS cache_bucket (bucket TEXT NOT NULL, key TEXT NOT NULL, "
+                "PRIMARY KEY (bucket, key))"
+            )
+
+    def _connect(self):
+        return sqlite3.connect(self.path, timeout=5)
+
+    def get(self, key):
+        now = time.time()
+        with self._connect() as connection:
+            row = connection.execute(
+                "SELECT value FROM cache_entry WHERE key = ? AND expires_at >= ?", (key, now)
+            ).fetchone()
+            if row is None:
+                return None
+            connection.execute("UPDATE cache_entry SET accessed_at = ? WHERE key = ?", (now, key))
+            return json.loads(row[0])
+
+    def set(self, key, value, buckets):
+        now = time.time()
+        with self._connect() as connection:
+            connection.execute(
+                "INSERT OR REPLACE INTO cache_entry (key, value, expires_at, accessed_at) VALUES (?, ?, ?, ?)",
+                (key, json.dumps(value), now + self.ttl, now)
+            )
+            connection.executemany(
+                "INSERT OR IGNORE INTO cache_bucket (bucket, key) VALUES (?, ?)",
+                [(bucket, key) for bucket in buckets]
+            )
+            connection.execute(
+                "DELETE FROM cache_entry WHERE expires_at < ? OR key IN ("
+                "SELECT key FROM cache_entry ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+                (now, self.max_entries)
+            )
+            connection.execute("DELETE FROM cache_bucket WHERE key NOT IN (SELECT key FROM cache_entry)")
+
+    def invalidate(self, buckets):
+        buckets = list(buckets)
+        placeholders = ','.join('?' * len(buckets))
+        with self._connect() as connection:
+            connection.execute(
+                f"DELETE FROM cache_entry WHERE key IN (SELECT key FROM cache_bucket WHERE bucket IN ({placeholders}))",
+                buckets
+            )
+            connection.execute(f"DELETE FROM cache_bucket WHERE bucket IN ({placeholders})", buckets)
+
+    def invalidate_namespace(self, namespace):
+        pattern = f"{namespace}|%"
+        with self._connect() as connection:
+            connection.execute("DELETE FROM cache_entry WHERE key LIKE ?", (pattern,))
+            connection.execute("DELETE FROM cache_bucket WHERE key LIKE ?", (pattern,))
+
+    def clear(self):
+        with self._connect() as connection:
+            connection.execute("DELETE FROM cache_entry")
+            connection.execute("DELETE FROM cache_bucket")
+
+
+def init_result_cache(app):
+    """Yapılandırmaya göre önbellek arka ucunu oluşturur ve uygulamaya bağlar."""
+    backend_name = app.config.get('RESULT_CACHE_BACKEND')
+    if backend_name == 'memory':
+        backend = MemoryCacheBackend(
+            max_entries=app.config['RESULT_CACHE_MAX_ENTRIES'],
+            ttl=app.config['RESULT_CACHE_TTL'],
+        )
+    elif backend_name == 'sqlite':
+        backend = SQLiteCacheBackend(
+            app.config.get('RESULT_CACHE_SQLITE_PATH') or os.path.join(app.instance_path, 'result_cache.sqlite3'),
+            max_entries=app.config['RESULT_CACHE_MAX_ENTRIES'],
+            ttl=app.config['RESULT_CACHE_TTL'],
+        )
+    elif not backend_name:
+        backend = None
+    else:
+        raise ValueError(f"Unknown RESULT_CACHE_BACKEND: {backend_name}")
+    app.extensions['result_cache'] = backend
+
+
+def get_backend():
+    if not has_app_context():
+        return None
+    return current_app.extensions.get('result_cache')
+
+
+def cached_result(namespace: str, params: dict, buckets, compute):
+    """Sonuç önbellekte varsa onu, yoksa `compute()` sonucunu önbelleğe yazıp döner."""
+    backend = get_backend()
+    if backend is None:
+        return compute()
+    key = make_key(namespace, params)
+    value = backend.get(key)
+    if value is None:
+        value = compute()
+        backend.set(key, value, buckets)
+    return value
+
+
+def invalidate_dates(entity: str, dates):
+    """Toplu (Core) yazımlardan sonra etkilenen ay kovalarını geçersiz kılar."""
+    backend = get_backend()
+    if backend is None or entity not in INVALIDATION_RULES:
+        return
+    _, namespaces, _ = INVALIDATION_RULES[entity]
+    months = {month_bucket(value) for value in dates if value is not None}
+    buckets = [f"{namespace}:{month}" for namespace in namespaces for month in months]
+    if buckets:
+        backend.invalidate(buckets)
+
+
+@event.listens_for(Session, 'after_flush')
+def _collect_changed_buckets(session, flush_context):
+    """Flush edilen nesnelerin (eski ve yeni) tarihlerinden etkilenen kovaları toplar."""
+    buckets = session.info.setdefault('result_cache_buckets', set())
+    namespaces = session.info.setdefault('result_cache_namespaces', set())
+    dirty = set(session.dirty)
+    for obj in list(session.new) + list(dirty) + list(session.deleted):
+        table = getattr(obj, '__tablename__', None)
+        if table in REFERENCE_RULES:
+            namespaces.update(REFERENCE_RULES[table])
+            continue
+        if table not in INVALIDATION_RULES:
+            continue
+        date_attr, affected, read_columns = INVALIDATION_RULES[table]
+        state = inspect(obj)
+        if obj in dirty and table in SPILLOVER_RULES:
+            columns, spilled = SPILLOVER_RULES[table]
+            if any(state.attrs[name].history.has_changes() for name in columns):
+                namespaces.update(spilled)
+        if obj in dirty and not any(state.attrs[name].history.has_changes() for name in read_columns):
+            continue
+        history = state.attrs[date_attr].history
+        dates = set(history.added or ()) | set(history.deleted or ()) | set(history.unchanged or ())
+        for value in dates:
+            if isinstance(value, str):
+                # Bazı route'lar tarihi henüz dönüştürülmemiş metin olarak atıyor
+                try:
+                    value = date.fromisoformat(value[:10])
+                except ValueError:
+                    continue
+            if isinstance(value, date):
+                buckets.update(f"{namespace}:{month_bucket(value)}" for namespace in affected)
+
+
+@event.listens_for(Session, 'after_commit')
+def _invalidate_on_commit(session):
+    buckets = session.info.pop('result_cache_buckets', None)
+    namespaces = session.info.pop('result_cache_namespaces', None)
+    backend = get_backend()
+    if backend is None:
+        return
+    if buckets:
+        backend.invalidate(buckets)
+    for namespace in namespaces or ():
+        backend.invalidate_namespace(namespace)
+
+
+@event.listens_for(Session, 'after_rollback')
+def _discard_on_rollback(session):
+    session.info.pop('result_cache_buckets', None)
+    session.info.pop('result_cache_namespaces', None)
@@ -7,6 +7,14 @@ from app.user.routes import user_bp
 from app.payments.routes import payment_bp
 from app.summary.routes import summary_bp
 from app.income.routes import income_bp
+from app.imports.routes import import_bp
+from app.reports.routes import reports_bp
+from app.changes.routes import changes_bp
+from app.dashboard.routes import dashboard_bp
+from app.transactions.routes import transactions_bp
+from app.metrics.routes import metrics_bp
+from app.fx.routes import fx_bp
+from app.budget.routes import budget_bp
 
 def register_blueprints(app):
     """Registers all blueprints for the application."""
@@ -19,3 +27,11 @@ def register_blueprints(app):
     app.register_blueprint(payment_bp)
     app.register_blueprint(summary_bp)
     app.register_blueprint(income_bp)
+    app.register_blueprint(import_bp)
+    app.register_blueprint(reports_bp)
+    app.register_blueprint(changes_bp)
+    app.register_blueprint(dashboard_bp)
+    app.register_blueprint(transactions_bp)
+    app.register_blueprint(metrics_bp)
+    app.register_blueprint(fx_bp)
+    app.register_blueprint(budget_bp)
@@ -0,0 +1,101 @@
+from datetime import date, datetime
+from dateutil.relativedelta import relativedelta
+from app.models import Expense, Payment, Income, IncomeReceipt, BASE_CURRENCY
+from app.result_cache import cached_result, month_buckets
+from app.errors import AppError
+from app.archive.services import readable
+from app.reporting import reporting_session
+from app.money import minor_sum, to_api
+from app.fx.services import rate_vector
+
+
+def parse_date_range(args):
+    """
+    İstekteki start_date/end_date parametrelerini okur; verilmemişlerse
+    içinde bulunulan ayı varsayılan olarak kullanır.
+    """
+    start_date_str = args.get('start_date')
+    end_date_str = args.get('end_date')
+
+    if start_date_str and end_date_str:
+        try:
+            start_date = datetime.strptime(start_date_str, '%Y-%m-%d').date()
+            end_date = datetime.strptime(end_date_str, '%Y-%m-%d').date()
+        except ValueError:
+            raise AppError("Invalid date format. Please use YYYY-MM-DD.", 400)
+    else:
+        today = date.today()
+        start_date = today.replace(day=1)
+        end_date = start_date + relativedelta(months=1) - relativedelta(days=1)
+    return start_date, end_date
+
+
+def _compute_summary(start_date: date, end_date: date, currency: str = BASE_CURRENCY) -> dict:
+    # Dört toplam da aynı anlık görüntüden okunur; ödeme yazımlarının kilitleri beklenmez
+    with reporting_session() as session:
+        return _summary_totals(session, start_date, end_date, currency)
+
+
+def _daily_sums(session, date_column, amount_column, currency_column, start_date: date, end_date: date):
+    """Tutarları (gün, para birimi) kovalarına kuruş cinsinden toplar."""
+    return session.query(date_column, currency_column, minor_sum(amount_column)).filter(
+        date_column >= start_date,
+        date_column <= end_date
+    ).group_by(date_column, currency_column).all()
+
+
+def _summary_totals(session, start_date: date, end_date: date, currency: str = BASE_CURRENCY) -> dict:
+    # Aralık arşivlenmiş yıllarla örtüşüyorsa toplamlar arşivle birlikte hesaplanır
+    expenses = readable(Expense, start_date, end_date, session)
+    payments = readable(Payment, start_date, end_date, session)
+    incomes = readable(Income, start_date, end_date, session)
+    receipts = readable(IncomeReceipt, start_date, end_date, session)
+
+    # Toplamlar kuruş cinsinden tamsayı olarak, gün × para birimi kovalarında hesaplanır;
+    # kovalar o günün kuruyla raporlama para birimine çevrilip toplanır
+    # Expense calculations
+    expense_rows = _daily_sums(session, expenses.date, expenses.amount, expenses.currency, start_date, end_date)
+
+    # Ödemeleri, kendi ödeme tarihlerine göre filtrele
+    payment_rows = _daily_sums(
+        session, payments.payment_date, payments.payment_amount, payments.currency, start_date, end_date
+    )
+
+    # Income calculations
+    income_rows = _daily_sums(session, incomes.date, incomes.total_amount, incomes.currency, start_date, end_date)
+
+    # Tahsilatları, kendi tahsilat tarihlerine göre filtrele
+    receipt_rows = _daily_sums(
+        session, receipts.receipt_date, receipts.receipt_amount, receipts.currency, start_date, end_date
+    )
+
+    rates = rate_vector(
+        session, currency,
+        {(day, code) for rows in (expense_rows, payment_rows, income_rows, receipt_rows) for day, code, _ in rows}
+    )
+    total_expenses = rates.total(expense_rows)
+    total_payments = rates.total(payment_rows)
+    total_expense_remaining = total_expenses - total_payments
+    total_income = rates.total(income_rows)
+    total_received = rates.total(receipt_rows)
+    total_income_remaining = total_income - total_received
+
+    return {
+        "currency": currency,
+        "total_expenses": to_api(total_expenses),
+        "total_payments": to_api(total_payments),
+        "total_expense_remaining": to_api(total_expense_remaining),
+        "total_income": to_api(total_income),
+        "total_received": to_api(total_received),
+        "total_income_remaining": to_api(total_income_remaining)
+    }
+
+
+def get_summary(start_date: date, end_date: date, currency: str = BASE_CURRENCY) -> dict:
+    """Tarih aralığı için gider/gelir özetini, ay bazlı önbellek üzerinden döner."""
+    return cached_result(
+        'summary',
+        {"start_date": start_date.isoformat(), "end_date": end_date.isoformat(), "currency": currency},
+        month_buckets('summary', start_date, end_date),
+        lambda: _compute_summary(start_date, end_date, currency)
+    )
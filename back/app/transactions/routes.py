@@ -0,0 +1,19 @@
+from flask import Blueprint, request, jsonify
+from .services import RecentTransactionService
+from ..errors import AppError
+
+transactions_bp = Blueprint('transactions_api', __name__, url_prefix='/api/transactions')
+transaction_service = RecentTransactionService()
+
+
+@transactions_bp.route('/recent', methods=['GET'])
+def list_recent_transactions():
+    """Ödeme ve tahsilatları en yeniden eskiye tek listede döner; `cursor` ile devam edilir."""
+    try:
+        limit = int(request.args.get('limit', 10))
+    except ValueError:
+        return jsonify({"error": "limit must be an integer."}), 400
+    try:
+        return jsonify(transaction_service.get_recent(limit=limit, cursor=request.args.get('cursor'))), 200
+    except AppError as e:
+        return jsonify({"error": e.message}), e.status_code
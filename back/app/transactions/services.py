@@ -0,0 +1,131 @@
+import base64
+import binascii
+import json
+from datetime import date, datetime
+from sqlalchemy import select, union_all, literal, and_, or_, false, true
+from .. import db
+from ..models import Payment, Expense, IncomeReceipt, Income
+from ..errors import AppError
+
+MAX_RECENT_LIMIT = 100
+
+
+def encode_cursor(row) -> str:
+    """Bir satırın sıralama anahtarını (tarih, oluşturulma, tür, id) opak bir imlece çevirir."""
+    key = [row['date'], row['created_at'], row['type'], row['id']]
+    raw = json.dumps(key, separators=(',', ':')).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii')
+
+
+def decode_cursor(cursor: str):
+    try:
+        day, created_at, kind, id_ = json.loads(base64.urlsafe_b64decode(cursor.encode('ascii')))
+        return (
+            date.fromisoformat(day),
+            datetime.fromisoformat(created_at) if created_at else None,
+            str(kind),
+            int(id_),
+        )
+    except (ValueError, TypeError, binascii.Error, UnicodeError):
+        raise AppError("Invalid cursor.", 400)
+
+
+class RecentTransactionService:
+    """
+    Ödemeleri ve tahsilatları tek bir, en yeniden eskiye sıralı akışta birleştirir.
+    Her iki tablo da kendi (tarih, created_at, id) indeksinden en fazla `limit` satır okur,
+    ardından UNION ALL sonucu yeniden sıralanıp kesilir; maliyet geçmişin boyutundan bağımsızdır.
+    """
+
+    @staticmethod
+    def _after_cursor(kind, date_column, created_column, id_column, cursor, nulls_first=False):
+        """
+        Azalan (tarih, created_at, tür, id) sırasında imleçten sonra gelen satırlar için koşul.
+        created_at'i NULL olan satırlar MSSQL/SQLite'ta azalan sıranın sonunda, PostgreSQL'de
+        başında yer alır; koşul `nulls_first` ile veritabanının kendi sırasına uyar, böylece
+        ORDER BY (date, created_at, id) indeksinden okunmaya devam eder.
+        """
+        if cursor is None:
+            return true()
+        day, created_at, cursor_kind, cursor_id = cursor
+        # Tür bu dal için sabit olduğundan karşılaştırması Python tarafında yapılır
+        if kind == cursor_kind:
+            tie = id_column < cursor_id
+        else:
+            tie = true() if kind < cursor_kind else false()
+        if created_at is None:
+            same_time = and_(created_column.is_(None), tie)
+            earlier = created_column.isnot(None) if nulls_first else false()
+        else:
+            same_time = and_(created_column == created_at, tie)
+            earlier = created_column < created_at
+            if not nulls_first:
+                earlier = or_(earlier, created_column.is_(None))
+        return or_(
+            date_column < day,
+            and_(date_column == day, or_(earlier, same_time)),
+        )
+
+    def _branch(self, kind, model, date_column, amount_column, parent_id, parent_model, description, limit, cursor,
+                nulls_first=False):
+        """Tutar kaydın kendi para birimindedir; currency kolonu birlikte döner."""
+        statement = (
+            select(
+                literal(kind).label('type'),
+                model.id.label('id'),
+                parent_id.label('parent_id'),
+                date_column.label('date'),
+                model.created_at.label('created_at'),
+                amount_column.label('amount'),
+                model.currency.label('currency'),
+                description.label('description'),
+            )
+            .join(parent_model, parent_id == parent_model.id)
+            .where(self._after_cursor(kind, date_column, model.created_at, model.id, cursor, nulls_first))
+            .order_by(date_column.desc(), model.created_at.desc(), model.id.desc())
+            .limit(limit)
+            .subquery()
+        )
+        return select(*statement.c)
+
+    def get_recent(self, limit: int = 10, cursor: str = None) -> dict:
+        if limit < 1 or limit > MAX_RECENT_LIMIT:
+            raise AppError(f"limit must be between 1 and {MAX_RECENT_LIMIT}.", 400)
+        position = decode_cursor(cursor) if cursor else None
+
+        # Bir sonraki sayfanın varlığını anlamak için bir fazla satır okunur
+        fetch = limit + 1
+        # PostgreSQL azalan sıralamada NULL'ları başa koyar (iç ve dış ORDER BY aynı kurala uyar)
+        nulls_first = db.session.get_bind().dialect.name == 'postgresql'
+        feed = union_all(
+            self._branch('payment', Payment, Payment.payment_date, Payment.payment_amount,
+                         Payment.expense_id, Expense, Expense.description, fetch, position, nulls_first),
+            self._branch('receipt', IncomeReceipt, IncomeReceipt.receipt_date, IncomeReceipt.receipt_amount,
+                         IncomeReceipt.income_id, Income, Income.description, fetch, position, nulls_first),
+        ).subquery()
+        statement = (
+            select(feed)
+            .order_by(feed.c.date.desc(), feed.c.created_at.desc(), feed.c.type.desc(), feed.c.id.desc())
+            .limit(fetch)
+        )
+        rows = db.session.execute(statement).mappings().all()
+
+        data = [
+            {
+                "type": row['type'],
+                "id": row['id'],
+                "parent_id": row['parent_id'],
+                "date": row['date'].isoformat(),
+                "created_at": row['created_at'].isoformat() if row['created_at'] else None,
+                "amount": float(row['amount']),
+                "currency": row['currency'],
+                "description": row['description'],
+            }
+            for row in rows[:limit]
+        ]
+        has_more = len(rows) > limit
+        return {
+            "data": data,
+            "next_cursor": encode_cursor(data[-1]) if has_more else None,
+            "has_more": has_more,
+        }
@@ -0,0 +1,145 @@
+import random
+import threading
+import time
+from functools import wraps
+from flask import current_app
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.orm.exc import StaleDataError
+from . import db
+from .concurrency import optimistic_enabled
+from .errors import AppError
+
+# Yeniden denenebilir hatalar: PostgreSQL serialization_failure/deadlock_detected SQLSTATE'leri,
+# MSSQL'de deadlock kurbanı (1205) ve snapshot güncelleme çakışması (3960), SQLite'ta kilitli veritabanı
+RETRYABLE_SQLSTATES = ('40001', '40P01')
+RETRYABLE_MSSQL_ERRORS = (1205, 3960)
+DEPTH_KEY = 'unit_of_work_depth'
+
+
+def is_retryable(error: Exception) -> bool:
+    """Hatanın, aynı işlemin baştan tekrarlanmasıyla düzelebilecek bir çakışma olup olmadığını döner."""
+    if not isinstance(error, DBAPIError) or error.orig is None:
+        return False
+    orig = error.orig
+    sqlstate = getattr(orig, 'pgcode', None) or getattr(orig, 'sqlstate', None)
+    if sqlstate is None and orig.args and isinstance(orig.args[0], str):
+        sqlstate = orig.args[0]    # pyodbc hataları (sqlstate, mesaj) şeklindedir
+    if sqlstate in RETRYABLE_SQLSTATES:
+        return True
+    message = str(orig)
+    return any(f"({code})" in message for code in RETRYABLE_MSSQL_ERRORS) or 'database is locked' in message
+
+
+class TransactionMetrics:
+    """İşlem adı başına süre, yeniden deneme ve hata sayılarını tutan süreç içi sayaçlar."""
+
+    def __init__(self):
+        self._stats = {}
+        self._lock = threading.Lock()
+
+    def record(self, name: str, duration: float, retries: int, failed: bool):
+        with self._lock:
+            stats = self._stats.setdefault(name, {
+                "count": 0, "failures": 0, "retries": 0, "total_ms": 0.0, "max_ms": 0.0
+            })
+            stats["count"] += 1
+            stats["failures"] += int(failed)
+            stats["retries"] += retries
+            stats["total_ms"] += duration * 1000
+            stats["max_ms"] = max(stats["max_ms"], duration * 1000)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                name: {**stats, "avg_ms": stats["total_ms"] / stats["count"]}
+                for name, stats in sorted(self._stats.items())
+            }
+
+    def reset(self):
+        with self._lock:
+            self._stats.clear()
+
+
+def get_metrics() -> TransactionMetrics:
+    return current_app.extensions.setdefault('transaction_metrics', TransactionMetrics())
+
+
+def _retry_policy(error: Exception):
+    """Hata türüne göre (en fazla deneme, bekleme tabanı) döner; yeniden denenmeyecekse (0, 0)."""
+    config = current_app.config
+    if isinstance(error, StaleDataError) and optimistic_enabled():
+        return config.get('OPTIMISTIC_MAX_RETRIES', 3), config.get('OPTIMISTIC_RETRY_BACKOFF', 0.02)
+    if is_retryable(error):
+        return config.get('TRANSACTION_MAX_RETRIES', 3), config.get('TRANSACTION_RETRY_BACKOFF', 0.05)
+    return 0, 0
+
+
+def _translate(error: Exception, error_message: str):
+    if isinstance(error, AppError):
+        return error
+    if isinstance(error, StaleDataError):
+        return AppError("The record was modified by another request, please retry.", 409)
+    if is_retryable(error):
+        return AppError("The request conflicted with a concurrent update, please retry.", 409)
+    if error_message:
+        return AppError(f"{error_message}: {error}", 500)
+    return error
+
+
+def transactional(name: str = None, error_message: str = None):
+    """
+    Servis metodunu tek bir iş birimi (unit of work) olarak çalıştırır.
+
+    - En dıştaki çağrı başarıyla biterse commit eder, hata olursa geri alır.
+    - Deadlock/serialization hataları ile iyimser moddaki sürüm çakışmalarında işlemi
+      sınırlı sayıda ve artan, rastgele beklemelerle baştan tekrarlar.
+    - İç içe çağrılar savepoint içinde çalışır; iç hata yalnızca kendi değişikliklerini geri alır.
+    - Her işlemin süresi, deneme ve hata sayısı ile birlikte metriklere yazılır.
+
+    `error_message` verilirse beklenmeyen hatalar bu mesajla 500 AppError'a çevrilir.
+    """
+    def decorator(fn):
+        label = name or fn.__qualname__
+
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            session = db.session
+            if session.info.get(DEPTH_KEY):
+                with session.begin_nested():
+                    return fn(*args, **kwargs)
+
+            started = time.perf_counter()
+            attempt = 0
+            while True:
+                session.info[DEPTH_KEY] = 1
+                try:
+                    result = fn(*args, **kwargs)
+                    session.commit()
+                except Exception as e:
+                    session.rollback()
+                    max_retries, backoff = _retry_policy(e)
+                    if attempt < max_retries:
+                        time.sleep(random.uniform(0, backoff * 2 ** attempt))
+                        attempt += 1
+                        continue
+                    _observe(label, started, attempt, failed=True)
+                    translated = _translate(e, error_message)
+                    if translated is e:
+                        raise
+                    raise translated from e
+                finally:
+                    session.info.pop(DEPTH_KEY, None)
+                _observe(label, started, attempt, failed=False)
+                return result
+        return wrapper
+    return decorator
+
+
+def _observe(label: str, started: float, retries: int, failed: bool):
+    duration = time.perf_counter() - started
+    get_metrics().record(label, duration, retries, failed)
+    slow_ms = current_app.config.get('TRANSACTION_SLOW_MS')
+    if slow_ms and duration * 1000 >= slow_ms:
+        current_app.logger.warning(
+            "Slow transaction %s: %.1f ms (%d retries)", label, duration * 1000, retries
+        )
@@ -10,6 +10,63 @@ class Config:
     SQLALCHEMY_TRACK_MODIFICATIONS = False
     SQLALCHEMY_ECHO = False
 
+    # GET isteklerinin yönlendirileceği okuma kopyaları (virgülle ayrılmış bağlantı adresleri).
+    # Yazım yapan istemci REPLICA_STICKY_SECONDS boyunca birincil veritabanından okur.
+    SQLALCHEMY_REPLICA_URIS = [uri.strip() for uri in os.getenv('DB_REPLICA_URIS', '').split(',') if uri.strip()]
+    REPLICA_STICKY_SECONDS = 5
+
+    # Değişiklik akışı (/api/changes)
+    CHANGE_FEED_MAX_BATCH = 1000
+    # Artımlı senkronizasyonda (modified_since) dönen server_time'ın şimdiden geride tutulduğu süre;
+    # en uzun yazma transaction'ından (toplu içe aktarma, bakım işleri) uzun olmalıdır
+    SYNC_WATERMARK_LAG_SECONDS = 300
+
+    # Ödeme/tahsilat yazımlarında gider/gelir satırı için eşzamanlılık modu:
+    # 'pessimistic' (SELECT ... FOR UPDATE) veya 'optimistic' (version_id + sınırlı yeniden deneme)
+    CONCURRENCY_MODE = os.getenv('CONCURRENCY_MODE', 'pessimistic')
+    OPTIMISTIC_MAX_RETRIES = 3
+    OPTIMISTIC_RETRY_BACKOFF = 0.02
+
+    # Servis katmanı transaction'ları: deadlock/serialization hatalarında yeniden deneme sayısı,
+    # bekleme tabanı (sn) ve yavaş sayılıp loglanacak süre (ms)
+    TRANSACTION_MAX_RETRIES = 3
+    TRANSACTION_RETRY_BACKOFF = 0.05
+    TRANSACTION_SLOW_MS = 500
+
+    # Sorgu maliyeti sınırları: liste endpoint'lerinde varsayılan/en büyük sayfa boyutu ve
+    # sayfalanmayan listelerde (/api/receipts) tek istekte dönen en fazla satır
+    DEFAULT_PER_PAGE = 20
+    MAX_PER_PAGE = 200
+    MAX_LIST_ROWS = 1000
+    # Endpoint türüne göre sorgu zaman aşımı (sn); sürücü üzerinden uygulanır, None sınırsızdır
+    STATEMENT_TIMEOUTS = {'list': 10, 'report': 30}
+    # Özet/pivot/rapor/dashboard isteklerinin süreç başına eş zamanlı slot sayısı; slot için en
+    # fazla HEAVY_QUERY_WAIT_SECONDS beklenir, sonra 503 ve Retry-After döner
+    HEAVY_QUERY_SLOTS = 4
+    HEAVY_QUERY_WAIT_SECONDS = 0.5
+    RETRY_AFTER_SECONDS = 5
+
+    # Idempotency-Key ile saklanan yanıtların geçerlilik süresi
+    IDEMPOTENCY_KEY_TTL_HOURS = 24
+
+    # expense/payment/income/income_receipt tablolarının tarih aralığına göre bölümlenmesi:
+    # 'year', 'month' veya None (kapalı). SQLite'ta etkisizdir.
+    PARTITION_GRANULARITY = os.getenv('PARTITION_GRANULARITY') or None
+    PARTITION_PERIODS_AHEAD = 3
+
+    # Özet, pivot ve rapor sorgularının salt okunur anlık görüntü (MSSQL: SNAPSHOT,
+    # PostgreSQL: REPEATABLE READ READ ONLY) oturumunda çalışması. SQLite'ta etkisizdir.
+    REPORTING_SNAPSHOT_ENABLED = os.getenv('REPORTING_SNAPSHOT_ENABLED', 'true').lower() != 'false'
+
+    # GET yanıtlarında ETag/Last-Modified ile koşullu istek (304) desteği
+    HTTP_CACHE_ENABLED = True
+
+    # Özet ve pivot sonuçları için sunucu tarafı önbellek: 'memory', 'sqlite' veya None
+    RESULT_CACHE_BACKEND = os.getenv('RESULT_CACHE_BACKEND', 'memory') or None
+    RESULT_CACHE_MAX_ENTRIES = 512
+    RESULT_CACHE_TTL = 300
+    RESULT_CACHE_SQLITE_PATH = os.getenv('RESULT_CACHE_SQLITE_PATH')
+
 class Dotenv(Config):
     """Development configuration."""
     DEBUG = True
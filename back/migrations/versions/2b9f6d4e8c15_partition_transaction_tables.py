@@ -0,0 +1,37 @@
+"""Partition expense, payment, income and income_receipt by date (optional)
+
+Revision ID: 2b9f6d4e8c15
+Revises: 7d2c8e5f1b93
+Create Date: 2025-07-31 09:17:48.502317
+
+"""
+from datetime import date
+from dateutil.relativedelta import relativedelta
+from alembic import op
+from flask import current_app
+
+from app.maintenance.partitioning import PartitionManager
+
+
+# revision identifiers, used by Alembic.
+revision = '2b9f6d4e8c15'
+down_revision = '7d2c8e5f1b93'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Yalnızca PARTITION_GRANULARITY ayarlıysa ve veritabanı mssql/postgresql ise çalışır;
+    # sonradan açmak için: flask create-partitions --enable
+    granularity = current_app.config.get('PARTITION_GRANULARITY')
+    if not granularity:
+        return
+    ahead = current_app.config.get('PARTITION_PERIODS_AHEAD', 3)
+    step = relativedelta(years=ahead) if granularity == 'year' else relativedelta(months=ahead)
+    PartitionManager(op.get_bind(), granularity).enable(until=date.today() + step)
+
+
+def downgrade():
+    # Bölümlenmiş tablolar bölümsüz tablolarla aynı kolonlara sahip olduğundan
+    # uygulama her iki durumda da çalışır; bölümleme geri alınmaz.
+    pass
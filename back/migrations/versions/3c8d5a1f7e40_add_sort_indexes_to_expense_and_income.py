@@ -0,0 +1,36 @@
+"""Add sort indexes to expense and income
+
+Revision ID: 3c8d5a1f7e40
+Revises: 8f1a3c6e9b27
+Create Date: 2025-08-05 11:03:27.640912
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3c8d5a1f7e40'
+down_revision = '8f1a3c6e9b27'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('expense', schema=None) as batch_op:
+        batch_op.create_index('ix_expense_date', ['date'], unique=False)
+        batch_op.create_index('ix_expense_amount', ['amount'], unique=False)
+
+    with op.batch_alter_table('income', schema=None) as batch_op:
+        batch_op.create_index('ix_income_date', ['date'], unique=False)
+        batch_op.create_index('ix_income_total_amount', ['total_amount'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('income', schema=None) as batch_op:
+        batch_op.drop_index('ix_income_total_amount')
+        batch_op.drop_index('ix_income_date')
+
+    with op.batch_alter_table('expense', schema=None) as batch_op:
+        batch_op.drop_index('ix_expense_amount')
+        batch_op.drop_index('ix_expense_date')
@@ -0,0 +1,36 @@
+"""Add (status, date) indexes to expense and income
+
+Revision ID: 3f1c2a9d7b40
+Revises: d6e321d317eb
+Create Date: 2025-07-21 10:12:44.381204
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3f1c2a9d7b40'
+down_revision = 'd6e321d317eb'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('expense', schema=None) as batch_op:
+        batch_op.create_index('ix_expense_status_date', ['status', 'date'], unique=False,
+                              mssql_include=['remaining_amount', 'region_id'],
+                              postgresql_include=['remaining_amount', 'region_id'])
+
+    with op.batch_alter_table('income', schema=None) as batch_op:
+        batch_op.create_index('ix_income_status_date', ['status', 'date'], unique=False,
+                              mssql_include=['total_amount', 'received_amount', 'region_id', 'company_id'],
+                              postgresql_include=['total_amount', 'received_amount', 'region_id', 'company_id'])
+
+
+def downgrade():
+    with op.batch_alter_table('income', schema=None) as batch_op:
+        batch_op.drop_index('ix_income_status_date')
+
+    with op.batch_alter_table('expense', schema=None) as batch_op:
+        batch_op.drop_index('ix_expense_status_date')
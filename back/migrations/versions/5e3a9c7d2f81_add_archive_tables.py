@@ -0,0 +1,97 @@
+"""Add archive tables for expense, payment, income and income_receipt
+
+Revision ID: 5e3a9c7d2f81
+Revises: 2b9f6d4e8c15
+Create Date: 2025-08-01 15:32:06.117482
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5e3a9c7d2f81'
+down_revision = '2b9f6d4e8c15'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('expense_archive',
+    sa.Column('id', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('group_id', sa.Integer(), autoincrement=False, nullable=True),
+    sa.Column('region_id', sa.Integer(), autoincrement=False, nullable=True),
+    sa.Column('payment_type_id', sa.Integer(), autoincrement=False, nullable=True),
+    sa.Column('account_name_id', sa.Integer(), autoincrement=False, nullable=True),
+    sa.Column('budget_item_id', sa.Integer(), autoincrement=False, nullable=True),
+    sa.Column('remaining_amount', sa.Numeric(precision=10, scale=2), autoincrement=False, nullable=True),
+    sa.Column('description', sa.String(length=255), autoincrement=False, nullable=True),
+    sa.Column('date', sa.Date(), autoincrement=False, nullable=True),
+    sa.Column('amount', sa.Numeric(precision=10, scale=2), autoincrement=False, nullable=True),
+    sa.Column('created_at', sa.DateTime(), autoincrement=False, nullable=True),
+    sa.Column('updated_at', sa.DateTime(), autoincrement=False, nullable=True),
+    sa.Column('completed_at', sa.Date(), autoincrement=False, nullable=True),
+    sa.Column('status', sa.String(length=20), autoincrement=False, nullable=False),
+    sa.Column('version_id', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('archived_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('expense_archive', schema=None) as batch_op:
+        batch_op.create_index('ix_expense_archive_date', ['date'], unique=False)
+
+    op.create_table('payment_archive',
+    sa.Column('id', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('expense_id', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('payment_amount', sa.Numeric(precision=10, scale=2), autoincrement=False, nullable=False),
+    sa.Column('payment_date', sa.Date(), autoincrement=False, nullable=False),
+    sa.Column('description', sa.String(length=255), autoincrement=False, nullable=True),
+    sa.Column('created_at', sa.DateTime(), autoincrement=False, nullable=True),
+    sa.Column('updated_at', sa.DateTime(), autoincrement=False, nullable=True),
+    sa.Column('archived_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('payment_archive', schema=None) as batch_op:
+        batch_op.create_index('ix_payment_archive_payment_date', ['payment_date'], unique=False)
+        batch_op.create_index('ix_payment_archive_expense_id', ['expense_id'], unique=False)
+
+    op.create_table('income_archive',
+    sa.Column('id', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('description', sa.String(length=255), autoincrement=False, nullable=False),
+    sa.Column('total_amount', sa.Numeric(precision=10, scale=2), autoincrement=False, nullable=False),
+    sa.Column('received_amount', sa.Numeric(precision=10, scale=2), autoincrement=False, nullable=False),
+    sa.Column('status', sa.Enum('UNRECEIVED', 'RECEIVED', 'PARTIALLY_RECEIVED', 'OVER_RECEIVED', name='incomestatus'), autoincrement=False, nullable=False),
+    sa.Column('date', sa.Date(), autoincrement=False, nullable=False),
+    sa.Column('created_at', sa.DateTime(), autoincrement=False, nullable=True),
+    sa.Column('updated_at', sa.DateTime(), autoincrement=False, nullable=True),
+    sa.Column('version_id', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('region_id', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('account_name_id', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('budget_item_id', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('company_id', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('archived_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('income_archive', schema=None) as batch_op:
+        batch_op.create_index('ix_income_archive_date', ['date'], unique=False)
+
+    op.create_table('income_receipt_archive',
+    sa.Column('id', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('income_id', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('receipt_amount', sa.Numeric(precision=10, scale=2), autoincrement=False, nullable=False),
+    sa.Column('receipt_date', sa.Date(), autoincrement=False, nullable=False),
+    sa.Column('notes', sa.String(length=255), autoincrement=False, nullable=True),
+    sa.Column('created_at', sa.DateTime(), autoincrement=False, nullable=True),
+    sa.Column('updated_at', sa.DateTime(), autoincrement=False, nullable=True),
+    sa.Column('archived_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('income_receipt_archive', schema=None) as batch_op:
+        batch_op.create_index('ix_income_receipt_archive_receipt_date', ['receipt_date'], unique=False)
+        batch_op.create_index('ix_income_receipt_archive_income_id', ['income_id'], unique=False)
+
+
+def downgrade():
+    op.drop_table('income_receipt_archive')
+    op.drop_table('income_archive')
+    op.drop_table('payment_archive')
+    op.drop_table('expense_archive')
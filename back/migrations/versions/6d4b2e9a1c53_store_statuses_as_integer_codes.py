@@ -0,0 +1,98 @@
+"""Store expense and income statuses as integer codes with filtered open-item indexes
+
+Revision ID: 6d4b2e9a1c53
+Revises: 3c8d5a1f7e40
+Create Date: 2025-08-07 09:41:15.208377
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '6d4b2e9a1c53'
+down_revision = '3c8d5a1f7e40'
+branch_labels = None
+depends_on = None
+
+EXPENSE_CODES = {'UNPAID': 0, 'PAID': 1, 'PARTIALLY_PAID': 2, 'OVERPAID': 3}
+INCOME_CODES = {'UNRECEIVED': 0, 'RECEIVED': 1, 'PARTIALLY_RECEIVED': 2, 'OVER_RECEIVED': 3}
+# Açık kalemler: UNPAID/PARTIALLY_PAID ve UNRECEIVED/PARTIALLY_RECEIVED
+OPEN_FILTER = 'status IN (0, 2)'
+
+
+def _open_index_kwargs(include):
+    return dict(
+        mssql_include=include, postgresql_include=include,
+        mssql_where=sa.text(OPEN_FILTER), postgresql_where=sa.text(OPEN_FILTER), sqlite_where=sa.text(OPEN_FILTER),
+    )
+
+
+def _convert(table, codes, old_type, to_codes):
+    """status kolonunu yeni tipte geçici bir kolona eşleyerek dönüştürür ve eski kolonun yerine koyar."""
+    new_type = sa.SmallInteger() if to_codes else old_type
+    mapping = codes.items() if to_codes else ((code, name) for name, code in codes.items())
+    whens = ' '.join(
+        f"WHEN {old!r} THEN {new!r}" if isinstance(old, str) else f"WHEN {old} THEN {new!r}"
+        for old, new in mapping
+    )
+    value = f"CASE status {whens} END"
+    if not to_codes and isinstance(new_type, sa.Enum) and op.get_bind().dialect.name == 'postgresql':
+        value = f"CAST({value} AS {new_type.name})"
+    with op.batch_alter_table(table, schema=None) as batch_op:
+        batch_op.add_column(sa.Column('status_new', new_type, nullable=True))
+    op.execute(f"UPDATE {table} SET status_new = {value}")
+    with op.batch_alter_table(table, schema=None) as batch_op:
+        batch_op.drop_column('status')
+        batch_op.alter_column('status_new', new_column_name='status', existing_type=new_type, nullable=False)
+
+
+def upgrade():
+    with op.batch_alter_table('expense', schema=None) as batch_op:
+        batch_op.drop_index('ix_expense_status_date')
+    with op.batch_alter_table('income', schema=None) as batch_op:
+        batch_op.drop_index('ix_income_status_date')
+
+    for table in ('expense', 'expense_archive'):
+        _convert(table, EXPENSE_CODES, sa.String(length=20), to_codes=True)
+    for table in ('income', 'income_archive'):
+        _convert(table, INCOME_CODES, sa.Enum(*INCOME_CODES, name='incomestatus'), to_codes=True)
+    if op.get_bind().dialect.name == 'postgresql':
+        op.execute("DROP TYPE IF EXISTS incomestatus")
+
+    with op.batch_alter_table('expense', schema=None) as batch_op:
+        batch_op.create_index('ix_expense_status_date', ['status', 'date'], unique=False)
+        batch_op.create_index('ix_expense_open_date', ['date'], unique=False,
+                              **_open_index_kwargs(['status', 'remaining_amount', 'region_id']))
+
+    with op.batch_alter_table('income', schema=None) as batch_op:
+        batch_op.create_index('ix_income_status_date', ['status', 'date'], unique=False)
+        batch_op.create_index('ix_income_open_date', ['date'], unique=False,
+                              **_open_index_kwargs(['status', 'total_amount', 'received_amount',
+                                                    'region_id', 'company_id']))
+
+
+def downgrade():
+    with op.batch_alter_table('income', schema=None) as batch_op:
+        batch_op.drop_index('ix_income_open_date')
+        batch_op.drop_index('ix_income_status_date')
+    with op.batch_alter_table('expense', schema=None) as batch_op:
+        batch_op.drop_index('ix_expense_open_date')
+        batch_op.drop_index('ix_expense_status_date')
+
+    if op.get_bind().dialect.name == 'postgresql':
+        sa.Enum(*INCOME_CODES, name='incomestatus').create(op.get_bind(), checkfirst=True)
+    for table in ('income', 'income_archive'):
+        _convert(table, INCOME_CODES, sa.Enum(*INCOME_CODES, name='incomestatus', create_type=False), to_codes=False)
+    for table in ('expense', 'expense_archive'):
+        _convert(table, EXPENSE_CODES, sa.String(length=20), to_codes=False)
+
+    with op.batch_alter_table('expense', schema=None) as batch_op:
+        batch_op.create_index('ix_expense_status_date', ['status', 'date'], unique=False,
+                              mssql_include=['remaining_amount', 'region_id'],
+                              postgresql_include=['remaining_amount', 'region_id'])
+
+    with op.batch_alter_table('income', schema=None) as batch_op:
+        batch_op.create_index('ix_income_status_date', ['status', 'date'], unique=False,
+                              mssql_include=['total_amount', 'received_amount', 'region_id', 'company_id'],
+                              postgresql_include=['total_amount', 'received_amount', 'region_id', 'company_id'])
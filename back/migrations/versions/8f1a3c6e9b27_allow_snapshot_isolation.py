@@ -0,0 +1,33 @@
+"""Allow snapshot isolation for reporting sessions
+
+Revision ID: 8f1a3c6e9b27
+Revises: 5e3a9c7d2f81
+Create Date: 2025-08-04 10:12:44.503218
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '8f1a3c6e9b27'
+down_revision = '5e3a9c7d2f81'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Yalnızca MSSQL'de gerekir; PostgreSQL REPEATABLE READ'i ek ayar olmadan destekler.
+    # ALTER DATABASE transaction içinde çalışamadığı için autocommit bloğunda yürütülür.
+    if op.get_bind().dialect.name != 'mssql':
+        return
+    with op.get_context().autocommit_block():
+        op.execute("DECLARE @sql nvarchar(300) = N'ALTER DATABASE ' + QUOTENAME(DB_NAME()) "
+                   "+ N' SET ALLOW_SNAPSHOT_ISOLATION ON'; EXEC (@sql)")
+
+
+def downgrade():
+    if op.get_bind().dialect.name != 'mssql':
+        return
+    with op.get_context().autocommit_block():
+        op.execute("DECLARE @sql nvarchar(300) = N'ALTER DATABASE ' + QUOTENAME(DB_NAME()) "
+                   "+ N' SET ALLOW_SNAPSHOT_ISOLATION OFF'; EXEC (@sql)")
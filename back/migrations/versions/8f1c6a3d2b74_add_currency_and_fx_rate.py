@@ -0,0 +1,46 @@
+"""Add currency to amounts and a daily fx_rate table
+
+Revision ID: 8f1c6a3d2b74
+Revises: 6d4b2e9a1c53
+Create Date: 2025-08-11 10:12:37.540921
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8f1c6a3d2b74'
+down_revision = '6d4b2e9a1c53'
+branch_labels = None
+depends_on = None
+
+BASE_CURRENCY = 'TRY'
+TABLES = (
+    'expense', 'payment', 'income', 'income_receipt',
+    'expense_archive', 'payment_archive', 'income_archive', 'income_receipt_archive',
+)
+
+
+def upgrade():
+    op.create_table('fx_rate',
+    sa.Column('currency', sa.String(length=3), nullable=False),
+    sa.Column('rate_date', sa.Date(), nullable=False),
+    sa.Column('rate', sa.Numeric(precision=18, scale=6), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('currency', 'rate_date')
+    )
+
+    # Var olan kayıtlar ana para birimindedir
+    for table in TABLES:
+        with op.batch_alter_table(table, schema=None) as batch_op:
+            batch_op.add_column(sa.Column('currency', sa.String(length=3), nullable=False,
+                                          server_default=BASE_CURRENCY))
+
+
+def downgrade():
+    for table in reversed(TABLES):
+        with op.batch_alter_table(table, schema=None) as batch_op:
+            batch_op.drop_column('currency', mssql_drop_default=True)
+
+    op.drop_table('fx_rate')
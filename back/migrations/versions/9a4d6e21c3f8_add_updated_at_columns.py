@@ -0,0 +1,45 @@
+"""Add updated_at to expense, payment, income and income_receipt
+
+Revision ID: 9a4d6e21c3f8
+Revises: 5b8e0c4f2a17
+Create Date: 2025-07-24 11:02:37.554910
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9a4d6e21c3f8'
+down_revision = '5b8e0c4f2a17'
+branch_labels = None
+depends_on = None
+
+TABLES = ('expense', 'payment', 'income', 'income_receipt')
+
+
+def upgrade():
+    for table in TABLES:
+        with op.batch_alter_table(table, schema=None) as batch_op:
+            batch_op.add_column(sa.Column('updated_at', sa.DateTime(), nullable=True))
+
+        # Mevcut kayıtlar için oluşturulma zamanını başlangıç değeri olarak kullan
+        op.execute(sa.text(
+            f"UPDATE {table} SET updated_at = COALESCE(created_at, CURRENT_TIMESTAMP) WHERE updated_at IS NULL"
+        ))
+
+        with op.batch_alter_table(table, schema=None) as batch_op:
+            batch_op.create_index(f'ix_{table}_updated_at', ['updated_at'], unique=False)
+
+    with op.batch_alter_table('change_log', schema=None) as batch_op:
+        batch_op.create_index('ix_change_log_entity_created_at', ['entity', 'created_at'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('change_log', schema=None) as batch_op:
+        batch_op.drop_index('ix_change_log_entity_created_at')
+
+    for table in reversed(TABLES):
+        with op.batch_alter_table(table, schema=None) as batch_op:
+            batch_op.drop_index(f'ix_{table}_updated_at')
+            batch_op.drop_column('updated_at')
@@ -0,0 +1,34 @@
+"""Add monthly budget plans per budget item
+
+Revision ID: b25e7d9c4a18
+Revises: 8f1c6a3d2b74
+Create Date: 2025-08-14 15:03:52.118406
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b25e7d9c4a18'
+down_revision = '8f1c6a3d2b74'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('budget_plan',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('budget_item_id', sa.Integer(), nullable=False),
+    sa.Column('period', sa.Date(), nullable=False),
+    sa.Column('planned_expense', sa.Numeric(precision=12, scale=2), nullable=False),
+    sa.Column('planned_income', sa.Numeric(precision=12, scale=2), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['budget_item_id'], ['budget_item.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('period', 'budget_item_id', name='uq_budget_plan_period_item')
+    )
+
+
+def downgrade():
+    op.drop_table('budget_plan')
@@ -0,0 +1,32 @@
+"""Add (date, created_at, id) indexes to payment and income_receipt
+
+Revision ID: c71e5a2b9d04
+Revises: 9a4d6e21c3f8
+Create Date: 2025-07-28 09:41:15.206318
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c71e5a2b9d04'
+down_revision = '9a4d6e21c3f8'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('payment', schema=None) as batch_op:
+        batch_op.create_index('ix_payment_date_created_at', ['payment_date', 'created_at', 'id'], unique=False)
+
+    with op.batch_alter_table('income_receipt', schema=None) as batch_op:
+        batch_op.create_index('ix_income_receipt_date_created_at', ['receipt_date', 'created_at', 'id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('income_receipt', schema=None) as batch_op:
+        batch_op.drop_index('ix_income_receipt_date_created_at')
+
+    with op.batch_alter_table('payment', schema=None) as batch_op:
+        batch_op.drop_index('ix_payment_date_created_at')
@@ -0,0 +1,38 @@
+"""Add updated_at to reference tables, expense_group and company
+
+Revision ID: c7e2a9f41d06
+Revises: b25e7d9c4a18
+Create Date: 2025-08-18 10:21:44.306127
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c7e2a9f41d06'
+down_revision = 'b25e7d9c4a18'
+branch_labels = None
+depends_on = None
+
+TABLES = ('region', 'payment_type', 'account_name', 'budget_item', 'expense_group', 'company')
+
+
+def upgrade():
+    for table in TABLES:
+        with op.batch_alter_table(table, schema=None) as batch_op:
+            batch_op.add_column(sa.Column('updated_at', sa.DateTime(), nullable=True))
+
+    # Mevcut kayıtlar için başlangıç değeri; expense_group'un oluşturulma zamanı var
+    op.execute(sa.text(
+        "UPDATE expense_group SET updated_at = COALESCE(created_at, CURRENT_TIMESTAMP) WHERE updated_at IS NULL"
+    ))
+    for table in TABLES:
+        if table != 'expense_group':
+            op.execute(sa.text(f"UPDATE {table} SET updated_at = CURRENT_TIMESTAMP WHERE updated_at IS NULL"))
+
+
+def downgrade():
+    for table in reversed(TABLES):
+        with op.batch_alter_table(table, schema=None) as batch_op:
+            batch_op.drop_column('updated_at')
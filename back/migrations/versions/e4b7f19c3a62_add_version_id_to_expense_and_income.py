@@ -0,0 +1,28 @@
+"""Add version_id to expense and income for optimistic concurrency
+
+Revision ID: e4b7f19c3a62
+Revises: c71e5a2b9d04
+Create Date: 2025-07-29 14:20:53.871045
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e4b7f19c3a62'
+down_revision = 'c71e5a2b9d04'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    for table in ('expense', 'income'):
+        with op.batch_alter_table(table, schema=None) as batch_op:
+            batch_op.add_column(sa.Column('version_id', sa.Integer(), nullable=False, server_default='1'))
+
+
+def downgrade():
+    for table in ('income', 'expense'):
+        with op.batch_alter_table(table, schema=None) as batch_op:
+            batch_op.drop_column('version_id')
@@ -0,0 +1,106 @@
+import pytest
+from app import create_app, db
+from app.models import Region, PaymentType, AccountName, BudgetItem, Company, Expense, Payment, ChangeLog, expense_archive
+from app.payments.services import PaymentService
+from app.income.services import IncomeService, IncomeReceiptService
+from app.archive.services import ArchiveService
+import datetime
+
+@pytest.fixture
+def client():
+    app = create_app('testing')
+    with app.test_client() as client:
+        with app.app_context():
+            db.create_all()
+            # Add dependencies for foreign key constraints
+            region = Region(name='Test Region')
+            db.session.add(region)
+            db.session.commit()
+            payment_type = PaymentType(name='Test Payment Type', region_id=region.id)
+            db.session.add(payment_type)
+            db.session.commit()
+            account_name = AccountName(name='Test Account Name', payment_type_id=payment_type.id)
+            db.session.add(account_name)
+            db.session.commit()
+            budget_item = BudgetItem(name='Test Budget Item', account_name_id=account_name.id)
+            db.session.add(budget_item)
+            db.session.commit()
+            company = Company(name='Test Company')
+            db.session.add(company)
+            db.session.commit()
+            yield client
+            db.session.remove()
+            db.drop_all()
+
+def _expense(day, amount=100):
+    expense = Expense(description=f'Expense {day}', amount=amount, date=day, region_id=1,
+                      payment_type_id=1, account_name_id=1, budget_item_id=1)
+    db.session.add(expense)
+    db.session.commit()
+    return expense.id
+
+def _seed():
+    # 2023 tamamen kapanmış, 2024'te açık bir gider var
+    closed_id = _expense(datetime.date(2023, 3, 10))
+    PaymentService().create(closed_id, {'payment_amount': 100, 'payment_date': datetime.date(2023, 4, 1)})
+    _expense(datetime.date(2024, 5, 10))
+    income = IncomeService().create({
+        'description': 'Test Income', 'total_amount': 50, 'date': datetime.date(2023, 6, 1),
+        'region_id': 1, 'account_name_id': 1, 'budget_item_id': 1, 'company_id': 1
+    })
+    IncomeReceiptService().create(income.id, {'receipt_amount': 50, 'receipt_date': datetime.date(2023, 6, 2)})
+
+def test_archive_moves_only_closed_years(client):
+    print("\n--- Running test_archive_moves_only_closed_years ---")
+    _seed()
+    service = ArchiveService()
+    assert service.closed_years(before_year=2025) == [2023]
+    moved = service.archive_year(2023)
+    assert moved == {'payment': 1, 'expense': 1, 'income_receipt': 1, 'income': 1}
+    assert Expense.query.count() == 1
+    assert Payment.query.count() == 0
+    assert db.session.execute(db.select(db.func.count()).select_from(expense_archive)).scalar() == 1
+    print("test_archive_moves_only_closed_years: PASSED")
+
+def test_archive_keeps_backdated_open_rows(client):
+    print("\n--- Running test_archive_keeps_backdated_open_rows ---")
+    _seed()
+    service = ArchiveService()
+    assert service.closed_years(before_year=2025) == [2023]
+    # closed_years() ile taşıma arasında geriye tarihli açık bir gider eklenir
+    open_id = _expense(datetime.date(2023, 11, 5))
+
+    moved = service.archive_year(2023)
+    assert moved == {'payment': 1, 'expense': 1, 'income_receipt': 1, 'income': 1}
+    assert db.session.get(Expense, open_id) is not None
+    assert PaymentService().create(open_id, {'payment_amount': 10, 'payment_date': datetime.date(2025, 1, 2)})
+
+    deletes = {(change.entity, change.entity_id) for change in ChangeLog.query.filter_by(operation='delete')}
+    assert ('expense', open_id) not in deletes
+    assert {entity for entity, _ in deletes} == {'payment', 'expense', 'income_receipt', 'income'}
+    print("test_archive_keeps_backdated_open_rows: PASSED")
+
+def test_reads_go_through_archive_only_when_range_overlaps(client):
+    print("\n--- Running test_reads_go_through_archive_only_when_range_overlaps ---")
+    _seed()
+    ArchiveService().archive_year(2023)
+
+    summary = client.get('/api/summary?start_date=2023-01-01&end_date=2023-12-31').json
+    assert summary['total_expenses'] == 100.0
+    assert summary['total_payments'] == 100.0
+    assert summary['total_income'] == 50.0
+    assert summary['total_received'] == 50.0
+
+    archived = client.get('/api/expenses?date_start=2023-01-01&date_end=2023-12-31').json
+    assert [e['description'] for e in archived['data']] == ['Expense 2023-03-10']
+    assert client.get('/api/expenses').json['pagination']['total_items'] == 1
+
+    payments = client.get('/api/payments?date_start=2023-01-01&date_end=2023-12-31').json['data']
+    assert payments[0]['expense']['description'] == 'Expense 2023-03-10'
+
+    receipts = client.get('/api/receipts?date_start=2023-01-01&date_end=2023-12-31').json
+    assert receipts[0]['income']['description'] == 'Test Income'
+
+    pivot = client.get('/api/expenses/pivot?month=2023-03').json
+    assert [row['amount'] for row in pivot] == [100.0]
+    print("test_reads_go_through_archive_only_when_range_overlaps: PASSED")
@@ -0,0 +1,171 @@
+import pytest
+from sqlalchemy import select, func
+from sqlalchemy.dialects import mssql
+from app import create_app, db
+from app.models import Region, PaymentType, AccountName, BudgetItem, Company, Expense
+from app.payments.services import PaymentService
+import datetime
+
+@pytest.fixture
+def client():
+    app = create_app('testing')
+    with app.test_client() as client:
+        with app.app_context():
+            db.create_all()
+            # Add dependencies for foreign key constraints
+            region = Region(name='Test Region')
+            db.session.add(region)
+            db.session.commit()
+            payment_type = PaymentType(name='Test Payment Type', region_id=region.id)
+            db.session.add(payment_type)
+            db.session.commit()
+            account_name = AccountName(name='Test Account Name', payment_type_id=payment_type.id)
+            db.session.add(account_name)
+            db.session.commit()
+            budget_item = BudgetItem(name='Test Budget Item', account_name_id=account_name.id)
+            db.session.add(budget_item)
+            db.session.commit()
+            company = Company(name='Test Company')
+            db.session.add(company)
+            db.session.commit()
+            # Aynı hesap altında ikinci bir bütçe kalemi
+            db.session.add(BudgetItem(name='Second Budget Item', account_name_id=account_name.id))
+            db.session.commit()
+            yield client
+            db.session.remove()
+            db.drop_all()
+
+def _create_expense(client, amount, date, budget_item_id=1):
+    response = client.post('/api/expenses/', json={
+        'description': 'Test Expense',
+        'amount': amount,
+        'date': date,
+        'region_id': 1,
+        'payment_type_id': 1,
+        'account_name_id': 1,
+        'budget_item_id': budget_item_id
+    })
+    return response.json['id']
+
+def _create_income(client, amount, date):
+    response = client.post('/api/incomes', json={
+        'description': 'Test Income',
+        'total_amount': amount,
+        'date': date,
+        'company_id': 1,
+        'region_id': 1,
+        'account_name_id': 1,
+        'budget_item_id': 2
+    })
+    assert response.status_code == 201
+
+def _upload_plans(client, *plans):
+    return client.put('/api/budget-plans', json={'plans': [
+        {'budget_item_id': item_id, 'month': month, 'planned_expense': expense, 'planned_income': income}
+        for item_id, month, expense, income in plans
+    ]})
+
+def test_upload_plans_upserts(client):
+    print("\n--- Running test_upload_plans_upserts ---")
+    assert _upload_plans(client, (1, '2025-07', '100.00', '0'), (2, '2025-07', '0', '50')).json == {'upserted': 2}
+    assert _upload_plans(client, (1, '2025-07', '120.00', '0')).status_code == 200
+    plans = client.get('/api/budget-plans?month=2025-07').json
+    assert [(plan['budget_item_id'], plan['month'], plan['planned_expense']) for plan in plans] == [
+        (1, '2025-07', '120.00'), (2, '2025-07', '0.00')
+    ]
+    assert _upload_plans(client, (99, '2025-07', '1', '0')).status_code == 404
+    assert _upload_plans(client, (1, '2025-13', '1', '0')).status_code == 400
+    print("test_upload_plans_upserts: PASSED")
+
+def test_variance_rolls_up_hierarchy(client):
+    print("\n--- Running test_variance_rolls_up_hierarchy ---")
+    _upload_plans(client, (1, '2025-07', '100.00', '0'), (2, '2025-07', '40.00', '200.00'))
+    first = _create_expense(client, 80.00, '2025-07-03')
+    _create_expense(client, 60.00, '2025-07-20', budget_item_id=2)
+    _create_expense(client, 500.00, '2025-08-01')
+    PaymentService().create(first, {'payment_amount': 30, 'payment_date': datetime.date(2025, 7, 10)})
+    _create_income(client, 250.00, '2025-07-15')
+
+    variance = client.get('/api/budget-plans/variance?month=2025-07').json
+    assert variance['total'] == {
+        'planned_expense': 140.00, 'expenses': 140.00, 'payments': 30.00,
+        'planned_income': 200.00, 'incomes': 250.00,
+        'expense_variance': 0.00, 'income_variance': 50.00,
+    }
+    region = variance['regions'][0]
+    account = region['payment_types'][0]['account_names'][0]
+    assert (region['name'], region['expenses']) == ('Test Region', 140.00)
+    assert account['expenses'] == 140.00
+    items = {item['name']: item for item in account['budget_items']}
+    assert items['Test Budget Item']['expense_variance'] == -20.00
+    assert items['Test Budget Item']['payments'] == 30.00
+    assert items['Second Budget Item']['expense_variance'] == 20.00
+    assert items['Second Budget Item']['incomes'] == 250.00
+    print("test_variance_rolls_up_hierarchy: PASSED")
+
+def test_variance_is_cached_per_month(client):
+    print("\n--- Running test_variance_is_cached_per_month ---")
+    _create_expense(client, 80.00, '2025-07-03')
+    assert client.get('/api/budget-plans/variance?month=2025-07').json['total']['expenses'] == 80.00
+    backend = client.application.extensions['result_cache']
+    assert backend.get('budget_variance|{"month": 7, "year": 2025}') is not None
+
+    _create_expense(client, 10.00, '2025-08-03')
+    assert backend.get('budget_variance|{"month": 7, "year": 2025}') is not None
+    _upload_plans(client, (1, '2025-07', '100.00', '0'))
+    assert backend.get('budget_variance|{"month": 7, "year": 2025}') is None
+    assert client.get('/api/budget-plans/variance?month=2025-07').json['total']['planned_expense'] == 100.00
+    print("test_variance_is_cached_per_month: PASSED")
+
+def test_variance_evicted_when_expense_changes_budget_item(client):
+    print("\n--- Running test_variance_evicted_when_expense_changes_budget_item ---")
+    expense_id = _create_expense(client, 80.00, '2025-07-03')
+    PaymentService().create(expense_id, {'payment_amount': 30, 'payment_date': datetime.date(2025, 8, 10)})
+    items = client.get('/api/budget-plans/variance?month=2025-08').json['regions'][0]['payment_types'][0]['account_names'][0]['budget_items']
+    assert [(item['id'], item['payments']) for item in items] == [(1, 30.00)]
+
+    # Ödemenin ayı (ağustos) giderin ayından (temmuz) farklı olsa da önbellek temizlenmeli
+    assert client.put(f'/api/expenses/{expense_id}', json={'budget_item_id': 2}).status_code == 200
+    items = client.get('/api/budget-plans/variance?month=2025-08').json['regions'][0]['payment_types'][0]['account_names'][0]['budget_items']
+    assert [(item['id'], item['payments']) for item in items] == [(2, 30.00)]
+    print("test_variance_evicted_when_expense_changes_budget_item: PASSED")
+
+def test_variance_reports_unassigned_expenses(client):
+    print("\n--- Running test_variance_reports_unassigned_expenses ---")
+    _create_expense(client, 100.00, '2025-07-03')
+    db.session.add(Expense(
+        description='Legacy Expense', amount=50, remaining_amount=50, date=datetime.date(2025, 7, 4),
+        region_id=1, payment_type_id=1, account_name_id=1, budget_item_id=None
+    ))
+    db.session.commit()
+
+    variance = client.get('/api/budget-plans/variance?month=2025-07').json
+    assert variance['total']['expenses'] == 150.00
+    assert variance['unassigned']['expenses'] == 50.00
+    assert [region['id'] for region in variance['regions']] == [1]
+    assert variance['regions'][0]['expenses'] == 100.00
+    print("test_variance_reports_unassigned_expenses: PASSED")
+
+def test_variance_converts_foreign_currency(client):
+    print("\n--- Running test_variance_converts_foreign_currency ---")
+    client.put('/api/fx-rates', json={'rates': [{'currency': 'EUR', 'rate_date': '2025-07-01', 'rate': '35'}]})
+    response = client.post('/api/expenses/', json={
+        'description': 'Euro Expense', 'amount': 10.00, 'date': '2025-07-05', 'currency': 'EUR',
+        'region_id': 1, 'payment_type_id': 1, 'account_name_id': 1, 'budget_item_id': 1
+    })
+    assert response.status_code == 201
+    assert client.get('/api/budget-plans/variance?month=2025-07').json['total']['expenses'] == 350.00
+    response = client.post('/api/expenses/', json={
+        'description': 'Euro Expense', 'amount': 10.00, 'date': '2025-06-05', 'currency': 'EUR',
+        'region_id': 1, 'payment_type_id': 1, 'account_name_id': 1, 'budget_item_id': 1
+    })
+    assert client.get('/api/budget-plans/variance?month=2025-06').status_code == 422
+    print("test_variance_converts_foreign_currency: PASSED")
+
+def test_rollup_statement_compiles_for_mssql(client):
+    statement = (
+        select(Region.id, BudgetItem.id, func.grouping(BudgetItem.id), func.count())
+        .group_by(func.rollup(Region.id, BudgetItem.id))
+    )
+    sql = str(statement.compile(dialect=mssql.dialect())).replace('\n', ' ')
+    assert 'GROUP BY ROLLUP(region.id, budget_item.id)' in sql
@@ -0,0 +1,173 @@
+import os
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import Session
+from app import create_app, db
+from app.models import Region, PaymentType, AccountName, BudgetItem, Company, ChangeLog
+from app.changes.services import record_bulk_changes, ChangeFeedService
+from app.payments.services import PaymentService
+import datetime
+
+@pytest.fixture
+def client():
+    app = create_app('testing')
+    app.config.update({"SYNC_WATERMARK_LAG_SECONDS": 0})
+    with app.test_client() as client:
+        with app.app_context():
+            db.create_all()
+            # Add dependencies for foreign key constraints
+            region = Region(name='Test Region')
+            db.session.add(region)
+            db.session.commit()
+            payment_type = PaymentType(name='Test Payment Type', region_id=region.id)
+            db.session.add(payment_type)
+            db.session.commit()
+            account_name = AccountName(name='Test Account Name', payment_type_id=payment_type.id)
+            db.session.add(account_name)
+            db.session.commit()
+            budget_item = BudgetItem(name='Test Budget Item', account_name_id=account_name.id)
+            db.session.add(budget_item)
+            db.session.commit()
+            company = Company(name='Test Company')
+            db.session.add(company)
+            db.session.commit()
+            yield client
+            db.session.remove()
+            db.drop_all()
+
+def _create_expense(client):
+    response = client.post('/api/expenses/', json={
+        'description': 'Test Expense',
+        'amount': 100.00,
+        'date': datetime.date.today().isoformat(),
+        'region_id': 1,
+        'payment_type_id': 1,
+        'account_name_id': 1,
+        'budget_item_id': 1
+    })
+    return response.json['id']
+
+def test_changes_feed(client):
+    print("\n--- Running test_changes_feed ---")
+    expense_id = _create_expense(client)
+    PaymentService().create(expense_id, {'payment_amount': 40, 'payment_date': datetime.date.today()})
+    client.delete(f'/api/expenses/{expense_id}')
+
+    response = client.get('/api/changes?since=0')
+    assert response.status_code == 200
+    changes = [(c['entity'], c['operation']) for c in response.json['data']]
+    assert changes == [
+        ('expense', 'insert'),
+        ('payment', 'insert'),
+        ('expense', 'update'),
+        ('payment', 'delete'),
+        ('expense', 'delete'),
+    ]
+    assert response.json['data'][2]['payload']['status'] == 'PARTIALLY_PAID'
+    assert response.json['has_more'] is False
+    print("test_changes_feed: PASSED")
+
+def test_changes_feed_cursor(client):
+    print("\n--- Running test_changes_feed_cursor ---")
+    for _ in range(3):
+        _create_expense(client)
+    first = client.get('/api/changes?since=0&limit=2').json
+    assert len(first['data']) == 2
+    assert first['has_more'] is True
+    second = client.get(f"/api/changes?since={first['next_since']}&limit=2").json
+    assert len(second['data']) == 1
+    assert second['has_more'] is False
+    assert second['data'][0]['seq'] > first['data'][-1]['seq']
+    print("test_changes_feed_cursor: PASSED")
+
+def test_changes_feed_entity_filter(client):
+    print("\n--- Running test_changes_feed_entity_filter ---")
+    _create_expense(client)
+    client.post('/api/incomes', json={
+        'description': 'Test Income',
+        'total_amount': 1000.00,
+        'date': datetime.date.today().isoformat(),
+        'region_id': 1,
+        'account_name_id': 1,
+        'budget_item_id': 1,
+        'company_id': 1
+    })
+    response = client.get('/api/changes?entity=income')
+    assert [c['entity'] for c in response.json['data']] == ['income']
+    print("test_changes_feed_entity_filter: PASSED")
+
+def test_modified_since_with_tombstones(client):
+    print("\n--- Running test_modified_since_with_tombstones ---")
+    kept_id = _create_expense(client)
+    deleted_id = _create_expense(client)
+    watermark = client.get('/api/expenses/?modified_since=2000-01-01T00:00:00').json['sync']['server_time']
+
+    new_id = _create_expense(client)
+    client.delete(f'/api/expenses/{deleted_id}')
+
+    response = client.get(f'/api/expenses/?modified_since={watermark}')
+    assert response.status_code == 200
+    assert [e['id'] for e in response.json['data']] == [new_id]
+    assert response.json['sync']['deleted'] == [deleted_id]
+    assert kept_id not in [e['id'] for e in response.json['data']]
+
+    client.put(f'/api/expenses/{kept_id}', json={'description': 'Updated Expense'})
+    response = client.get(f'/api/expenses/?modified_since={watermark}')
+    assert sorted(e['id'] for e in response.json['data']) == sorted([kept_id, new_id])
+    print("test_modified_since_with_tombstones: PASSED")
+
+def test_sync_watermark_lags_behind_flush_time(client):
+    print("\n--- Running test_sync_watermark_lags_behind_flush_time ---")
+    client.application.config['SYNC_WATERMARK_LAG_SECONDS'] = 300
+    expense_id = _create_expense(client)
+    watermark = client.get('/api/expenses/?modified_since=2000-01-01T00:00:00').json['sync']['server_time']
+    assert datetime.datetime.fromisoformat(watermark) < datetime.datetime.utcnow() - datetime.timedelta(seconds=299)
+    # Henüz commit edilmemiş bir transaction'ın yazdığı kayıtlar da bir sonraki istekte gelir
+    response = client.get(f'/api/expenses/?modified_since={watermark}')
+    assert [e['id'] for e in response.json['data']] == [expense_id]
+    print("test_sync_watermark_lags_behind_flush_time: PASSED")
+
+def test_modified_since_before_purge_requires_resync(client):
+    print("\n--- Running test_modified_since_before_purge_requires_resync ---")
+    _create_expense(client)
+    sync = client.get('/api/expenses/?modified_since=2000-01-01T00:00:00').json['sync']
+    assert sync['resync_required'] is False
+
+    ChangeFeedService().purge(datetime.datetime.utcnow() - datetime.timedelta(days=1))
+    assert client.get('/api/expenses/?modified_since=2000-01-01T00:00:00').json['sync']['resync_required'] is True
+    recent = (datetime.datetime.utcnow() - datetime.timedelta(hours=1)).isoformat()
+    assert client.get(f'/api/expenses/?modified_since={recent}').json['sync']['resync_required'] is False
+    print("test_modified_since_before_purge_requires_resync: PASSED")
+
+def test_modified_since_invalid(client):
+    response = client.get('/api/payments?modified_since=yesterday')
+    assert response.status_code == 400
+
+def test_postgresql_feed_writers_hold_lock_until_commit():
+    uri = os.getenv('TEST_POSTGRES_URI')
+    if not uri:
+        pytest.skip("TEST_POSTGRES_URI is not set")
+    engine = create_engine(uri)
+    with engine.begin() as connection:
+        connection.execute(text("DROP SCHEMA public CASCADE"))
+        connection.execute(text("CREATE SCHEMA public"))
+        db.metadata.create_all(connection)
+
+    def feed_lock_free():
+        with engine.begin() as other:
+            return other.execute(text("SELECT pg_try_advisory_xact_lock(hashtext('change_log'))")).scalar()
+
+    # Kilit tutulurken başka bir transaction daha büyük bir seq alamaz
+    with engine.connect() as connection:
+        with connection.begin():
+            record_bulk_changes(connection, 'expense', 'update', [{'id': 1}])
+            assert feed_lock_free() is False
+        assert feed_lock_free() is True
+
+    with Session(engine) as session:
+        session.add(ChangeLog(entity='expense', entity_id=1, operation='insert'))
+        session.flush()
+        assert feed_lock_free() is False
+        session.commit()
+    assert feed_lock_free() is True
+    engine.dispose()
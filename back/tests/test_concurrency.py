@@ -0,0 +1,74 @@
+import pytest
+from sqlalchemy import update
+from app import create_app, db
+from app.models import Region, PaymentType, AccountName, BudgetItem, Company, Expense
+from app.payments.services import PaymentService
+import datetime
+
+@pytest.fixture
+def app():
+    app = create_app('testing')
+    app.config.update({"CONCURRENCY_MODE": "optimistic", "OPTIMISTIC_RETRY_BACKOFF": 0})
+    with app.app_context():
+        db.create_all()
+        # Add dependencies for foreign key constraints
+        region = Region(name='Test Region')
+        db.session.add(region)
+        db.session.commit()
+        payment_type = PaymentType(name='Test Payment Type', region_id=region.id)
+        db.session.add(payment_type)
+        db.session.commit()
+        account_name = AccountName(name='Test Account Name', payment_type_id=payment_type.id)
+        db.session.add(account_name)
+        db.session.commit()
+        budget_item = BudgetItem(name='Test Budget Item', account_name_id=account_name.id)
+        db.session.add(budget_item)
+        db.session.commit()
+        company = Company(name='Test Company')
+        db.session.add(company)
+        db.session.commit()
+        expense = Expense(description='Test Expense', amount=100, date=datetime.date(2025, 7, 1), region_id=1,
+                          payment_type_id=1, account_name_id=1, budget_item_id=1)
+        db.session.add(expense)
+        db.session.commit()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+def _interfere(monkeypatch, times):
+    """İlk `times` hesaplamada, başka bir isteğin gideri güncellemiş olmasını taklit eder."""
+    calls = {"count": 0}
+    original = PaymentService._recalculate_expense_status
+
+    def recalculate(expense):
+        calls["count"] += 1
+        if calls["count"] <= times:
+            db.session.execute(
+                update(Expense).where(Expense.id == expense.id).values(version_id=Expense.version_id + 1)
+                .execution_options(synchronize_session=False)
+            )
+        original(expense)
+
+    monkeypatch.setattr(PaymentService, '_recalculate_expense_status', staticmethod(recalculate))
+    return calls
+
+def test_optimistic_payment_retries_after_conflict(app, monkeypatch):
+    print("\n--- Running test_optimistic_payment_retries_after_conflict ---")
+    calls = _interfere(monkeypatch, times=1)
+    PaymentService().create(1, {'payment_amount': 40, 'payment_date': datetime.date(2025, 7, 2)})
+    assert calls["count"] == 2
+    expense = db.session.get(Expense, 1)
+    assert expense.remaining_amount == 60
+    assert expense.status == 'PARTIALLY_PAID'
+    assert len(expense.payments) == 1
+    print("test_optimistic_payment_retries_after_conflict: PASSED")
+
+def test_optimistic_payment_gives_up_with_409(app, monkeypatch):
+    print("\n--- Running test_optimistic_payment_gives_up_with_409 ---")
+    calls = _interfere(monkeypatch, times=10)
+    with pytest.raises(Exception) as exc_info:
+        PaymentService().create(1, {'payment_amount': 40, 'payment_date': datetime.date(2025, 7, 2)})
+    assert exc_info.value.status_code == 409
+    assert calls["count"] == app.config['OPTIMISTIC_MAX_RETRIES'] + 1
+    assert db.session.get(Expense, 1).remaining_amount == 100
+    print("test_optimistic_payment_gives_up_with_409: PASSED")
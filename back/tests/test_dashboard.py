@@ -0,0 +1,106 @@
+import pytest
+from app import create_app, db
+from app.models import Region, PaymentType, AccountName, BudgetItem, Company
+from app.payments.services import PaymentService
+import datetime
+
+@pytest.fixture
+def client(tmp_path):
+    app = create_app('testing')
+    with app.test_client() as client:
+        with app.app_context():
+            db.create_all()
+            # Add dependencies for foreign key constraints
+            region = Region(name='Test Region')
+            db.session.add(region)
+            db.session.commit()
+            payment_type = PaymentType(name='Test Payment Type', region_id=region.id)
+            db.session.add(payment_type)
+            db.session.commit()
+            account_name = AccountName(name='Test Account Name', payment_type_id=payment_type.id)
+            db.session.add(account_name)
+            db.session.commit()
+            budget_item = BudgetItem(name='Test Budget Item', account_name_id=account_name.id)
+            db.session.add(budget_item)
+            db.session.commit()
+            company = Company(name='Test Company')
+            db.session.add(company)
+            db.session.commit()
+            yield client
+            db.session.remove()
+            db.drop_all()
+
+def test_get_dashboard(client):
+    print("\n--- Running test_get_dashboard ---")
+    expense_id = client.post('/api/expenses/', json={
+        'description': 'Test Expense',
+        'amount': 100.00,
+        'date': '2025-07-10',
+        'region_id': 1,
+        'payment_type_id': 1,
+        'account_name_id': 1,
+        'budget_item_id': 1
+    }).json['id']
+    PaymentService().create(expense_id, {'payment_amount': 40, 'payment_date': datetime.date(2025, 7, 12)})
+
+    response = client.get('/api/dashboard?start_date=2025-07-01&end_date=2025-07-31')
+    assert response.status_code == 200
+    assert response.json['summary']['total_expenses'] == 100.00
+    assert response.json['summary']['total_payments'] == 40.00
+    assert len(response.json['payments']['data']) == 1
+    assert response.json['remaining_expenses']['data'][0]['status'] == 'PARTIALLY_PAID'
+    assert response.json['receipts'] == []
+    print("test_get_dashboard: PASSED")
+
+def test_snapshot_amounts_carry_currency(client):
+    print("\n--- Running test_snapshot_amounts_carry_currency ---")
+    client.put('/api/fx-rates', json={'rates': [{'currency': 'EUR', 'rate_date': '2025-07-01', 'rate': '35'}]})
+    expense_id = client.post('/api/expenses/', json={
+        'description': 'Euro Expense', 'amount': 100.00, 'currency': 'EUR', 'date': '2025-07-05',
+        'region_id': 1, 'payment_type_id': 1, 'account_name_id': 1, 'budget_item_id': 1
+    }).json['id']
+    PaymentService().create(expense_id, {'payment_amount': 30, 'payment_date': datetime.date(2025, 7, 6)})
+
+    response = client.get('/api/dashboard/snapshot?start_date=2025-07-01&end_date=2025-07-31')
+    # Toplamlar TRY'ye çevrilir, liste satırları kendi para birimiyle döner
+    assert response.json['totals']['total_payments'] == 1050.00
+    assert (response.json['recent_payments'][0]['amount'], response.json['recent_payments'][0]['currency']) == (30.0, 'EUR')
+    assert (response.json['open_expenses'][0]['amount'], response.json['open_expenses'][0]['currency']) == (70.0, 'EUR')
+    print("test_snapshot_amounts_carry_currency: PASSED")
+
+def test_get_dashboard_invalid_dates(client):
+    response = client.get('/api/dashboard?start_date=2025-07&end_date=2025-07-31')
+    assert response.status_code == 400
+
+def test_get_dashboard_snapshot(client):
+    print("\n--- Running test_get_dashboard_snapshot ---")
+    expense_ids = []
+    for day in (5, 10, 15):
+        expense_ids.append(client.post('/api/expenses/', json={
+            'description': f'Expense {day}',
+            'amount': 100.00,
+            'date': f'2025-07-{day:02d}',
+            'region_id': 1,
+            'payment_type_id': 1,
+            'account_name_id': 1,
+            'budget_item_id': 1
+        }).json['id'])
+    for day, expense_id in zip((6, 11, 16), expense_ids):
+        PaymentService().create(expense_id, {'payment_amount': 25, 'payment_date': datetime.date(2025, 7, day)})
+
+    response = client.get('/api/dashboard/snapshot?start_date=2025-07-01&end_date=2025-07-31&limit=2')
+    assert response.status_code == 200
+    assert response.json['totals']['total_payments'] == 75.00
+    payments = response.json['recent_payments']
+    assert [p['date'] for p in payments] == ['2025-07-16', '2025-07-11']
+    assert payments[0] == {
+        'id': payments[0]['id'], 'amount': 25.0, 'currency': 'TRY', 'date': '2025-07-16', 'description': 'Expense 15',
+        'region': 'Test Region', 'payment_type': 'Test Payment Type',
+        'account_name': 'Test Account Name', 'budget_item': 'Test Budget Item'
+    }
+    assert [e['description'] for e in response.json['open_expenses']] == ['Expense 15', 'Expense 10']
+    assert response.json['open_expenses'][0]['amount'] == 75.0
+    assert response.json['open_expenses'][0]['currency'] == 'TRY'
+    assert response.json['recent_receipts'] == []
+    assert response.json['open_incomes'] == []
+    print("test_get_dashboard_snapshot: PASSED")
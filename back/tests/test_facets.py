@@ -0,0 +1,82 @@
+import pytest
+from sqlalchemy.dialects import mssql
+from app import create_app, db
+from app.models import Region, PaymentType, AccountName, BudgetItem, Company, Expense, Income, IncomeStatus
+import datetime
+
+@pytest.fixture
+def client():
+    app = create_app('testing')
+    with app.test_client() as client:
+        with app.app_context():
+            db.create_all()
+            # Add dependencies for foreign key constraints
+            region = Region(name='Test Region')
+            db.session.add(region)
+            db.session.commit()
+            payment_type = PaymentType(name='Test Payment Type', region_id=region.id)
+            db.session.add(payment_type)
+            db.session.commit()
+            account_name = AccountName(name='Test Account Name', payment_type_id=payment_type.id)
+            db.session.add(account_name)
+            db.session.commit()
+            budget_item = BudgetItem(name='Test Budget Item', account_name_id=account_name.id)
+            db.session.add(budget_item)
+            db.session.commit()
+            second_budget_item = BudgetItem(name='Second Budget Item', account_name_id=account_name.id)
+            db.session.add(second_budget_item)
+            db.session.commit()
+            company = Company(name='Test Company')
+            db.session.add(company)
+            db.session.commit()
+            yield client
+            db.session.remove()
+            db.drop_all()
+
+def _expense(day, amount, status, budget_item_id=1):
+    db.session.add(Expense(description='Expense', amount=amount, date=day, status=status, region_id=1,
+                           payment_type_id=1, account_name_id=1, budget_item_id=budget_item_id))
+    db.session.commit()
+
+def test_expense_facets_follow_current_filter(client):
+    _expense(datetime.date(2025, 7, 1), 100, 'UNPAID')
+    _expense(datetime.date(2025, 7, 2), 200, 'UNPAID', budget_item_id=2)
+    _expense(datetime.date(2025, 7, 3), 300, 'PAID', budget_item_id=2)
+    _expense(datetime.date(2025, 9, 1), 400, 'PAID')
+
+    response = client.get('/api/expenses?date_end=2025-07-31&per_page=1&facets=status,region_id,budget_item_id')
+    assert response.status_code == 200
+    body = response.get_json()
+    assert len(body['data']) == 1
+    assert body['facets'] == {
+        'status': [{'value': 'UNPAID', 'count': 2}, {'value': 'PAID', 'count': 1}],
+        'region_id': [{'value': 1, 'count': 3}],
+        'budget_item_id': [{'value': 2, 'count': 2}, {'value': 1, 'count': 1}],
+    }
+
+    assert 'facets' not in client.get('/api/expenses').get_json()
+
+def test_income_facets_report_enum_names(client):
+    for status in (IncomeStatus.RECEIVED, IncomeStatus.UNRECEIVED, IncomeStatus.UNRECEIVED):
+        db.session.add(Income(description='Income', total_amount=100, received_amount=0, status=status,
+                              date=datetime.date(2025, 7, 1), region_id=1, account_name_id=1,
+                              budget_item_id=1, company_id=1))
+    db.session.commit()
+    response = client.get('/api/incomes?facets=status,company_id')
+    assert response.status_code == 200
+    assert response.get_json()['facets'] == {
+        'status': [{'value': 'UNRECEIVED', 'count': 2}, {'value': 'RECEIVED', 'count': 1}],
+        'company_id': [{'value': 1, 'count': 3}],
+    }
+
+def test_unknown_facet_is_rejected(client):
+    response = client.get('/api/expenses?facets=status,description')
+    assert response.status_code == 400
+    assert 'description' in response.get_json()['message']
+
+def test_grouping_sets_statement_compiles_for_mssql(client):
+    from sqlalchemy import select, func
+    columns = [Expense.status, Expense.region_id]
+    statement = select(*columns, func.count()).group_by(func.grouping_sets(*columns))
+    sql = str(statement.compile(dialect=mssql.dialect()))
+    assert 'GROUP BY GROUPING SETS(expense.status, expense.region_id)' in sql.replace('\n', ' ')
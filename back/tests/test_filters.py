@@ -0,0 +1,84 @@
+import pytest
+from app import create_app, db
+from app.models import Region, PaymentType, AccountName, BudgetItem, Company, Expense, Income, IncomeStatus
+from app.filters import FilterSpec, IN
+from app.expense.services import EXPENSE_FILTERS
+import datetime
+
+@pytest.fixture
+def client():
+    app = create_app('testing')
+    with app.test_client() as client:
+        with app.app_context():
+            db.create_all()
+            # Add dependencies for foreign key constraints
+            region = Region(name='Test Region')
+            db.session.add(region)
+            db.session.commit()
+            payment_type = PaymentType(name='Test Payment Type', region_id=region.id)
+            db.session.add(payment_type)
+            db.session.commit()
+            account_name = AccountName(name='Test Account Name', payment_type_id=payment_type.id)
+            db.session.add(account_name)
+            db.session.commit()
+            budget_item = BudgetItem(name='Test Budget Item', account_name_id=account_name.id)
+            db.session.add(budget_item)
+            db.session.commit()
+            company = Company(name='Test Company')
+            db.session.add(company)
+            db.session.commit()
+            yield client
+            db.session.remove()
+            db.drop_all()
+
+def _expense(day, amount, status='UNPAID', description='Expense'):
+    db.session.add(Expense(description=description, amount=amount, date=day, status=status, region_id=1,
+                           payment_type_id=1, account_name_id=1, budget_item_id=1))
+    db.session.commit()
+
+def _amounts(response):
+    assert response.status_code == 200, response.get_json()
+    return [float(item['amount']) for item in response.get_json()['data']]
+
+def test_expense_filters_are_typed_and_combined(client):
+    _expense(datetime.date(2025, 7, 1), 100, 'UNPAID', 'Office rent')
+    _expense(datetime.date(2025, 7, 10), 250, 'PARTIALLY_PAID', 'Office supplies')
+    _expense(datetime.date(2025, 7, 20), 400, 'PAID', 'Office cleaning')
+    _expense(datetime.date(2025, 8, 1), 300, 'UNPAID', 'Travel')
+
+    response = client.get('/api/expenses?status=unpaid,partially_paid&date_start=2025-07-01'
+                          '&date_end=2025-07-31&sort_by=amount&sort_order=asc')
+    assert _amounts(response) == [100.0, 250.0]
+
+    response = client.get('/api/expenses?amount_min=200&amount_max=350&description=OFFICE')
+    assert _amounts(response) == [250.0]
+
+    response = client.get('/api/expenses?region_id=1,2&sort_by=date&sort_order=desc')
+    assert _amounts(response) == [300.0, 400.0, 250.0, 100.0]
+
+def test_invalid_values_and_unindexed_sorts_are_rejected(client):
+    assert client.get('/api/expenses?date_start=2025-13-01').status_code == 400
+    assert client.get('/api/expenses?amount_min=abc').status_code == 400
+    assert client.get('/api/expenses?sort_by=remaining_amount').status_code == 400
+    assert client.get('/api/expenses?sort_order=sideways').status_code == 400
+
+def test_income_status_filter_uses_enum_names(client):
+    for status, amount in ((IncomeStatus.UNRECEIVED, 100), (IncomeStatus.RECEIVED, 200)):
+        db.session.add(Income(description='Income', total_amount=amount, received_amount=0, status=status,
+                              date=datetime.date(2025, 7, 1), region_id=1, account_name_id=1,
+                              budget_item_id=1, company_id=1))
+    db.session.commit()
+    response = client.get('/api/incomes?status=received')
+    assert response.status_code == 200
+    assert [float(item['total_amount']) for item in response.get_json()['data']] == [200.0]
+
+def test_criteria_are_compiled_once_per_shape(client):
+    EXPENSE_FILTERS._compiled.cache_clear()
+    for region_id in ('1', '2', '3'):
+        client.get(f'/api/expenses?region_id={region_id}&date_start=2025-01-01')
+    info = EXPENSE_FILTERS._compiled.cache_info()
+    assert info.misses == 1 and info.hits == 2
+
+def test_spec_requires_indexed_sort_columns():
+    with pytest.raises(ValueError):
+        FilterSpec(Expense, params={'region_id': ('region_id', IN)}, sorts=('description',), default_sort='description')
@@ -0,0 +1,143 @@
+import pytest
+from app import create_app, db
+from app.models import Region, PaymentType, AccountName, BudgetItem, Company
+from app.payments.services import PaymentService
+import datetime
+
+@pytest.fixture
+def client():
+    app = create_app('testing')
+    with app.test_client() as client:
+        with app.app_context():
+            db.create_all()
+            # Add dependencies for foreign key constraints
+            region = Region(name='Test Region')
+            db.session.add(region)
+            db.session.commit()
+            payment_type = PaymentType(name='Test Payment Type', region_id=region.id)
+            db.session.add(payment_type)
+            db.session.commit()
+            account_name = AccountName(name='Test Account Name', payment_type_id=payment_type.id)
+            db.session.add(account_name)
+            db.session.commit()
+            budget_item = BudgetItem(name='Test Budget Item', account_name_id=account_name.id)
+            db.session.add(budget_item)
+            db.session.commit()
+            company = Company(name='Test Company')
+            db.session.add(company)
+            db.session.commit()
+            yield client
+            db.session.remove()
+            db.drop_all()
+
+def _create_expense(client, amount, date, currency=None):
+    body = {
+        'description': 'Test Expense',
+        'amount': amount,
+        'date': date,
+        'region_id': 1,
+        'payment_type_id': 1,
+        'account_name_id': 1,
+        'budget_item_id': 1
+    }
+    if currency:
+        body['currency'] = currency
+    response = client.post('/api/expenses/', json=body)
+    assert response.status_code == 201
+    return response.json['id']
+
+def _upload_rates(client, *rates):
+    response = client.put('/api/fx-rates', json={'rates': [
+        {'currency': currency, 'rate_date': rate_date, 'rate': rate} for currency, rate_date, rate in rates
+    ]})
+    assert response.status_code == 200
+    return response
+
+def test_upload_rates_upserts(client):
+    print("\n--- Running test_upload_rates_upserts ---")
+    _upload_rates(client, ('EUR', '2025-07-01', '35.5'), ('USD', '2025-07-01', '32.25'))
+    _upload_rates(client, ('EUR', '2025-07-01', '36'))
+    rates = client.get('/api/fx-rates?currency=EUR').json
+    assert [(rate['rate_date'], rate['rate']) for rate in rates] == [('2025-07-01', '36.000000')]
+    assert client.put('/api/fx-rates', json={'rates': [
+        {'currency': 'TRY', 'rate_date': '2025-07-01', 'rate': '1'}
+    ]}).status_code == 400
+    print("test_upload_rates_upserts: PASSED")
+
+def test_summary_converts_daily_buckets(client):
+    print("\n--- Running test_summary_converts_daily_buckets ---")
+    _upload_rates(client, ('EUR', '2025-06-30', '30'), ('EUR', '2025-07-10', '40'), ('USD', '2025-06-01', '25'))
+    _create_expense(client, 300.00, '2025-07-05')
+    first = _create_expense(client, 10.00, '2025-07-05', 'EUR')
+    _create_expense(client, 10.00, '2025-07-12', 'EUR')
+    PaymentService().create(first, {'payment_amount': 5, 'payment_date': datetime.date(2025, 7, 11)})
+
+    params = 'start_date=2025-07-01&end_date=2025-07-31'
+    summary = client.get(f'/api/summary?{params}').json
+    # 300 + 10 EUR × 30 + 10 EUR × 40; ödeme, ödeme gününün kuruyla çevrilir
+    assert summary['currency'] == 'TRY'
+    assert summary['total_expenses'] == 1000.00
+    assert summary['total_payments'] == 200.00
+
+    summary = client.get(f'/api/summary?{params}&currency=USD').json
+    assert summary['currency'] == 'USD'
+    assert summary['total_expenses'] == 40.00
+    assert summary['total_payments'] == 8.00
+    print("test_summary_converts_daily_buckets: PASSED")
+
+def test_payment_takes_expense_currency(client):
+    print("\n--- Running test_payment_takes_expense_currency ---")
+    expense_id = _create_expense(client, 10.00, '2025-07-05', 'USD')
+    payment = PaymentService().create(expense_id, {'payment_amount': 4, 'payment_date': datetime.date(2025, 7, 6)})
+    assert payment.currency == 'USD'
+    assert client.get(f'/api/expenses/{expense_id}').json['currency'] == 'USD'
+    print("test_payment_takes_expense_currency: PASSED")
+
+def test_missing_rate_is_reported(client):
+    print("\n--- Running test_missing_rate_is_reported ---")
+    _upload_rates(client, ('EUR', '2025-07-10', '40'))
+    _create_expense(client, 10.00, '2025-07-05', 'EUR')
+    response = client.get('/api/summary?start_date=2025-07-01&end_date=2025-07-31')
+    assert response.status_code == 422
+    assert 'EUR' in response.json['error']
+    assert client.get('/api/summary?currency=GBP').status_code == 400
+    print("test_missing_rate_is_reported: PASSED")
+
+def test_pivot_keeps_original_amount(client):
+    print("\n--- Running test_pivot_keeps_original_amount ---")
+    _upload_rates(client, ('EUR', '2025-07-01', '35'))
+    _create_expense(client, 10.00, '2025-07-05', 'EUR')
+    rows = client.get('/api/expenses/pivot?month=2025-07').json
+    assert rows[0]['amount'] == 350.00
+    assert (rows[0]['currency'], rows[0]['original_amount'], rows[0]['original_currency']) == ('TRY', 10.00, 'EUR')
+    assert client.get('/api/expenses/pivot?month=2025-07&currency=EUR').json[0]['amount'] == 10.00
+    print("test_pivot_keeps_original_amount: PASSED")
+
+def test_rate_upload_invalidates_cached_reports(client):
+    print("\n--- Running test_rate_upload_invalidates_cached_reports ---")
+    _upload_rates(client, ('EUR', '2025-07-01', '35'))
+    _create_expense(client, 10.00, '2025-07-05', 'EUR')
+    params = 'start_date=2025-07-01&end_date=2025-07-31'
+    assert client.get(f'/api/summary?{params}').json['total_expenses'] == 350.00
+    _upload_rates(client, ('EUR', '2025-07-01', '36'))
+    assert client.get(f'/api/summary?{params}').json['total_expenses'] == 360.00
+    print("test_rate_upload_invalidates_cached_reports: PASSED")
+
+def test_aging_and_forecast_in_reporting_currency(client):
+    print("\n--- Running test_aging_and_forecast_in_reporting_currency ---")
+    _upload_rates(client, ('USD', '2025-06-01', '20'), ('USD', '2025-07-01', '25'))
+    _create_expense(client, 50.00, '2025-06-20')
+    _create_expense(client, 4.00, '2025-07-03', 'USD')
+
+    aging = client.get('/api/reports/aging?as_of=2025-07-01&currency=USD').json
+    assert aging['currency'] == 'USD'
+    assert aging['expenses']['buckets']['0_30'] == 2.00
+    assert aging['expenses']['buckets']['not_due'] == 4.00
+
+    forecast = client.post('/api/reports/forecast', json={
+        'start_date': '2025-07-01', 'horizon_days': 5, 'currency': 'USD', 'opening_balance': 10
+    }).json
+    assert forecast['currency'] == 'USD'
+    assert forecast['totals']['outflow'] == 6.00
+    assert forecast['totals']['closing_balance'] == 4.00
+    print("test_aging_and_forecast_in_reporting_currency: PASSED")
@@ -0,0 +1,114 @@
+import os
+import pytest
+from sqlalchemy import create_engine, text
+from app import create_app, db
+from app.errors import AppError
+from app.governance import apply_timeout, watch_engine
+from app.models import Region, PaymentType, AccountName, BudgetItem, Company, Expense, Income, IncomeReceipt, IncomeStatus
+import datetime
+
+@pytest.fixture
+def app():
+    app = create_app('testing')
+    with app.app_context():
+        db.create_all()
+        # Add dependencies for foreign key constraints
+        region = Region(name='Test Region')
+        db.session.add(region)
+        db.session.commit()
+        payment_type = PaymentType(name='Test Payment Type', region_id=region.id)
+        db.session.add(payment_type)
+        db.session.commit()
+        account_name = AccountName(name='Test Account Name', payment_type_id=payment_type.id)
+        db.session.add(account_name)
+        db.session.commit()
+        budget_item = BudgetItem(name='Test Budget Item', account_name_id=account_name.id)
+        db.session.add(budget_item)
+        db.session.commit()
+        company = Company(name='Test Company')
+        db.session.add(company)
+        db.session.commit()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+@pytest.fixture
+def client(app):
+    with app.test_client() as client:
+        yield client
+
+def test_per_page_is_capped(app, client):
+    app.config['MAX_PER_PAGE'] = 2
+    for day in (1, 2, 3):
+        db.session.add(Expense(description='Expense', amount=100, date=datetime.date(2025, 7, day), status='UNPAID',
+                               region_id=1, payment_type_id=1, account_name_id=1, budget_item_id=1))
+    db.session.commit()
+
+    body = client.get('/api/expenses?per_page=1000000').get_json()
+    assert len(body['data']) == 2
+    assert body['pagination']['total_pages'] == 2
+
+    assert client.get('/api/expenses?per_page=0').status_code == 400
+    assert client.get('/api/payments?per_page=abc').status_code == 400
+
+def test_receipts_are_limited_and_flagged(app, client):
+    app.config['MAX_LIST_ROWS'] = 1
+    income = Income(description='Income', total_amount=300, received_amount=0, status=IncomeStatus.UNRECEIVED,
+                    date=datetime.date(2025, 7, 1), region_id=1, account_name_id=1, budget_item_id=1, company_id=1)
+    db.session.add(income)
+    db.session.commit()
+    for day in (1, 2):
+        db.session.add(IncomeReceipt(income_id=income.id, receipt_amount=100, receipt_date=datetime.date(2025, 7, day)))
+    db.session.commit()
+
+    response = client.get('/api/receipts?limit=50')
+    assert response.status_code == 200
+    assert len(response.get_json()) == 1
+    assert response.headers['X-Result-Truncated'] == 'true'
+
+    # Başlık, farklı origin'den çalışan frontend'in okuyabilmesi için CORS'ta açılır
+    response = client.get('/api/receipts?limit=50', headers={'Origin': 'http://localhost:3000'})
+    exposed = {name.strip() for name in response.headers['Access-Control-Expose-Headers'].split(',')}
+    assert {'X-Result-Truncated', 'Retry-After'} <= exposed
+
+def test_full_report_slots_return_503_with_retry_after(app, client):
+    app.config['HEAVY_QUERY_WAIT_SECONDS'] = 0
+    limiter = app.extensions['heavy_query_limiter']
+    slots = app.config['HEAVY_QUERY_SLOTS']
+    for _ in range(slots):
+        assert limiter.acquire(0)
+    try:
+        response = client.get('/api/summary')
+        assert response.status_code == 503
+        assert response.headers['Retry-After'] == str(app.config['RETRY_AFTER_SECONDS'])
+    finally:
+        for _ in range(slots):
+            limiter.release()
+    assert client.get('/api/summary').status_code == 200
+
+def test_statement_timeout_interrupts_long_query(app):
+    endless = text("WITH RECURSIVE r(x) AS (SELECT 1 UNION ALL SELECT x + 1 FROM r) SELECT count(*) FROM r")
+    apply_timeout(0.05)
+    with pytest.raises(AppError) as error:
+        db.session.execute(endless)
+    assert error.value.status_code == 503
+    db.session.rollback()
+    apply_timeout(None)
+    assert db.session.execute(text("SELECT 1")).scalar() == 1
+
+def test_postgresql_timeout_reapplied_after_rollback(app):
+    uri = os.getenv('TEST_POSTGRES_URI')
+    if not uri:
+        pytest.skip("TEST_POSTGRES_URI is not set")
+    engine = create_engine(uri)
+    watch_engine(engine)
+    apply_timeout(5)
+    with engine.connect() as connection:
+        connection.execute(text("SELECT 1"))
+        # Rollback, transaction içinde yapılan SET'i de geri alır
+        connection.rollback()
+        assert connection.execute(text("SHOW statement_timeout")).scalar() == '5s'
+        connection.commit()
+        apply_timeout(None)
+        assert connection.execute(text("SHOW statement_timeout")).scalar() == '0'
+    engine.dispose()
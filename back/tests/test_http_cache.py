@@ -0,0 +1,95 @@
+import pytest
+from app import create_app, db
+from app.models import Region, PaymentType, AccountName, BudgetItem
+import datetime
+
+@pytest.fixture
+def client():
+    app = create_app('testing')
+    with app.test_client() as client:
+        with app.app_context():
+            db.create_all()
+            # Add dependencies for foreign key constraints
+            region = Region(name='Test Region')
+            db.session.add(region)
+            db.session.commit()
+            payment_type = PaymentType(name='Test Payment Type', region_id=region.id)
+            db.session.add(payment_type)
+            db.session.commit()
+            account_name = AccountName(name='Test Account Name', payment_type_id=payment_type.id)
+            db.session.add(account_name)
+            db.session.commit()
+            budget_item = BudgetItem(name='Test Budget Item', account_name_id=account_name.id)
+            db.session.add(budget_item)
+            db.session.commit()
+            yield client
+            db.session.remove()
+            db.drop_all()
+
+def _create_expense(client):
+    return client.post('/api/expenses/', json={
+        'description': 'Test Expense',
+        'amount': 100.00,
+        'date': datetime.date.today().isoformat(),
+        'region_id': 1,
+        'payment_type_id': 1,
+        'account_name_id': 1,
+        'budget_item_id': 1
+    }).json['id']
+
+def test_summary_not_modified(client):
+    print("\n--- Running test_summary_not_modified ---")
+    _create_expense(client)
+    response = client.get('/api/summary')
+    assert response.status_code == 200
+    etag = response.headers['ETag']
+    assert response.headers['Cache-Control'] == 'private, no-cache'
+    assert response.headers.get('Last-Modified')
+
+    response = client.get('/api/summary', headers={'If-None-Match': etag})
+    assert response.status_code == 304
+    assert response.data == b''
+
+    # Yeni bir gider eklendiğinde eski sürüm geçersiz olmalı
+    _create_expense(client)
+    response = client.get('/api/summary', headers={'If-None-Match': etag})
+    assert response.status_code == 200
+    assert response.headers['ETag'] != etag
+    print("test_summary_not_modified: PASSED")
+
+def test_etag_depends_on_query(client):
+    print("\n--- Running test_etag_depends_on_query ---")
+    first = client.get('/api/payments?page=1')
+    second = client.get('/api/payments?page=2', headers={'If-None-Match': first.headers['ETag']})
+    assert second.status_code == 200
+    print("test_etag_depends_on_query: PASSED")
+
+def test_delete_invalidates_etag(client):
+    print("\n--- Running test_delete_invalidates_etag ---")
+    expense_id = _create_expense(client)
+    etag = client.get('/api/expenses/').headers['ETag']
+    client.delete(f'/api/expenses/{expense_id}')
+    response = client.get('/api/expenses/', headers={'If-None-Match': etag})
+    assert response.status_code == 200
+    print("test_delete_invalidates_etag: PASSED")
+
+def test_reference_update_invalidates_etag(client):
+    print("\n--- Running test_reference_update_invalidates_etag ---")
+    company_id = client.post('/api/companies', json={'name': 'Eski Şirket'}).json['id']
+    etag = client.get('/api/companies').headers['ETag']
+    client.put(f'/api/companies/{company_id}', json={'name': 'Yeni Şirket'})
+    response = client.get('/api/companies', headers={'If-None-Match': etag})
+    assert response.status_code == 200
+    assert response.json[0]['name'] == 'Yeni Şirket'
+    print("test_reference_update_invalidates_etag: PASSED")
+
+def test_if_modified_since_alone_does_not_return_304(client):
+    print("\n--- Running test_if_modified_since_alone_does_not_return_304 ---")
+    _create_expense(client)
+    last_modified = client.get('/api/summary').headers['Last-Modified']
+    # Aynı saniye içinde yapılan yazım Last-Modified'ı değiştirmeyebilir
+    _create_expense(client)
+    response = client.get('/api/summary', headers={'If-Modified-Since': last_modified})
+    assert response.status_code == 200
+    assert response.json['total_expenses'] == 200.00
+    print("test_if_modified_since_alone_does_not_return_304: PASSED")
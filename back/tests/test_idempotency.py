@@ -0,0 +1,148 @@
+import pytest
+from sqlalchemy.exc import OperationalError
+from app import create_app, db
+from app.income import routes as income_routes
+from app.models import Region, PaymentType, AccountName, BudgetItem, Company, Expense, Payment, IncomeReceipt, IdempotencyKey
+from app.income.services import IncomeService
+from app.idempotency import purge_expired_keys
+import datetime
+
+@pytest.fixture
+def client():
+    app = create_app('testing')
+    with app.test_client() as client:
+        with app.app_context():
+            db.create_all()
+            # Add dependencies for foreign key constraints
+            region = Region(name='Test Region')
+            db.session.add(region)
+            db.session.commit()
+            payment_type = PaymentType(name='Test Payment Type', region_id=region.id)
+            db.session.add(payment_type)
+            db.session.commit()
+            account_name = AccountName(name='Test Account Name', payment_type_id=payment_type.id)
+            db.session.add(account_name)
+            db.session.commit()
+            budget_item = BudgetItem(name='Test Budget Item', account_name_id=account_name.id)
+            db.session.add(budget_item)
+            db.session.commit()
+            company = Company(name='Test Company')
+            db.session.add(company)
+            db.session.commit()
+            yield client
+            db.session.remove()
+            db.drop_all()
+
+def _create_income():
+    income = IncomeService().create({
+        'description': 'Test Income',
+        'total_amount': 100,
+        'date': datetime.date(2025, 7, 10),
+        'region_id': 1,
+        'account_name_id': 1,
+        'budget_item_id': 1,
+        'company_id': 1
+    })
+    return income.id
+
+def test_retried_receipt_is_not_duplicated(client):
+    print("\n--- Running test_retried_receipt_is_not_duplicated ---")
+    income_id = _create_income()
+    payload = {'income_id': income_id, 'receipt_amount': '30.00', 'receipt_date': '2025-07-12'}
+    headers = {'Idempotency-Key': 'retry-1'}
+
+    first = client.post(f'/api/incomes/{income_id}/receipts', json=payload, headers=headers)
+    second = client.post(f'/api/incomes/{income_id}/receipts', json=payload, headers=headers)
+    assert first.status_code == 201
+    assert second.status_code == 201
+    assert second.headers.get('Idempotent-Replayed') == 'true'
+    assert second.json == first.json
+    assert IncomeReceipt.query.count() == 1
+    print("test_retried_receipt_is_not_duplicated: PASSED")
+
+def test_retried_payment_is_not_duplicated(client):
+    print("\n--- Running test_retried_payment_is_not_duplicated ---")
+    expense_id = client.post('/api/expenses/', json={
+        'description': 'Test Expense', 'amount': 100.00, 'date': '2025-07-10',
+        'region_id': 1, 'payment_type_id': 1, 'account_name_id': 1, 'budget_item_id': 1
+    }).json['id']
+    payload = {'payment_amount': '40.00', 'payment_date': '2025-07-12'}
+    headers = {'Idempotency-Key': 'payment-1'}
+
+    first = client.post(f'/api/expenses/{expense_id}/payments', json=payload, headers=headers)
+    second = client.post(f'/api/expenses/{expense_id}/payments', json=payload, headers=headers)
+    assert first.status_code == 201
+    assert second.status_code == 201
+    assert second.headers.get('Idempotent-Replayed') == 'true'
+    assert Payment.query.count() == 1
+    assert float(db.session.get(Expense, expense_id).remaining_amount) == 60.00
+    assert IdempotencyKey.query.one().scope == f'POST /api/expenses/{expense_id}/payments'
+    print("test_retried_payment_is_not_duplicated: PASSED")
+
+def test_reused_key_with_different_body_is_rejected(client):
+    income_id = _create_income()
+    headers = {'Idempotency-Key': 'retry-2'}
+    client.post(f'/api/incomes/{income_id}/receipts',
+                json={'income_id': income_id, 'receipt_amount': '30.00', 'receipt_date': '2025-07-12'}, headers=headers)
+    response = client.post(f'/api/incomes/{income_id}/receipts',
+                           json={'income_id': income_id, 'receipt_amount': '50.00', 'receipt_date': '2025-07-12'}, headers=headers)
+    assert response.status_code == 422
+    assert IncomeReceipt.query.count() == 1
+
+def test_failed_request_does_not_store_key(client):
+    income_id = _create_income()
+    headers = {'Idempotency-Key': 'retry-3'}
+    response = client.post(f'/api/incomes/{income_id}/receipts',
+                           json={'income_id': income_id, 'receipt_amount': '-5', 'receipt_date': '2025-07-12'}, headers=headers)
+    assert response.status_code == 400
+    assert IdempotencyKey.query.count() == 0
+
+def test_crash_before_response_leaves_no_key(client, monkeypatch):
+    print("\n--- Running test_crash_before_response_leaves_no_key ---")
+    income_id = _create_income()
+    payload = {'income_id': income_id, 'receipt_amount': '30.00', 'receipt_date': '2025-07-12'}
+    headers = {'Idempotency-Key': 'retry-4'}
+
+    def crash(_):
+        raise RuntimeError("worker died")
+    monkeypatch.setattr(income_routes.receipt_schema, 'dump', crash)
+    response = client.post(f'/api/incomes/{income_id}/receipts', json=payload, headers=headers)
+    assert response.status_code == 500
+    # Anahtar, tahsilat ve yanıt birlikte geri alınır; tekrar 409 yerine yeniden işlenir
+    assert IdempotencyKey.query.count() == 0
+    assert IncomeReceipt.query.count() == 0
+
+    monkeypatch.undo()
+    assert client.post(f'/api/incomes/{income_id}/receipts', json=payload, headers=headers).status_code == 201
+    assert IncomeReceipt.query.count() == 1
+    print("test_crash_before_response_leaves_no_key: PASSED")
+
+def test_retried_transaction_keeps_key(client, monkeypatch):
+    print("\n--- Running test_retried_transaction_keeps_key ---")
+    income_id = _create_income()
+    payload = {'income_id': income_id, 'receipt_amount': '30.00', 'receipt_date': '2025-07-12'}
+    headers = {'Idempotency-Key': 'retry-5'}
+    create = income_routes.receipt_service.create
+    attempts = []
+
+    def locked_once(*args, **kwargs):
+        receipt = create(*args, **kwargs)
+        attempts.append(receipt)
+        if len(attempts) == 1:
+            raise OperationalError("INSERT", {}, Exception("database is locked"))
+        return receipt
+    monkeypatch.setattr(income_routes.receipt_service, 'create', locked_once)
+
+    response = client.post(f'/api/incomes/{income_id}/receipts', json=payload, headers=headers)
+    assert response.status_code == 201
+    assert len(attempts) == 2
+    assert IncomeReceipt.query.count() == 1
+    assert IdempotencyKey.query.one().status_code == 201
+    print("test_retried_transaction_keeps_key: PASSED")
+
+def test_purge_expired_keys(client):
+    income_id = _create_income()
+    client.post(f'/api/incomes/{income_id}/receipts',
+                json={'income_id': income_id, 'receipt_amount': '30.00', 'receipt_date': '2025-07-12'}, headers={'Idempotency-Key': 'k'})
+    assert purge_expired_keys() == 0
+    assert purge_expired_keys(datetime.datetime.utcnow() + datetime.timedelta(days=2)) == 1
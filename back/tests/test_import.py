@@ -0,0 +1,99 @@
+import io
+import pytest
+from app import create_app, db
+from app.models import Expense, Income, Region, PaymentType, AccountName, BudgetItem, Company
+
+@pytest.fixture
+def client():
+    app = create_app('testing')
+    with app.test_client() as client:
+        with app.app_context():
+            db.create_all()
+            # Add dependencies for foreign key constraints
+            region = Region(name='Test Region')
+            db.session.add(region)
+            db.session.commit()
+            payment_type = PaymentType(name='Test Payment Type', region_id=region.id)
+            db.session.add(payment_type)
+            db.session.commit()
+            account_name = AccountName(name='Test Account Name', payment_type_id=payment_type.id)
+            db.session.add(account_name)
+            db.session.commit()
+            budget_item = BudgetItem(name='Test Budget Item', account_name_id=account_name.id)
+            db.session.add(budget_item)
+            db.session.commit()
+            company = Company(name='Test Company')
+            db.session.add(company)
+            db.session.commit()
+            yield client
+            db.session.remove()
+            db.drop_all()
+
+def _upload(client, url, content):
+    return client.post(url, data={'file': (io.BytesIO(content.encode('utf-8')), 'import.csv')},
+                       content_type='multipart/form-data')
+
+def test_import_expenses(client):
+    print("\n--- Running test_import_expenses ---")
+    content = (
+        "date,amount,description,region,payment_type,account_name,budget_item\n"
+        "2025-07-01,100.00,Kira,Test Region,Test Payment Type,Test Account Name,Test Budget Item\n"
+        "01.07.2025,\"1.250,50\",Elektrik,test region,Test Payment Type,Test Account Name,Test Budget Item\n"
+        "2025-13-01,50,Hatalı,Unknown Region,Test Payment Type,Test Account Name,Test Budget Item\n"
+    )
+    response = _upload(client, '/api/imports/expenses', content)
+    assert response.status_code == 200
+    assert response.json['total_rows'] == 3
+    assert response.json['inserted'] == 2
+    assert response.json['failed'] == 1
+    assert response.json['errors'][0]['row'] == 4
+    assert set(response.json['errors'][0]['errors']) == {'date', 'region'}
+    assert Expense.query.count() == 2
+    assert Expense.query.filter_by(description='Elektrik').one().remaining_amount == 1250.50
+    print("test_import_expenses: PASSED")
+
+def test_import_expenses_dry_run(client):
+    print("\n--- Running test_import_expenses_dry_run ---")
+    content = (
+        "date,amount,region_id,payment_type_id,account_name_id,budget_item_id\n"
+        "2025-07-01,100.00,1,1,1,1\n"
+    )
+    response = _upload(client, '/api/imports/expenses?dry_run=true', content)
+    assert response.status_code == 200
+    assert response.json['valid'] == 1
+    assert response.json['inserted'] == 0
+    assert Expense.query.count() == 0
+    print("test_import_expenses_dry_run: PASSED")
+
+def test_import_rejects_ambiguous_and_oversized_amounts(client):
+    print("\n--- Running test_import_rejects_ambiguous_and_oversized_amounts ---")
+    content = "date,amount,region_id,payment_type_id,account_name_id,budget_item_id\n" + "".join(
+        f"2025-07-01,\"{amount}\",1,1,1,1\n"
+        for amount in ('1,234.56', '1.234', 'NaN', 'Infinity', '100000000', '99999999.99')
+    )
+    response = _upload(client, '/api/imports/expenses', content)
+    assert response.status_code == 200
+    assert response.json['inserted'] == 2
+    assert [error['row'] for error in response.json['errors']] == [3, 4, 5, 6]
+    assert sorted(float(expense.amount) for expense in Expense.query) == [1234.56, 99999999.99]
+    print("test_import_rejects_ambiguous_and_oversized_amounts: PASSED")
+
+def test_import_missing_columns(client):
+    print("\n--- Running test_import_missing_columns ---")
+    response = _upload(client, '/api/imports/expenses', "date,amount\n2025-07-01,100\n")
+    assert response.status_code == 400
+    print("test_import_missing_columns: PASSED")
+
+def test_import_incomes(client):
+    print("\n--- Running test_import_incomes ---")
+    content = (
+        "date;total_amount;description;region;account_name;budget_item;company\n"
+        "2025-07-01;1000;Danışmanlık;Test Region;Test Account Name;Test Budget Item;Test Company\n"
+    )
+    response = client.post('/api/imports/incomes',
+                           data={'file': (io.BytesIO(content.encode('utf-8')), 'incomes.csv'), 'delimiter': ';'},
+                           content_type='multipart/form-data')
+    assert response.status_code == 200
+    assert response.json['inserted'] == 1
+    assert Income.query.one().status.name == 'UNRECEIVED'
+    print("test_import_incomes: PASSED")
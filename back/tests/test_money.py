@@ -0,0 +1,87 @@
+import pytest
+from decimal import Decimal
+from app import create_app, db
+from app.models import Region, PaymentType, AccountName, BudgetItem, Company, Expense, Income, IncomeStatus
+from app.money import to_minor, from_minor, to_api, scaled
+from app.payments.services import PaymentService
+from app.reports.services import ReportService
+from app.summary.services import _compute_summary
+import datetime
+
+@pytest.fixture
+def app():
+    app = create_app('testing')
+    with app.app_context():
+        db.create_all()
+        # Add dependencies for foreign key constraints
+        region = Region(name='Test Region')
+        db.session.add(region)
+        db.session.commit()
+        payment_type = PaymentType(name='Test Payment Type', region_id=region.id)
+        db.session.add(payment_type)
+        db.session.commit()
+        account_name = AccountName(name='Test Account Name', payment_type_id=payment_type.id)
+        db.session.add(account_name)
+        db.session.commit()
+        budget_item = BudgetItem(name='Test Budget Item', account_name_id=account_name.id)
+        db.session.add(budget_item)
+        db.session.commit()
+        company = Company(name='Test Company')
+        db.session.add(company)
+        db.session.commit()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+def _expense(amount, day=1):
+    expense = Expense(description='Expense', amount=Decimal(amount), date=datetime.date(2025, 7, day),
+                      status='UNPAID', region_id=1, payment_type_id=1, account_name_id=1, budget_item_id=1)
+    db.session.add(expense)
+    db.session.commit()
+    return expense
+
+def test_minor_unit_conversions_round_trip():
+    assert to_minor(Decimal('12.345')) == 1235
+    assert to_minor(0.1) == 10
+    assert to_minor(7) == 700
+    assert from_minor(-1999) == Decimal('-19.99')
+    assert to_api(to_minor(Decimal('1234567.89'))) == 1234567.89
+    assert scaled(1001, Decimal('0.5')) == 501
+
+def test_summary_totals_do_not_drift(app):
+    for amount in ('0.10', '0.20', '0.10', '0.20', '0.10', '0.20'):
+        _expense(amount)
+    summary = _compute_summary(datetime.date(2025, 7, 1), datetime.date(2025, 7, 31))
+    assert summary['total_expenses'] == 0.9
+    assert summary['total_expense_remaining'] == 0.9
+
+def test_status_recalculation_uses_exact_cents(app):
+    expense = _expense('0.30')
+    service = PaymentService()
+    service.create(expense.id, {'payment_amount': Decimal('0.10'), 'payment_date': datetime.date(2025, 7, 2)})
+    service.create(expense.id, {'payment_amount': Decimal('0.20'), 'payment_date': datetime.date(2025, 7, 3)})
+    expense = db.session.get(Expense, expense.id)
+    assert expense.status == 'PAID'
+    assert expense.remaining_amount == 0
+
+def test_aging_and_forecast_sum_in_cents(app):
+    for day in (1, 2, 3):
+        _expense('0.10', day)
+    db.session.add(Income(description='Income', total_amount=Decimal('0.30'), received_amount=Decimal('0.10'),
+                          status=IncomeStatus.PARTIALLY_RECEIVED, date=datetime.date(2025, 7, 2),
+                          region_id=1, account_name_id=1, budget_item_id=1, company_id=1))
+    db.session.commit()
+
+    aging = ReportService().aging(as_of=datetime.date(2025, 7, 10))
+    assert aging['expenses']['buckets']['0_30'] == 0.3
+    assert aging['expenses']['total'] == 0.3
+    assert aging['incomes']['total'] == 0.2
+
+    forecast = ReportService().forecast({
+        'start_date': datetime.date(2025, 7, 1), 'horizon_days': 7, 'granularity': 'daily',
+        'include_overdue': True, 'opening_balance': Decimal('1.00'),
+        'overrides': {'exclude_expense_ids': [], 'exclude_income_ids': [], 'expense_delay_days': 0,
+                      'income_delay_days': 0, 'expense_scale': Decimal('1'), 'income_scale': Decimal('0.5'),
+                      'adjustments': []},
+    })
+    assert forecast['totals'] == {'inflow': 0.1, 'outflow': 0.3, 'net': -0.2, 'closing_balance': 0.8}
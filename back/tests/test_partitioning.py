@@ -0,0 +1,130 @@
+import os
+import pytest
+from datetime import date
+from sqlalchemy import create_engine, text
+from app import create_app, db
+from app.maintenance.partitioning import PartitionManager, period_bounds, partition_name
+
+@pytest.fixture
+def app():
+    app = create_app('testing')
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+def test_period_bounds():
+    assert list(period_bounds(date(2024, 6, 15), date(2025, 2, 1), 'year')) == [
+        (date(2024, 1, 1), date(2025, 1, 1)), (date(2025, 1, 1), date(2026, 1, 1))
+    ]
+    assert list(period_bounds(date(2024, 11, 3), date(2025, 1, 1), 'month')) == [
+        (date(2024, 11, 1), date(2024, 12, 1)), (date(2024, 12, 1), date(2025, 1, 1)),
+        (date(2025, 1, 1), date(2025, 2, 1))
+    ]
+    assert partition_name('payment', date(2025, 3, 1), 'month') == 'payment_p2025_03'
+
+def test_partitioning_is_noop_on_sqlite(app):
+    with db.engine.begin() as connection:
+        manager = PartitionManager(connection, 'month')
+        assert manager.supported is False
+        assert manager.enable(until=date(2026, 1, 1)) == []
+        assert manager.create_future_partitions(until=date(2026, 1, 1)) == 0
+
+def test_create_partitions_command_on_sqlite(app):
+    result = app.test_cli_runner().invoke(args=['create-partitions', '--granularity', 'year', '--enable'])
+    assert result.exit_code == 0
+    assert 'not supported' in result.output
+
+@pytest.fixture
+def pg_connection():
+    uri = os.getenv('TEST_POSTGRES_URI')
+    if not uri:
+        pytest.skip("TEST_POSTGRES_URI is not set")
+    engine = create_engine(uri)
+    with engine.begin() as connection:
+        connection.execute(text("DROP SCHEMA public CASCADE"))
+        connection.execute(text("CREATE SCHEMA public"))
+        db.metadata.create_all(connection)
+        connection.execute(text(
+            "INSERT INTO region (id, name) VALUES (1, 'R');"
+            "INSERT INTO payment_type (id, name, region_id) VALUES (1, 'P', 1);"
+            "INSERT INTO account_name (id, name, payment_type_id) VALUES (1, 'A', 1);"
+            "INSERT INTO budget_item (id, name, account_name_id) VALUES (1, 'B', 1);"
+            "INSERT INTO expense (region_id, payment_type_id, account_name_id, budget_item_id, description, "
+            "date, amount, remaining_amount, status) VALUES (1, 1, 1, 1, 'E', '2024-03-01', 100, 60, 2);"
+            "INSERT INTO payment (expense_id, payment_amount, payment_date) VALUES (1, 40, '2024-03-05');"
+            "CREATE INDEX ix_payment_described ON payment (payment_date) INCLUDE (payment_amount) "
+            "WHERE description IS NOT NULL"
+        ))
+    with engine.begin() as connection:
+        yield connection
+    engine.dispose()
+
+def _constraints(connection, table):
+    return dict(connection.execute(text(
+        "SELECT conname, pg_get_constraintdef(oid) FROM pg_constraint WHERE conrelid = CAST(:table AS regclass)"
+    ), {'table': table}).all())
+
+def test_postgresql_partitioning_keeps_integrity(pg_connection):
+    manager = PartitionManager(pg_connection, 'year')
+    converted = manager.enable(until=date(2025, 6, 1))
+    assert 'payment' in converted and 'income_receipt' in converted
+    # Yabancı anahtarların işaret ettiği tablolar bölümlenmez
+    assert set(manager.skipped) == {'expense', 'income'}
+    assert 'payment.' in manager.skipped['expense']
+
+    assert manager.is_partitioned('payment')
+    constraints = _constraints(pg_connection, 'payment')
+    assert constraints['payment_pkey'] == 'PRIMARY KEY (id, payment_date)'
+    assert any(definition.startswith('FOREIGN KEY (expense_id) REFERENCES expense(id)')
+               for definition in constraints.values())
+    indexdef = pg_connection.execute(text(
+        "SELECT indexdef FROM pg_indexes WHERE indexname = 'ix_payment_described'"
+    )).scalar()
+    assert 'INCLUDE (payment_amount)' in indexdef and 'WHERE (description IS NOT NULL)' in indexdef
+
+    # Veri korunur, yeni satırlar sıradan id alır ve doğru bölüme düşer
+    pg_connection.execute(text(
+        "INSERT INTO payment (expense_id, payment_amount, payment_date) VALUES (1, 10, '2025-02-01')"
+    ))
+    rows = pg_connection.execute(text(
+        "SELECT id, tableoid::regclass::text FROM payment ORDER BY id"
+    )).all()
+    assert rows == [(1, 'payment_p2024'), (2, 'payment_p2025')]
+    with pytest.raises(Exception):
+        with pg_connection.begin_nested():
+            pg_connection.execute(text(
+                "INSERT INTO payment (expense_id, payment_amount, payment_date) VALUES (99, 1, '2025-02-01')"
+            ))
+    assert manager.create_future_partitions(until=date(date.today().year + 1, 1, 1)) > 0
+
+def test_postgresql_moves_default_rows_into_new_partitions(pg_connection):
+    manager = PartitionManager(pg_connection, 'year')
+    manager.enable(until=date(2025, 6, 1))
+    # Bölümü henüz olmayan tarihler varsayılan bölüme düşer
+    year = date.today().year + 2
+    pg_connection.execute(text(
+        f"INSERT INTO payment (expense_id, payment_amount, payment_date) VALUES (1, 10, '{year}-03-01')"
+    ))
+    assert pg_connection.execute(text("SELECT COUNT(*) FROM payment_default")).scalar() == 1
+
+    assert manager.create_future_partitions(until=date(year, 12, 31)) > 0
+    rows = pg_connection.execute(text(
+        "SELECT payment_date, tableoid::regclass::text FROM payment ORDER BY id"
+    )).all()
+    assert rows[-1] == (date(year, 3, 1), f'payment_p{year}')
+    assert pg_connection.execute(text("SELECT COUNT(*) FROM payment_default")).scalar() == 0
+
+    # Varsayılan bölüm yeniden bağlanmıştır
+    pg_connection.execute(text(
+        f"INSERT INTO payment (expense_id, payment_amount, payment_date) VALUES (1, 5, '{year + 5}-01-01')"
+    ))
+    assert pg_connection.execute(text("SELECT COUNT(*) FROM payment_default")).scalar() == 1
+
+def test_postgresql_skips_unsafe_tables(pg_connection):
+    pg_connection.execute(text("ALTER TABLE income_receipt ADD CONSTRAINT uq_receipt_notes UNIQUE (notes)"))
+    manager = PartitionManager(pg_connection, 'year')
+    assert manager.enable(until=date(2025, 6, 1)) == ['payment']
+    assert 'uq_receipt_notes' in manager.skipped['income_receipt']
+    assert not manager.is_partitioned('income_receipt')
@@ -0,0 +1,57 @@
+import pytest
+import config
+from app import create_app, db
+from app.models import Company
+from app.replicas import STICKY_COOKIE
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    # Birincil ve okuma kopyası olarak iki ayrı SQLite veritabanı kullanılır
+    monkeypatch.setattr(config.Dotenv, 'SQLALCHEMY_DATABASE_URI', f"sqlite:///{tmp_path / 'primary.db'}")
+    monkeypatch.setattr(config.Dotenv, 'SQLALCHEMY_REPLICA_URIS', [f"sqlite:///{tmp_path / 'replica.db'}"])
+    app = create_app('testing')
+    with app.test_client() as client:
+        with app.app_context():
+            db.create_all()
+            db.metadata.create_all(client.application.extensions['db_replicas'][0])
+            yield client
+            db.session.remove()
+            db.drop_all()
+
+def _replica_company(client, name):
+    with client.application.extensions['db_replicas'][0].begin() as connection:
+        connection.execute(Company.__table__.insert().values(name=name))
+
+def _names(response):
+    return sorted(company['name'] for company in response.json)
+
+def test_get_reads_from_replica(client):
+    _replica_company(client, 'Replica Company')
+    response = client.get('/api/companies')
+    assert response.status_code == 200
+    assert _names(response) == ['Replica Company']
+
+def test_write_goes_to_primary_and_sticks_for_client(client):
+    response = client.post('/api/companies', json={'name': 'Primary Company'})
+    assert response.status_code == 201
+    assert STICKY_COOKIE in response.headers.get('Set-Cookie', '')
+    assert db.session.query(Company.name).scalar() == 'Primary Company'
+
+    # Kendi yazımından sonra istemci birincil veritabanını okur
+    assert _names(client.get('/api/companies')) == ['Primary Company']
+
+    # Süre dolunca okumalar yeniden kopyaya gider
+    client.delete_cookie(STICKY_COOKIE)
+    assert _names(client.get('/api/companies')) == []
+
+def test_failed_write_does_not_stick(client):
+    response = client.post('/api/companies', json={})
+    assert response.status_code >= 400
+    assert STICKY_COOKIE not in response.headers.get('Set-Cookie', '')
+
+def test_sticky_cookie_allowed_cross_origin(client):
+    # Frontend farklı bir origin'den çalıştığı için çerez yalnızca kimlik bilgili CORS ile gönderilir
+    response = client.post('/api/companies', json={'name': 'Primary Company'},
+                           headers={'Origin': 'http://localhost:3000'})
+    assert response.headers['Access-Control-Allow-Origin'] == 'http://localhost:3000'
+    assert response.headers['Access-Control-Allow-Credentials'] == 'true'
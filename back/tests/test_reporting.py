@@ -0,0 +1,68 @@
+import pytest
+from app import create_app, db
+from app import reporting
+from app.models import Region, PaymentType, AccountName, BudgetItem, Expense
+from app.reporting import reporting_session, read_only_session, ReadOnlySessionError
+import datetime
+
+@pytest.fixture
+def client():
+    app = create_app('testing')
+    with app.test_client() as client:
+        with app.app_context():
+            db.create_all()
+            # Add dependencies for foreign key constraints
+            region = Region(name='Test Region')
+            db.session.add(region)
+            db.session.commit()
+            payment_type = PaymentType(name='Test Payment Type', region_id=region.id)
+            db.session.add(payment_type)
+            db.session.commit()
+            account_name = AccountName(name='Test Account Name', payment_type_id=payment_type.id)
+            db.session.add(account_name)
+            db.session.commit()
+            budget_item = BudgetItem(name='Test Budget Item', account_name_id=account_name.id)
+            db.session.add(budget_item)
+            db.session.commit()
+            yield client
+            db.session.remove()
+            db.drop_all()
+
+def _expense(day, amount=100):
+    expense = Expense(description=f'Expense {day}', amount=amount, date=day, region_id=1,
+                      payment_type_id=1, account_name_id=1, budget_item_id=1)
+    db.session.add(expense)
+    db.session.commit()
+    return expense.id
+
+def test_reporting_session_falls_back_without_snapshot_support(client):
+    with reporting_session() as session:
+        assert session is db.session
+
+def test_summary_and_pivot_use_snapshot_session(client, monkeypatch):
+    # SQLite'ta anlık görüntü yok; ayrı bağlantı üzerinden çalışan yolu denemek için boş seçenekle açılır
+    monkeypatch.setitem(reporting.SNAPSHOT_OPTIONS, 'sqlite', {})
+    client.application.config['RESULT_CACHE_BACKEND'] = None
+    client.application.extensions['result_cache'] = None
+    _expense(datetime.date(2024, 3, 5), 150)
+
+    with reporting_session() as session:
+        assert session is not db.session
+
+    response = client.get('/api/summary?start_date=2024-03-01&end_date=2024-03-31')
+    assert response.status_code == 200
+    assert response.get_json()['total_expenses'] == 150.0
+
+    response = client.get('/api/expenses/pivot?month=2024-03')
+    assert response.status_code == 200
+    assert [row['amount'] for row in response.get_json()] == [150.0]
+
+def test_reporting_session_rejects_writes(client):
+    with db.engine.connect() as connection:
+        session = read_only_session(connection)
+        session.add(Region(name='Not Allowed'))
+        with pytest.raises(ReadOnlySessionError):
+            session.flush()
+        session.close()
+        connection.rollback()
+    assert Region.query.filter_by(name='Not Allowed').count() == 0
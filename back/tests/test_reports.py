@@ -0,0 +1,142 @@
+import pytest
+from app import create_app, db
+from app.models import Expense, Income, Region, PaymentType, AccountName, BudgetItem, Company
+import datetime
+
+@pytest.fixture
+def client():
+    app = create_app('testing')
+    with app.test_client() as client:
+        with app.app_context():
+            db.create_all()
+            # Add dependencies for foreign key constraints
+            region = Region(name='Test Region')
+            db.session.add(region)
+            db.session.commit()
+            payment_type = PaymentType(name='Test Payment Type', region_id=region.id)
+            db.session.add(payment_type)
+            db.session.commit()
+            account_name = AccountName(name='Test Account Name', payment_type_id=payment_type.id)
+            db.session.add(account_name)
+            db.session.commit()
+            budget_item = BudgetItem(name='Test Budget Item', account_name_id=account_name.id)
+            db.session.add(budget_item)
+            db.session.commit()
+            company = Company(name='Test Company')
+            db.session.add(company)
+            db.session.commit()
+            yield client
+            db.session.remove()
+            db.drop_all()
+
+def _create_expense(client, amount, days_ago):
+    response = client.post('/api/expenses/', json={
+        'description': 'Test Expense',
+        'amount': amount,
+        'date': (datetime.date(2025, 7, 1) - datetime.timedelta(days=days_ago)).isoformat(),
+        'region_id': 1,
+        'payment_type_id': 1,
+        'account_name_id': 1,
+        'budget_item_id': 1
+    })
+    return response.json['id']
+
+def test_aging_report(client):
+    print("\n--- Running test_aging_report ---")
+    _create_expense(client, 100.00, 10)
+    partially_paid_id = _create_expense(client, 200.00, 45)
+    _create_expense(client, 300.00, 120)
+    client.post(f'/api/expenses/{partially_paid_id}/payments', json={
+        'payment_amount': 50.00,
+        'payment_date': '2025-07-01'
+    })
+    client.post('/api/incomes', json={
+        'description': 'Test Income',
+        'total_amount': 1000.00,
+        'date': '2025-05-15',
+        'region_id': 1,
+        'account_name_id': 1,
+        'budget_item_id': 1,
+        'company_id': 1
+    })
+
+    response = client.get('/api/reports/aging?as_of=2025-07-01')
+    assert response.status_code == 200
+    expenses = response.json['expenses']
+    assert expenses['buckets']['0_30'] == 100.00
+    assert expenses['buckets']['31_60'] == 150.00
+    assert expenses['buckets']['90_plus'] == 300.00
+    assert expenses['total'] == 550.00
+    assert response.json['incomes']['buckets']['31_60'] == 1000.00
+    print("test_aging_report: PASSED")
+
+def test_aging_report_by_company(client):
+    print("\n--- Running test_aging_report_by_company ---")
+    client.post('/api/incomes', json={
+        'description': 'Test Income',
+        'total_amount': 1000.00,
+        'date': '2025-06-20',
+        'region_id': 1,
+        'account_name_id': 1,
+        'budget_item_id': 1,
+        'company_id': 1
+    })
+    response = client.get('/api/reports/aging?as_of=2025-07-01&group_by=company')
+    assert response.status_code == 200
+    groups = response.json['incomes']['groups']
+    assert groups[0]['name'] == 'Test Company'
+    assert groups[0]['buckets']['0_30'] == 1000.00
+    print("test_aging_report_by_company: PASSED")
+
+def test_aging_report_invalid_group(client):
+    response = client.get('/api/reports/aging?group_by=budget_item')
+    assert response.status_code == 400
+
+def test_cash_flow_forecast(client):
+    print("\n--- Running test_cash_flow_forecast ---")
+    _create_expense(client, 100.00, -2)
+    _create_expense(client, 300.00, 5)
+    client.post('/api/incomes', json={
+        'description': 'Test Income',
+        'total_amount': 1000.00,
+        'date': '2025-07-05',
+        'region_id': 1,
+        'account_name_id': 1,
+        'budget_item_id': 1,
+        'company_id': 1
+    })
+    response = client.post('/api/reports/forecast', json={
+        'start_date': '2025-07-01',
+        'horizon_days': 14,
+        'opening_balance': 500,
+        'overrides': {
+            'adjustments': [{'date': '2025-07-10', 'amount': 50, 'type': 'expense'}]
+        }
+    })
+    assert response.status_code == 200
+    series = response.json['series']
+    assert len(series) == 14
+    # Vadesi geçmiş gider ilk güne yazılır
+    assert series[0]['outflow'] == 300.00
+    assert series[0]['balance'] == 200.00
+    assert series[2]['balance'] == 100.00
+    assert series[4]['balance'] == 1100.00
+    assert response.json['totals']['closing_balance'] == 1050.00
+    assert response.json['min_balance'] == {'date': '2025-07-03', 'balance': 100.00}
+    print("test_cash_flow_forecast: PASSED")
+
+def test_cash_flow_forecast_weekly_what_if(client):
+    print("\n--- Running test_cash_flow_forecast_weekly_what_if ---")
+    _create_expense(client, 100.00, -2)
+    response = client.post('/api/reports/forecast', json={
+        'start_date': '2025-07-01',
+        'horizon_days': 14,
+        'granularity': 'weekly',
+        'overrides': {'expense_scale': 2, 'expense_delay_days': 7}
+    })
+    assert response.status_code == 200
+    series = response.json['series']
+    assert len(series) == 2
+    assert series[0]['outflow'] == 0
+    assert series[1]['outflow'] == 200.00
+    print("test_cash_flow_forecast_weekly_what_if: PASSED")
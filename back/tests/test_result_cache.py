@@ -0,0 +1,87 @@
+import pytest
+from app import create_app, db
+from app.models import Region, PaymentType, AccountName, BudgetItem
+from app.result_cache import MemoryCacheBackend, SQLiteCacheBackend, month_buckets
+from app.payments.services import PaymentService
+import datetime
+
+@pytest.fixture
+def client():
+    app = create_app('testing')
+    with app.test_client() as client:
+        with app.app_context():
+            db.create_all()
+            # Add dependencies for foreign key constraints
+            region = Region(name='Test Region')
+            db.session.add(region)
+            db.session.commit()
+            payment_type = PaymentType(name='Test Payment Type', region_id=region.id)
+            db.session.add(payment_type)
+            db.session.commit()
+            account_name = AccountName(name='Test Account Name', payment_type_id=payment_type.id)
+            db.session.add(account_name)
+            db.session.commit()
+            budget_item = BudgetItem(name='Test Budget Item', account_name_id=account_name.id)
+            db.session.add(budget_item)
+            db.session.commit()
+            yield client
+            db.session.remove()
+            db.drop_all()
+
+def _create_expense(client, date):
+    return client.post('/api/expenses/', json={
+        'description': 'Test Expense',
+        'amount': 100.00,
+        'date': date,
+        'region_id': 1,
+        'payment_type_id': 1,
+        'account_name_id': 1,
+        'budget_item_id': 1
+    }).json['id']
+
+def test_month_buckets():
+    assert month_buckets('summary', datetime.date(2024, 11, 15), datetime.date(2025, 2, 1)) == [
+        'summary:2024-11', 'summary:2024-12', 'summary:2025-01', 'summary:2025-02'
+    ]
+
+@pytest.mark.parametrize('make_backend', [
+    lambda tmp_path: MemoryCacheBackend(max_entries=2, ttl=60),
+    lambda tmp_path: SQLiteCacheBackend(str(tmp_path / 'cache.sqlite3'), max_entries=2, ttl=60),
+])
+def test_backend_bucket_invalidation(tmp_path, make_backend):
+    backend = make_backend(tmp_path)
+    backend.set('expense_pivot|jan', [1], ['expense_pivot:2025-01'])
+    backend.set('summary|q1', {'a': 1}, ['summary:2025-01', 'summary:2025-03'])
+    backend.invalidate(['summary:2025-03'])
+    assert backend.get('expense_pivot|jan') == [1]
+    assert backend.get('summary|q1') is None
+
+    backend.set('a', 1, [])
+    backend.set('b', 2, [])
+    # LRU sınırı aşıldığında en eski kayıt düşer
+    assert backend.get('expense_pivot|jan') is None
+
+def test_payment_only_evicts_its_month(client):
+    print("\n--- Running test_payment_only_evicts_its_month ---")
+    january_id = _create_expense(client, '2025-01-10')
+    assert len(client.get('/api/expenses/pivot?month=2025-01').json) == 1
+    january_summary = client.get('/api/summary?start_date=2025-01-01&end_date=2025-01-31').json
+    march_summary = client.get('/api/summary?start_date=2025-03-01&end_date=2025-03-31').json
+    assert march_summary['total_payments'] == 0
+
+    backend = client.application.extensions['result_cache']
+    PaymentService().create(january_id, {'payment_amount': 40, 'payment_date': datetime.date(2025, 3, 5)})
+
+    assert backend.get('expense_pivot|{"currency": "TRY", "month": 1, "year": 2025}') is not None
+    assert backend.get('summary|{"currency": "TRY", "end_date": "2025-01-31", "start_date": "2025-01-01"}') == january_summary
+    march_summary = client.get('/api/summary?start_date=2025-03-01&end_date=2025-03-31').json
+    assert march_summary['total_payments'] == 40.00
+    print("test_payment_only_evicts_its_month: PASSED")
+
+def test_expense_change_evicts_pivot(client):
+    print("\n--- Running test_expense_change_evicts_pivot ---")
+    _create_expense(client, '2025-01-10')
+    assert len(client.get('/api/expenses/pivot?month=2025-01').json) == 1
+    _create_expense(client, '2025-01-20')
+    assert len(client.get('/api/expenses/pivot?month=2025-01').json) == 2
+    print("test_expense_change_evicts_pivot: PASSED")
@@ -0,0 +1,77 @@
+import pytest
+from sqlalchemy import event, text
+from app import create_app, db
+from app.models import Region, PaymentType, AccountName, BudgetItem, Company, Expense, Income, IncomeStatus
+from app.reports.services import ReportService
+import datetime
+
+@pytest.fixture
+def client():
+    app = create_app('testing')
+    with app.test_client() as client:
+        with app.app_context():
+            db.create_all()
+            # Add dependencies for foreign key constraints
+            region = Region(name='Test Region')
+            db.session.add(region)
+            db.session.commit()
+            payment_type = PaymentType(name='Test Payment Type', region_id=region.id)
+            db.session.add(payment_type)
+            db.session.commit()
+            account_name = AccountName(name='Test Account Name', payment_type_id=payment_type.id)
+            db.session.add(account_name)
+            db.session.commit()
+            budget_item = BudgetItem(name='Test Budget Item', account_name_id=account_name.id)
+            db.session.add(budget_item)
+            db.session.commit()
+            company = Company(name='Test Company')
+            db.session.add(company)
+            db.session.commit()
+            yield client
+            db.session.remove()
+            db.drop_all()
+
+def _expense(status, day=1):
+    db.session.add(Expense(description='Expense', amount=100, date=datetime.date(2025, 7, day), status=status,
+                           region_id=1, payment_type_id=1, account_name_id=1, budget_item_id=1))
+    db.session.commit()
+
+def _statements():
+    statements = []
+    event.listen(db.engine, 'before_cursor_execute',
+                 lambda conn, cursor, statement, *args: statements.append(statement))
+    return statements
+
+def test_statuses_are_stored_as_codes_and_served_as_names(client):
+    _expense('PARTIALLY_PAID')
+    db.session.add(Income(description='Income', total_amount=100, received_amount=0,
+                          status=IncomeStatus.PARTIALLY_RECEIVED, date=datetime.date(2025, 7, 1),
+                          region_id=1, account_name_id=1, budget_item_id=1, company_id=1))
+    db.session.commit()
+
+    assert db.session.execute(text("SELECT status FROM expense")).scalar() == 2
+    assert db.session.execute(text("SELECT status FROM income")).scalar() == 2
+    assert db.session.query(Expense).one().status == 'PARTIALLY_PAID'
+    assert client.get('/api/expenses').get_json()['data'][0]['status'] == 'PARTIALLY_PAID'
+    assert client.get('/api/incomes').get_json()['data'][0]['status'] == 'PARTIALLY_RECEIVED'
+
+def test_open_item_queries_inline_codes_for_filtered_index(client):
+    _expense('UNPAID', 1)
+    _expense('PAID', 2)
+    _expense('PARTIALLY_PAID', 3)
+    statements = _statements()
+
+    response = client.get('/api/expenses?status=unpaid,partially_paid&sort_by=date&sort_order=asc')
+    assert [item['status'] for item in response.get_json()['data']] == ['UNPAID', 'PARTIALLY_PAID']
+    assert any('IN (0, 2)' in statement for statement in statements)
+
+    statements.clear()
+    report = ReportService().expense_aging(datetime.date(2025, 7, 31))
+    assert report['total'] == 200.0
+    assert any('IN (0, 2)' in statement for statement in statements)
+
+    index = db.session.execute(text("SELECT sql FROM sqlite_master WHERE name = 'ix_expense_open_date'")).scalar()
+    assert index.endswith('WHERE status IN (0, 2)')
+
+def test_unknown_status_filter_is_rejected(client):
+    assert client.get('/api/expenses?status=sideways').status_code == 400
@@ -0,0 +1,151 @@
+import os
+import pytest
+from sqlalchemy import text, update
+import config
+from app import create_app, db
+from app.models import Region, PaymentType, AccountName, BudgetItem, Company, Payment, IncomeReceipt
+from app.payments.services import PaymentService
+from app.income.services import IncomeService, IncomeReceiptService
+import datetime
+
+@pytest.fixture
+def client():
+    app = create_app('testing')
+    with app.test_client() as client:
+        with app.app_context():
+            db.create_all()
+            # Add dependencies for foreign key constraints
+            region = Region(name='Test Region')
+            db.session.add(region)
+            db.session.commit()
+            payment_type = PaymentType(name='Test Payment Type', region_id=region.id)
+            db.session.add(payment_type)
+            db.session.commit()
+            account_name = AccountName(name='Test Account Name', payment_type_id=payment_type.id)
+            db.session.add(account_name)
+            db.session.commit()
+            budget_item = BudgetItem(name='Test Budget Item', account_name_id=account_name.id)
+            db.session.add(budget_item)
+            db.session.commit()
+            company = Company(name='Test Company')
+            db.session.add(company)
+            db.session.commit()
+            yield client
+            db.session.remove()
+            db.drop_all()
+
+@pytest.fixture(params=['sqlite', 'postgresql'])
+def any_db_client(request, monkeypatch):
+    # NULL sıralaması veritabanına göre değiştiği için imleç her iki veritabanında da denenir
+    if request.param == 'postgresql':
+        uri = os.getenv('TEST_POSTGRES_URI')
+        if not uri:
+            pytest.skip("TEST_POSTGRES_URI is not set")
+        monkeypatch.setattr(config.Dotenv, 'SQLALCHEMY_DATABASE_URI', uri)
+    app = create_app('testing')
+    with app.test_client() as client:
+        with app.app_context():
+            if request.param == 'postgresql':
+                with db.engine.begin() as connection:
+                    connection.execute(text("DROP SCHEMA public CASCADE"))
+                    connection.execute(text("CREATE SCHEMA public"))
+            db.create_all()
+            region = Region(name='Test Region')
+            db.session.add(region)
+            db.session.commit()
+            payment_type = PaymentType(name='Test Payment Type', region_id=region.id)
+            db.session.add(payment_type)
+            db.session.commit()
+            account_name = AccountName(name='Test Account Name', payment_type_id=payment_type.id)
+            db.session.add(account_name)
+            db.session.commit()
+            db.session.add(BudgetItem(name='Test Budget Item', account_name_id=account_name.id))
+            db.session.add(Company(name='Test Company'))
+            db.session.commit()
+            yield client
+            db.session.remove()
+            db.drop_all()
+
+def _seed(client):
+    expense_id = client.post('/api/expenses/', json={
+        'description': 'Test Expense',
+        'amount': 1000.00,
+        'date': '2025-07-01',
+        'region_id': 1,
+        'payment_type_id': 1,
+        'account_name_id': 1,
+        'budget_item_id': 1
+    }).json['id']
+    income = IncomeService().create({
+        'description': 'Test Income',
+        'total_amount': 1000,
+        'date': datetime.date(2025, 7, 1),
+        'region_id': 1,
+        'account_name_id': 1,
+        'budget_item_id': 1,
+        'company_id': 1
+    })
+    # Aynı gün içinde hem ödeme hem tahsilat bulunan karışık bir geçmiş
+    for day in (2, 3, 3, 5):
+        PaymentService().create(expense_id, {'payment_amount': 10, 'payment_date': datetime.date(2025, 7, day)})
+    for day in (1, 3, 4):
+        IncomeReceiptService().create(income.id, {'receipt_amount': 20, 'receipt_date': datetime.date(2025, 7, day)})
+
+def test_recent_transactions_merges_and_sorts(client):
+    print("\n--- Running test_recent_transactions_merges_and_sorts ---")
+    _seed(client)
+    response = client.get('/api/transactions/recent?limit=3')
+    assert response.status_code == 200
+    data = response.json['data']
+    assert [(t['type'], t['date']) for t in data] == [
+        ('payment', '2025-07-05'), ('receipt', '2025-07-04'), ('receipt', '2025-07-03')
+    ]
+    assert data[0]['description'] == 'Test Expense'
+    assert {t['currency'] for t in data} == {'TRY'}
+    assert data[1]['description'] == 'Test Income'
+    assert response.json['has_more'] is True
+    print("test_recent_transactions_merges_and_sorts: PASSED")
+
+def test_recent_transactions_cursor_walks_full_history(client):
+    print("\n--- Running test_recent_transactions_cursor_walks_full_history ---")
+    _seed(client)
+    seen = []
+    cursor = None
+    while True:
+        url = '/api/transactions/recent?limit=2' + (f'&cursor={cursor}' if cursor else '')
+        body = client.get(url).json
+        seen.extend((t['type'], t['id']) for t in body['data'])
+        if not body['has_more']:
+            break
+        cursor = body['next_cursor']
+    assert len(seen) == 7
+    assert len(set(seen)) == 7
+    print("test_recent_transactions_cursor_walks_full_history: PASSED")
+
+def test_recent_transactions_cursor_with_missing_created_at(any_db_client):
+    print("\n--- Running test_recent_transactions_cursor_with_missing_created_at ---")
+    client = any_db_client
+    _seed(client)
+    # Eski kayıtların bir kısmında created_at yok
+    db.session.execute(update(Payment).where(Payment.id.in_([2, 3])).values(created_at=None))
+    db.session.execute(update(IncomeReceipt).where(IncomeReceipt.id == 2).values(created_at=None))
+    db.session.commit()
+
+    expected = [(t['type'], t['id']) for t in client.get('/api/transactions/recent?limit=100').json['data']]
+    for limit in (1, 2, 3):
+        seen = []
+        cursor = None
+        for _ in range(len(expected) + 1):
+            url = f'/api/transactions/recent?limit={limit}' + (f'&cursor={cursor}' if cursor else '')
+            body = client.get(url).json
+            seen.extend((t['type'], t['id']) for t in body['data'])
+            if not body['has_more']:
+                break
+            cursor = body['next_cursor']
+        assert seen == expected
+    assert len(expected) == 7
+    print("test_recent_transactions_cursor_with_missing_created_at: PASSED")
+
+def test_recent_transactions_invalid_params(client):
+    assert client.get('/api/transactions/recent?limit=0').status_code == 400
+    assert client.get('/api/transactions/recent?cursor=not-a-cursor').status_code == 400
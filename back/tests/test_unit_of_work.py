@@ -0,0 +1,91 @@
+import sqlite3
+import pytest
+from sqlalchemy.exc import OperationalError
+from app import create_app, db
+from app.models import Company
+from app.errors import AppError
+from app.unit_of_work import transactional, is_retryable, get_metrics
+
+@pytest.fixture
+def client():
+    app = create_app('testing')
+    app.config['TRANSACTION_RETRY_BACKOFF'] = 0
+    with app.test_client() as client:
+        with app.app_context():
+            db.create_all()
+            get_metrics().reset()
+            yield client
+            db.session.remove()
+            db.drop_all()
+
+def _locked():
+    return OperationalError("UPDATE company", {}, sqlite3.OperationalError("database is locked"))
+
+def _names():
+    return sorted(name for (name,) in db.session.query(Company.name))
+
+def test_retryable_error_is_retried_and_committed(client):
+    calls = []
+
+    @transactional(name='test.create_company')
+    def create_company():
+        calls.append(1)
+        db.session.add(Company(name=f'Company {len(calls)}'))
+        if len(calls) < 3:
+            db.session.flush()
+            raise _locked()
+
+    create_company()
+    assert len(calls) == 3
+    assert _names() == ['Company 3']
+    stats = get_metrics().snapshot()['test.create_company']
+    assert stats['count'] == 1 and stats['retries'] == 2 and stats['failures'] == 0
+
+def test_retries_are_bounded(client):
+    client.application.config['TRANSACTION_MAX_RETRIES'] = 1
+
+    @transactional(name='test.always_locked')
+    def always_locked():
+        raise _locked()
+
+    with pytest.raises(AppError) as exc_info:
+        always_locked()
+    assert exc_info.value.status_code == 409
+    stats = get_metrics().snapshot()['test.always_locked']
+    assert stats['retries'] == 1 and stats['failures'] == 1
+
+def test_nested_call_rolls_back_to_savepoint(client):
+    @transactional()
+    def inner():
+        db.session.add(Company(name='Inner'))
+        db.session.flush()
+        raise AppError("inner failed", 400)
+
+    @transactional()
+    def outer():
+        db.session.add(Company(name='Outer'))
+        with pytest.raises(AppError):
+            inner()
+
+    outer()
+    assert _names() == ['Outer']
+
+def test_unexpected_error_is_wrapped_and_rolled_back(client):
+    @transactional(error_message="Internal error on company creation")
+    def broken():
+        db.session.add(Company(name='Broken'))
+        db.session.flush()
+        raise ValueError("boom")
+
+    with pytest.raises(AppError) as exc_info:
+        broken()
+    assert exc_info.value.status_code == 500
+    assert _names() == []
+    assert not is_retryable(ValueError("boom"))
+
+def test_metrics_endpoint_reports_service_transactions(client):
+    response = client.post('/api/companies', json={'name': 'Acme'})
+    assert response.status_code == 201
+    response = client.get('/api/metrics/transactions')
+    assert response.status_code == 200
+    assert response.get_json()['CompanyService.create']['count'] == 1
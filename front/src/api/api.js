@@ -2,4 +2,5 @@ import axios from 'axios';
 
 export const api = axios.create({
   baseURL: 'http://localhost:5000/api', // Flask backend’in URL’si
+  withCredentials: true, // Yazım sonrası okumaların birincil veritabanına gitmesi için çerezleri gönder
 });